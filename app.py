@@ -1,47 +1,45 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import streamlit as st
-import plotly.graph_objects as go
-import pandas as pd
 import numpy as np
 
+from housing import affordability, profiling, scenario_grid
+from housing.cache import MEMORY
+from housing.charts import (
+    amortization_figure,
+    equity_overlay_figure,
+    price_history_figure,
+    projection_figure,
+    rent_vs_buy_figure,
+    sensitivity_heatmap,
+    stochastic_figure,
+    value_overlay_figure,
+)
+from housing.config import FEED, WORKERS
+from housing.evaluation import Scenario, evaluate
+from housing.feed import BackgroundRefresh, latest_path
+from housing.montecarlo import project_stochastic
+from housing.listings import open_store
+from housing.loans import LoanStructure
+from housing.rentbuy import RentBuyAssumptions
+from housing.parallel import evaluate_store
+from housing.report import BREAK_EVEN, comparison_columns, rank
+from housing.saved import ScenarioStore
+from housing.thumbnails import thumbnail
+
 st.set_page_config(
     page_title="House Hunt 2026",
     layout="wide",
     initial_sidebar_state="expanded",
 )
 
-# ---------------------------------------------------------------------------
-# Color palette & chart theme
-# ---------------------------------------------------------------------------
-
-COLORS = {
-    "bg": "#0e1117",
-    "card": "#1a1d23",
-    "card_border": "#2a2d35",
-    "accent": "#c9a962",
-    "accent_dim": "#a08839",
-    "text": "#e8e6e1",
-    "text_muted": "#8a8780",
-    "green": "#4ade80",
-    "red": "#f87171",
-    "blue": "#60a5fa",
-    "purple": "#a78bfa",
-    "orange": "#fb923c",
-    "chart_bg": "rgba(0,0,0,0)",
-    "grid": "#1f2229",
-}
-
-CHART_COLORS = [COLORS["accent"], COLORS["blue"], COLORS["purple"]]
-
-PLOTLY_LAYOUT = dict(
-    template="plotly_dark",
-    paper_bgcolor=COLORS["chart_bg"],
-    plot_bgcolor=COLORS["chart_bg"],
-    font=dict(family="Inter, system-ui, sans-serif", color=COLORS["text_muted"], size=12),
-    xaxis=dict(gridcolor=COLORS["grid"], zerolinecolor=COLORS["grid"]),
-    yaxis=dict(gridcolor=COLORS["grid"], zerolinecolor=COLORS["grid"], tickformat="$,.0f"),
-    legend=dict(orientation="h", y=1.08, font=dict(size=11)),
-    margin=dict(l=0, r=0, t=30, b=0),
-)
+# Add ?profile=1 to the URL (or set HOUSE_HUNT_PROFILE=1) for a per-rerun timing panel
+profiler = profiling.start(profiling.requested(st.query_params.get("profile")))
 
 # ---------------------------------------------------------------------------
 # Custom CSS
@@ -254,124 +252,100 @@ button[title="View fullscreen"] { display: none !important; }
 """, unsafe_allow_html=True)
 
 # ---------------------------------------------------------------------------
-# Property data
+# Listing data
 # ---------------------------------------------------------------------------
 
-PROPERTIES = {
-    "319 Schermerhorn St 11B": {
-        "address": "319 Schermerhorn St, Unit 11B",
-        "neighborhood": "Downtown Brooklyn",
-        "price": 1_325_000,
-        "beds": 2,
-        "baths": 2,
-        "sqft": 1_049,
-        "year_built": 2017,
-        "taxes_monthly": 424,
-        "common_charges_monthly": 2_124,
-        "min_down_pct": 20,
-        "type": "Condo",
-        "condition": "Excellent",
-        "amenities": "Corner Unit, Doorman, Concierge, Gym, Roof Deck, W/D in Unit, Central AC",
-        "price_history": [
-            ("04/2018", 1_380_443),
-            ("04/2018", 1_353_210),
-            ("08/2025", 1_375_000),
-            ("10/2025", 1_375_000),
-            ("01/2026", 1_325_000),
-        ],
-        "tax_abatement_note": "7+ years remaining tax abatement",
-        "image": "images/schermerhorn.png",
-        "streeteasy": "https://streeteasy.com/building/the-nevins/11b",
-    },
-    "906 Bergen St 1A": {
-        "address": "906 Bergen St, Unit 1A",
-        "neighborhood": "Crown Heights",
-        "price": 1_350_000,
-        "beds": 2,
-        "baths": 2,
-        "sqft": 1_025,
-        "year_built": 2021,
-        "taxes_monthly": 1_548,
-        "common_charges_monthly": 1_000,
-        "min_down_pct": 0,
-        "type": "Condo",
-        "condition": "Excellent",
-        "amenities": "Ground Floor, Patio, Concierge, Gym, Roof Deck, Elevator, Central AC, Playroom",
-        "price_history": [
-            ("04/2021", 1_295_000),
-            ("09/2021", 1_295_000),
-            ("11/2021", 1_295_000),
-            ("01/2026", 1_350_000),
-        ],
-        "tax_abatement_note": None,
-        "image": "images/bergen.png",
-        "streeteasy": "https://streeteasy.com/building/906-bergen-street-brooklyn/1a",
-    },
-    "365 Bridge St 23B": {
-        "address": "365 Bridge St, Unit 23B",
-        "neighborhood": "Downtown Brooklyn",
-        "price": 1_400_000,
-        "beds": 2,
-        "baths": 2,
-        "sqft": 1_186,
-        "year_built": 1929,
-        "taxes_monthly": 1_575,
-        "common_charges_monthly": 1_918,
-        "min_down_pct": 10,
-        "type": "Condo",
-        "condition": "Excellent",
-        "amenities": "Penthouse, Top Floor, Doorman, Concierge, Gym, Roof Deck, Yoga, Billiards, Landmark Art Deco",
-        "price_history": [
-            ("05/2014", 1_132_100),
-            ("10/2020", 1_400_000),
-            ("12/2020", 1_400_000),
-            ("03/2021", 1_400_000),
-            ("01/2026", 1_400_000),
-        ],
-        "tax_abatement_note": None,
-        "image": "images/bridge.png",
-        "streeteasy": "https://streeteasy.com/property/1440352-belltel-lofts-23b",
-    },
-}
+LISTINGS_PATH = os.environ.get("HOUSE_HUNT_LISTINGS", "data/listings.json")
+CARDS_PER_PAGE = 6
+MAX_SHORTLIST = 8
+ARM_OPTIONS = {"Fixed rate": None, "5/1 ARM": 5, "7/1 ARM": 7, "10/1 ARM": 10}
+ARM_LABELS = {years: label for label, years in ARM_OPTIONS.items()}
+SORT_OPTIONS = {
+    "Listing order": None,
+    "Price: low to high": ("price", True),
+    "Price: high to low": ("price", False),
+    "$/SF: low to high": ("ppsf", True),
+    "$/SF: high to low": ("ppsf", False),
+}
+
+# Widget keys saved with a scenario, besides the shortlist and each shortlisted
+# listing's offer price and down payment; display toggles are left out
+SCENARIO_KEYS = (
+    "rate_range", "loan_term", "appreciation", "horizon",
+    "loan_arm", "arm_reset", "interest_only", "extra_principal", "lump_sum", "lump_sum_year", "recast",
+    "stochastic", "appreciation_vol", "rate_resets", "rate_vol",
+    "tax_growth", "charge_growth", "full_tax_rate",
+    "budget", "cash",
+    "rent_yield", "rent_growth", "investment_return", "closing_costs", "selling_costs",
+)
+
+
+# One refresh thread per server process, shared by every session. Reruns load
+# whichever snapshot it last finished writing and never wait on the feed.
+@st.cache_resource
+def feed_refresher() -> BackgroundRefresh:
+    refresher = BackgroundRefresh(LISTINGS_PATH, FEED)
+    refresher.start()
+    return refresher
+
+
+refresher = feed_refresher() if FEED else None
+listings_file = latest_path(LISTINGS_PATH)
+store = open_store(listings_file)
+# Identifies this version of the listing data in shared cache keys
+listings_version = (str(listings_file), listings_file.stat().st_mtime_ns)
+scenarios = ScenarioStore()
 
 # ---------------------------------------------------------------------------
-# Helpers
+# Shared caches
 # ---------------------------------------------------------------------------
+# Kernel results already live in the process-wide memo cache (housing.cache).
+# These hold what the script derives from them, for every session alike:
+# entries are keyed on the inputs, expire after SHARED_CACHE_TTL seconds and
+# are capped in number so they stay within a few tens of MB.
+
+SHARED_CACHE_TTL = 3600
+
+
+@st.cache_resource
+def evaluation_pool() -> ProcessPoolExecutor | None:
+    """Worker processes shared by every session, or None to evaluate in the script thread."""
+    if WORKERS <= 1:
+        return None
+    # The server is multithreaded, so workers must not be forked from it
+    return ProcessPoolExecutor(WORKERS, mp_context=multiprocessing.get_context("forkserver"))
 
 
-def monthly_mortgage(principal: float, annual_rate_pct: float, years: int) -> float:
-    if annual_rate_pct == 0:
-        return principal / (years * 12)
-    r = annual_rate_pct / 100 / 12
-    n = years * 12
-    return principal * r * (1 + r) ** n / ((1 + r) ** n - 1)
+@st.cache_data(max_entries=32, ttl=SHARED_CACHE_TTL, show_spinner=False)
+def all_listings_comparison(version: tuple[str, int], scenario: Scenario, _store) -> dict[str, np.ndarray]:
+    # Sharded across the pool with the store in shared memory; rows stay in store order
+    return evaluate_store(_store, [scenario], evaluation_pool(), WORKERS)[0]
 
 
-def amortization_schedule(principal: float, annual_rate_pct: float, years: int):
-    r = annual_rate_pct / 100 / 12 if annual_rate_pct else 0
-    n = years * 12
-    payment = monthly_mortgage(principal, annual_rate_pct, years)
-    balances, principals, interests, equity_list = [], [], [], []
-    balance = principal
-    for m in range(1, n + 1):
-        interest = balance * r
-        princ = payment - interest
-        balance -= princ
-        balances.append(max(balance, 0))
-        principals.append(princ)
-        interests.append(interest)
-        equity_list.append(principal - max(balance, 0))
-    return balances, principals, interests, equity_list
+@st.cache_data(max_entries=256, ttl=SHARED_CACHE_TTL, show_spinner=False)
+def thumbnail_bytes(source: str, variant: str, mtime_ns: int) -> bytes:
+    return Path(thumbnail(source, variant)).read_bytes()
 
 
-def appreciation_series(price: float, annual_pct: float, years: int):
-    monthly_r = (1 + annual_pct / 100) ** (1 / 12) - 1
-    return [price * (1 + monthly_r) ** m for m in range(years * 12 + 1)]
+@st.cache_resource
+def shared_state() -> dict:
+    # Sessions run on separate threads; the lock covers reading and advancing the version
+    return {"listings_version": listings_version, "lock": threading.Lock()}
 
 
-def styled_chart(fig, height=420):
-    fig.update_layout(**PLOTLY_LAYOUT, height=height)
-    return fig
+# New listing data (an edit or a feed refresh) drops everything derived from
+# the old version at once, rather than leaving it to expire. The newest file
+# is always the one loaded, so a session still on older data (its mtime is
+# smaller) leaves the version alone rather than rolling it back.
+shared = shared_state()
+with shared["lock"]:
+    if listings_version != shared["listings_version"] and listings_version[1] >= shared["listings_version"][1]:
+        shared["listings_version"] = listings_version
+        all_listings_comparison.clear()
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
 
 
 def range_metric(label: str, lo_val: str, hi_val: str, delta: str = ""):
@@ -387,11 +361,102 @@ def range_metric(label: str, lo_val: str, hi_val: str, delta: str = ""):
     """
 
 
+def show_chart(fig):
+    with profiler.section("st.plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def show_image(source: str, variant: str):
+    with profiler.section("thumbnail"):
+        image = thumbnail_bytes(source, variant, os.stat(source).st_mtime_ns)
+    with profiler.section("st.image"):
+        st.image(image, use_container_width=True)
+
+
+def show_profile():
+    """Log this rerun's timings and show them in a collapsed panel, if profiling."""
+    if not profiler.enabled:
+        return
+    import pandas as pd
+
+    report = profiler.finish()
+    profiler.write()
+    total_ms = report["total_s"] * 1e3
+    with st.expander(f"Profiling: rerun took {total_ms:,.1f} ms", expanded=False):
+        sections = pd.DataFrame(report["sections"], columns=["section", "calls", "seconds"])
+        sections["ms"] = sections.pop("seconds") * 1e3
+        sections["share"] = sections["ms"] / total_ms * 100
+        st.dataframe(sections, hide_index=True, use_container_width=True, column_config={
+            "ms": st.column_config.NumberColumn(format="%.2f"),
+            "share": st.column_config.NumberColumn("% of rerun", format="%.1f%%"),
+        })
+        kernels = pd.DataFrame(report["kernels"], columns=["kernel", "calls", "misses", "seconds"])
+        kernels["ms"] = kernels.pop("seconds") * 1e3
+        st.caption(
+            "Memoized kernels, plus table_* lookups in the precomputed rate tables, which never miss; "
+            "times are inclusive of nested kernel calls. "
+            f"The shared memo cache holds {MEMORY.bytes / 2**20:,.1f} of {MEMORY.max_bytes / 2**20:,.0f} MB."
+        )
+        st.dataframe(kernels, hide_index=True, use_container_width=True, column_config={
+            "ms": st.column_config.NumberColumn(format="%.2f"),
+        })
+        st.caption(f"Appended to {profiling.LOG_PATH}")
+
+
+def scenario_params() -> dict:
+    """The sidebar inputs, as of the last rerun, that make up a saved scenario."""
+    state = st.session_state
+    keys = ["shortlist", *SCENARIO_KEYS]
+    keys += [f"{field}_{name}" for name in state.get("shortlist", []) for field in ("price", "down")]
+    return {key: state[key] for key in keys if key in state}
+
+
+def save_scenario():
+    name = st.session_state["scenario_name"].strip()
+    if not name:
+        st.toast("Name the scenario to save it")
+        return
+    scenarios.save(name, scenario_params())
+    st.session_state["scenario_choice"] = name
+    st.query_params["scenario"] = name
+    st.toast(f"Saved {name}")
+
+
+def apply_scenario(name: str):
+    """Set the sidebar widgets from a saved scenario; runs before they are drawn."""
+    params = scenarios.load(name)
+    if params is None:
+        st.toast(f"No saved scenario named {name}")
+        return
+    # Listings may have been removed since the scenario was saved
+    shortlist = [listing for listing in params.pop("shortlist", []) if store.has(listing)]
+    st.session_state["shortlist"] = shortlist[:MAX_SHORTLIST]
+    for key, value in params.items():
+        if key not in SCENARIO_KEYS and key.partition("_")[2] not in shortlist:
+            continue
+        st.session_state[key] = tuple(value) if key == "rate_range" else value
+    st.query_params["scenario"] = name
+
+
+def delete_scenario(name: str):
+    scenarios.delete(name)
+    st.session_state["scenario_choice"] = None
+    st.query_params.pop("scenario", None)
+
+
+def toggle_shortlist(name: str):
+    shortlist = st.session_state["shortlist"]
+    if name in shortlist:
+        st.session_state["shortlist"] = [n for n in shortlist if n != name]
+    elif len(shortlist) < MAX_SHORTLIST:
+        st.session_state["shortlist"] = shortlist + [name]
+
+
 # ---------------------------------------------------------------------------
 # Sidebar
 # ---------------------------------------------------------------------------
 
-with st.sidebar:
+with st.sidebar, profiler.section("sidebar"):
     st.markdown("""
     <div style="padding:0.5rem 0 1rem;">
         <span style="font-size:1.3rem;font-weight:700;color:#c9a962;letter-spacing:-0.02em;">House Hunt</span>
@@ -399,17 +464,93 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
+    if refresher is not None:
+        if refresher.error is not None:
+            st.caption(f"Listing feed failed: {refresher.error}")
+        elif refresher.last is None:
+            st.caption("Refreshing prices from the listing feed…")
+        else:
+            report = refresher.last
+            st.caption(
+                f"Prices refreshed at {time.strftime('%H:%M', time.localtime(report.finished_at))}: "
+                f"{report.changed:,} changed of {report.fetched:,} fetched"
+                + (f", {report.failed:,} failed" if report.failed else "")
+            )
+
+    # ?scenario=<name> opens a saved scenario, so a link shares it
+    if "scenario" in st.query_params and "scenario_choice" not in st.session_state:
+        st.session_state["scenario_choice"] = st.query_params["scenario"]
+        apply_scenario(st.query_params["scenario"])
+
+    st.markdown('<div class="section-head">Scenarios</div>', unsafe_allow_html=True)
+    saved = scenarios.names()
+    if st.session_state.get("scenario_choice") not in saved:
+        st.session_state["scenario_choice"] = None
+    chosen = st.selectbox("Saved scenario", saved, index=None, placeholder="Choose a scenario", key="scenario_choice")
+    load_col, delete_col = st.columns(2)
+    load_col.button("Load", on_click=apply_scenario, args=(chosen,), disabled=chosen is None, use_container_width=True)
+    delete_col.button("Delete", on_click=delete_scenario, args=(chosen,), disabled=chosen is None,
+                      use_container_width=True)
+    st.text_input("Save current inputs as", placeholder="Scenario name", key="scenario_name")
+    st.button("Save Scenario", on_click=save_scenario, use_container_width=True)
+
+    # Only shortlisted listings get inputs, tabs and full analysis
+    st.markdown('<div class="section-head">Shortlist</div>', unsafe_allow_html=True)
+    st.session_state.setdefault("shortlist", store["name"][:3].tolist())
+    # A feed refresh or an ingest may have dropped shortlisted listings since the last rerun
+    st.session_state["shortlist"] = [name for name in st.session_state["shortlist"] if store.has(name)]
+    shortlist = st.multiselect(
+        "Units to analyze",
+        store["name"].tolist(),
+        max_selections=MAX_SHORTLIST,
+        key="shortlist",
+    )
+    listings = store.records([store.index_of(name) for name in shortlist])
+
     st.markdown('<div class="section-head">Loan Parameters</div>', unsafe_allow_html=True)
-    rate_lo, rate_hi = st.slider("Interest Rate Range (%)", 3.0, 10.0, (5.425, 5.8), 0.125)
-    loan_term = st.selectbox("Loan Term (years)", [30, 25, 20, 15], index=0)
+    rate_lo, rate_hi = st.slider("Interest Rate Range (%)", 3.0, 10.0, (5.425, 5.8), 0.125, key="rate_range")
+    loan_term = st.selectbox("Loan Term (years)", [30, 25, 20, 15], index=0, key="loan_term")
+    loan_arm = st.selectbox("Loan Type", list(ARM_LABELS), format_func=ARM_LABELS.get, key="loan_arm")
+    arm_reset = 0.0
+    if loan_arm:
+        arm_reset = st.slider(
+            "Rate After Reset (± pts)", -2.0, 5.0, 1.0, 0.125, key="arm_reset",
+            help="Added to the interest rate once the fixed period ends",
+        )
+    interest_only = st.slider("Interest-Only Period (years)", 0, 10, 0, 1, key="interest_only")
+    with st.expander("Extra Principal"):
+        extra_principal = st.number_input("Extra per Month ($)", 0, 50_000, 0, 100, key="extra_principal")
+        lump_col, year_col = st.columns([3, 2])
+        lump_sum = lump_col.number_input("Lump Sum ($)", 0, 5_000_000, 0, 10_000, key="lump_sum")
+        lump_sum_year = year_col.number_input("In Year", 1, 30, 5, key="lump_sum_year")
+        recast = st.checkbox(
+            "Recast after lump sum", key="recast",
+            help="Re-amortize to a lower payment instead of paying off sooner",
+        )
+    structure = LoanStructure.from_options(
+        loan_arm, arm_reset, interest_only, extra_principal, lump_sum, lump_sum_year, recast,
+    )
 
     st.markdown('<div class="section-head">Market Assumptions</div>', unsafe_allow_html=True)
-    appreciation_rate = st.slider("Annual Appreciation (%)", -5.0, 10.0, 3.0, 0.25)
-    projection_years = st.slider("Projection Horizon (years)", 5, 30, 30, 1)
+    appreciation_rate = st.slider("Annual Appreciation (%)", -5.0, 10.0, 3.0, 0.25, key="appreciation")
+    projection_years = st.slider("Projection Horizon (years)", 5, 30, 30, 1, key="horizon")
+    stochastic = st.toggle("Stochastic Projection", value=False, key="stochastic")
+    if stochastic:
+        appreciation_vol = st.slider("Appreciation Volatility (%)", 1.0, 20.0, 8.0, 0.5, key="appreciation_vol")
+        arm_fixed_years = ARM_OPTIONS[st.selectbox("Rate Resets", list(ARM_OPTIONS), key="rate_resets")]
+        rate_vol = st.slider("Rate Volatility (pts/yr)", 0.25, 3.0, 1.0, 0.25, key="rate_vol") if arm_fixed_years else 1.0
+
+    st.markdown('<div class="section-head">Carrying Costs</div>', unsafe_allow_html=True)
+    tax_growth = st.slider("Tax Growth (%/yr)", 0.0, 8.0, 2.0, 0.25, key="tax_growth")
+    charge_growth = st.slider("Common Charge Growth (%/yr)", 0.0, 8.0, 3.0, 0.25, key="charge_growth")
+    full_tax_rate = st.slider(
+        "Post-Abatement Tax (% of price / yr)", 0.5, 3.0, 1.35, 0.05,
+        help="Taxes after an abatement noted on the listing expires", key="full_tax_rate",
+    )
 
     st.markdown('<div class="section-head">Offer Price</div>', unsafe_allow_html=True)
     offer_prices = {}
-    for name, prop in PROPERTIES.items():
+    for name, prop in listings.items():
         offer_prices[name] = st.number_input(
             f"{name}",
             min_value=0,
@@ -421,7 +562,7 @@ with st.sidebar:
 
     st.markdown('<div class="section-head">Down Payment</div>', unsafe_allow_html=True)
     down_pcts = {}
-    for name, prop in PROPERTIES.items():
+    for name, prop in listings.items():
         default = max(prop["min_down_pct"], 20)
         down_pcts[name] = st.slider(
             f"{name}",
@@ -436,18 +577,58 @@ with st.sidebar:
     st.markdown('<div class="section-head">Display</div>', unsafe_allow_html=True)
     show_amort = st.toggle("Amortization Breakdown", value=True)
     show_comparison = st.toggle("Side-by-Side Comparison", value=True)
+    show_sensitivity = st.toggle("Sensitivity Heatmaps", value=False)
+    show_affordability = st.toggle("Affordability Search", value=False)
+    if show_affordability:
+        budget = st.number_input("Monthly Budget, all-in ($)", min_value=0, value=10_000, step=250, key="budget")
+        cash = st.number_input("Cash for Down Payment ($)", min_value=0, value=300_000, step=10_000, key="cash")
+    show_rent_buy = st.toggle("Rent vs. Buy", value=False)
+    if show_rent_buy:
+        rent_yield = st.slider("Comparable Rent (% of price / yr)", 2.0, 8.0, 4.5, 0.1, key="rent_yield")
+        rent_assumptions = RentBuyAssumptions(
+            rent_growth_pct=st.slider("Rent Growth (%/yr)", 0.0, 8.0, 3.0, 0.25, key="rent_growth"),
+            investment_return_pct=st.slider("Investment Return (%/yr)", 0.0, 12.0, 6.0, 0.25, key="investment_return"),
+            closing_cost_pct=st.slider(
+                "Buyer Closing Costs (%)", 0.0, 5.0, 1.5, 0.25,
+                help="Legal, title and fees; mansion and mortgage recording tax are added separately",
+                key="closing_costs",
+            ),
+            selling_cost_pct=st.slider(
+                "Selling Costs (%)", 0.0, 10.0, 5.0, 0.25,
+                help="Broker and legal; NYC and NYS transfer taxes are added separately",
+                key="selling_costs",
+            ),
+        )
+
+# ---------------------------------------------------------------------------
+# Projections (memoized per property on exactly the inputs each one reads)
+# ---------------------------------------------------------------------------
+
+with profiler.section("projections"):
+    scenario = Scenario(
+        rate_lo=rate_lo, rate_hi=rate_hi, loan_term=loan_term, structure=structure,
+        appreciation_rate=appreciation_rate, projection_years=projection_years,
+        tax_growth=tax_growth, charge_growth=charge_growth, full_tax_rate=full_tax_rate,
+        rent_yield=rent_yield if show_rent_buy else None,
+        rent_assumptions=rent_assumptions if show_rent_buy else RentBuyAssumptions(),
+        offer_prices=offer_prices, down_pcts=down_pcts,
+    )
+    evaluation = evaluate(list(listings.values()), scenario)
+    costs = dict(zip(listings, evaluation.costs))
+    projections = dict(zip(listings, evaluation.projections))
+    rent_buy = evaluation.rent_buy
 
 # ---------------------------------------------------------------------------
 # Header
 # ---------------------------------------------------------------------------
 
-st.markdown("""
+st.markdown(f"""
 <div style="margin-bottom:1.8rem;">
     <h1 style="font-size:1.8rem;font-weight:700;color:#e8e6e1;margin:0;letter-spacing:-0.03em;">
         Brooklyn Condo Projections
     </h1>
     <p style="font-size:0.82rem;color:#8a8780;margin:0.25rem 0 0;">
-        Comparing 3 units from today's tour &mdash; adjust rates & down payment in the sidebar
+        Comparing {len(listings)} units from today's tour &mdash; adjust rates & down payment in the sidebar
     </p>
 </div>
 """, unsafe_allow_html=True)
@@ -456,53 +637,141 @@ st.markdown("""
 # Property cards (HTML)
 # ---------------------------------------------------------------------------
 
-card_cols = st.columns(3, gap="medium")
-for idx, (name, prop) in enumerate(PROPERTIES.items()):
-    with card_cols[idx]:
-        badge_html = ""
-        if prop.get("tax_abatement_note"):
-            badge_html = f'<div class="badge">{prop["tax_abatement_note"]}</div>'
-        st.markdown('<div class="prop-card">', unsafe_allow_html=True)
-        st.image(prop["image"], use_container_width=True)
-        st.markdown(f"""
-        <div class="prop-card-body">
-            <div class="neighborhood">{prop['neighborhood']}</div>
-            <h3>{prop['address']}</h3>
-            <div class="details">
-                {prop['beds']} bed &middot; {prop['baths']} bath &middot; {prop['sqft']:,} SF &middot; Built {prop['year_built']}
+with profiler.section("cards"):
+    # Browse controls only appear once the store outgrows a single page
+    page_rows = np.arange(len(store))
+    if len(store) > CARDS_PER_PAGE:
+        f1, f2, f3 = st.columns([3, 2, 1])
+        hood_filter = f1.multiselect("Neighborhood", store.neighborhoods, key="filter_neighborhood")
+        sort_key = SORT_OPTIONS[f2.selectbox("Sort by", list(SORT_OPTIONS), key="sort_listings")]
+        page_rows = store.query(neighborhoods=hood_filter)
+        if sort_key is not None:
+            page_rows = store.top_n(sort_key[0], len(page_rows), ascending=sort_key[1], among=page_rows)
+        n_pages = max(1, -(-len(page_rows) // CARDS_PER_PAGE))
+        page = f3.number_input(f"Page (of {n_pages})", 1, n_pages, 1, key="listing_page")
+        page_rows = page_rows[(page - 1) * CARDS_PER_PAGE:page * CARDS_PER_PAGE]
+        st.caption(f"{len(store):,} listings")
+
+    card_cols = st.columns(3, gap="medium")
+    for idx, (name, prop) in enumerate(store.records(page_rows).items()):
+        with card_cols[idx % 3]:
+            badge_html = ""
+            if prop.get("tax_abatement_note"):
+                badge_html = f'<div class="badge">{prop["tax_abatement_note"]}</div>'
+            st.markdown('<div class="prop-card">', unsafe_allow_html=True)
+            show_image(prop["image"], "card")
+            st.markdown(f"""
+            <div class="prop-card-body">
+                <div class="neighborhood">{prop['neighborhood']}</div>
+                <h3>{prop['address']}</h3>
+                <div class="details">
+                    {prop['beds']} bed &middot; {prop['baths']} bath &middot; {prop['sqft']:,} SF &middot; Built {prop['year_built']}
+                </div>
+                <div class="price">${prop['price']:,.0f}</div>
+                <div class="ppsf">${prop['price']/prop['sqft']:,.0f} / SF</div>
+                {badge_html}
             </div>
-            <div class="price">${prop['price']:,.0f}</div>
-            <div class="ppsf">${prop['price']/prop['sqft']:,.0f} / SF</div>
-            {badge_html}
-        </div>
-        </div>
-        """, unsafe_allow_html=True)
-        st.markdown(f"[View on StreetEasy →]({prop['streeteasy']})")
+            </div>
+            """, unsafe_allow_html=True)
+            st.markdown(f"[View on StreetEasy →]({prop['streeteasy']})")
+            if len(store) > len(shortlist):
+                st.button(
+                    "Remove from shortlist" if name in shortlist else "Add to shortlist",
+                    key=f"shortlist_{name}",
+                    on_click=toggle_shortlist,
+                    args=(name,),
+                    disabled=name not in shortlist and len(shortlist) >= MAX_SHORTLIST,
+                )
+
+# ---------------------------------------------------------------------------
+# Affordability search (every listing in the store, solved in closed form)
+# ---------------------------------------------------------------------------
+
+if show_affordability:
+    import pandas as pd
+
+    with profiler.section("affordability"):
+        st.markdown('<div class="section-head" style="margin-top:2rem;">Affordability</div>', unsafe_allow_html=True)
+        fit = affordability(
+            store["price"],
+            store["taxes_monthly"] + store["common_charges_monthly"],
+            budget, [rate_lo, rate_hi], loan_term, cash, store["min_down_pct"],
+        )
+        afford_df = pd.DataFrame({
+            "Listing": store["name"],
+            "Neighborhood": store["neighborhood"],
+            "List Price": store["price"],
+            f"Max Offer @ {rate_hi:.3f}%": fit.max_price[:, 1],
+            f"Max Offer @ {rate_lo:.3f}%": fit.max_price[:, 0],
+            "Headroom": fit.max_price[:, 1] - store["price"],
+            "Min Down": fit.min_down[:, 1],
+            "Min Down %": fit.min_down_pct[:, 1],
+            "Fits": fit.fits[:, 1],
+        }).sort_values("Headroom", ascending=False)
+        st.caption(
+            f"{int(fit.fits[:, 1].sum()):,} of {len(store):,} listings fit ${budget:,}/mo and ${cash:,} cash "
+            f"at {rate_hi:.3f}%. Min down is at list price and the higher rate."
+        )
+        dollars = st.column_config.NumberColumn(format="$%,d")
+        with profiler.section("st.dataframe"):
+            st.dataframe(afford_df, hide_index=True, use_container_width=True, height=380, column_config={
+                "List Price": dollars,
+                f"Max Offer @ {rate_hi:.3f}%": dollars,
+                f"Max Offer @ {rate_lo:.3f}%": dollars,
+                "Headroom": dollars,
+                "Min Down": dollars,
+                "Min Down %": st.column_config.NumberColumn(format="%.1f%%"),
+            })
 
 # ---------------------------------------------------------------------------
 # Per-property tabs
 # ---------------------------------------------------------------------------
 
 st.markdown("<div style='height:1.5rem'></div>", unsafe_allow_html=True)
-tabs = st.tabs([name for name in PROPERTIES])
+if not listings:
+    st.info("Add units to the shortlist in the sidebar to see projections.")
+    show_profile()
+    st.stop()
+
+# Only the open tab's body runs, so hidden listings build no figures
+tabs = st.tabs([name for name in listings], key="property_tab", on_change="rerun")
+
+if show_sensitivity:
+    with profiler.section("sensitivity grid"):
+        sensitivity = scenario_grid(
+            [offer_prices[name] for name in listings],
+            [prop["taxes_monthly"] + prop["common_charges_monthly"] for prop in listings.values()],
+            rates=np.arange(3.0, 10.0 + 1e-9, 0.125),
+            down_pcts=np.arange(0, 101, 5),
+            offer_pcts=[100],
+            appreciation=np.arange(-5.0, 10.0 + 1e-9, 0.5),
+            years=loan_term,
+            horizon_years=projection_years,
+            min_down_pcts=[prop["min_down_pct"] for prop in listings.values()],
+        )
+    sens_rate_idx = np.abs(sensitivity.rates - rate_lo).argmin()
+    sens_appr_idx = np.abs(sensitivity.appreciation - appreciation_rate).argmin()
 
-for tab, (name, prop) in zip(tabs, PROPERTIES.items()):
-    with tab:
+for prop_idx, (tab, (name, prop)) in enumerate(zip(tabs, listings.items())):
+    if not tab.open:
+        continue
+    with tab, profiler.section(f"tab: {name}"):
         price = offer_prices[name]
         down_pct = down_pcts[name]
-        down_payment = price * down_pct / 100
-        loan_amount = price - down_payment
-        monthly_pmt_lo = monthly_mortgage(loan_amount, rate_lo, loan_term)
-        monthly_pmt_hi = monthly_mortgage(loan_amount, rate_hi, loan_term)
         taxes = prop["taxes_monthly"]
         hoa = prop["common_charges_monthly"]
-        total_monthly_lo = monthly_pmt_lo + taxes + hoa
-        total_monthly_hi = monthly_pmt_hi + taxes + hoa
+        proj = projections[name]
+        down_payment = proj.down_payment
+        loan_amount = proj.loan_amount
+        monthly_pmt_lo = proj.payment_lo
+        monthly_pmt_hi = proj.payment_hi
+        total_monthly_lo = proj.total_monthly_lo
+        total_monthly_hi = proj.total_monthly_hi
 
         # ---- Header row with image ----
         img_col, detail_col = st.columns([1, 2], gap="large")
         with img_col:
-            st.image(prop["image"], use_container_width=True)
+            show_image(prop["image"], "tab")
             st.markdown(f"[StreetEasy Listing →]({prop['streeteasy']})")
         with detail_col:
             st.markdown(f"""
@@ -525,7 +794,10 @@ for tab, (name, prop) in zip(tabs, PROPERTIES.items()):
         c1, c2, c3, c4 = st.columns(4)
         c1.metric("Down Payment", f"${down_payment:,.0f}", f"{down_pct}%")
         c2.metric("Loan Amount", f"${loan_amount:,.0f}")
-        c3.markdown(range_metric("Monthly Mortgage", f"${monthly_pmt_lo:,.0f}", f"${monthly_pmt_hi:,.0f}"), unsafe_allow_html=True)
+        c3.markdown(range_metric(
+            "Monthly Mortgage", f"${monthly_pmt_lo:,.0f}", f"${monthly_pmt_hi:,.0f}",
+            "First payment; changes with the loan structure" if structure is not None else "",
+        ), unsafe_allow_html=True)
         c4.markdown(range_metric("Total Monthly", f"${total_monthly_lo:,.0f}", f"${total_monthly_hi:,.0f}"), unsafe_allow_html=True)
 
         # ---- Cost breakdown bar ----
@@ -539,52 +811,32 @@ for tab, (name, prop) in zip(tabs, PROPERTIES.items()):
             <div class="cost-hoa" style="width:{hoa_pct:.1f}%">HOA ${hoa:,}</div>
         </div>
         <div class="cost-legend">
-            ${total_monthly_lo:,.0f} – ${total_monthly_hi:,.0f}/mo &middot; ${total_monthly_lo*12:,.0f} – ${total_monthly_hi*12:,.0f}/yr
+            ${total_monthly_lo:,.0f} – ${total_monthly_hi:,.0f}/mo &middot; ${proj.paid_lo[12]:,.0f} – ${proj.paid_hi[12]:,.0f} in year 1
+            &middot; taxes & charges ${proj.carrying[0]:,.0f} → ${proj.carrying[-1]:,.0f}/mo by year {projection_years}
         </div>
         """, unsafe_allow_html=True)
 
         # ---- Appreciation projection ----
         st.markdown('<div class="section-head">Value & Equity Projection</div>', unsafe_allow_html=True)
 
-        values = appreciation_series(price, appreciation_rate, projection_years)
-        balances_lo, _, _, _ = amortization_schedule(loan_amount, rate_lo, loan_term)
-        balances_hi, _, _, _ = amortization_schedule(loan_amount, rate_hi, loan_term)
-        months = list(range(projection_years * 12 + 1))
-        bal_padded = [loan_amount] + balances_lo[: projection_years * 12]
-        bal_padded_hi = [loan_amount] + balances_hi[: projection_years * 12]
-        while len(bal_padded) < len(months):
-            bal_padded.append(0)
-        while len(bal_padded_hi) < len(months):
-            bal_padded_hi.append(0)
-        total_equity = [v - b for v, b in zip(values, bal_padded)]
-        total_equity_hi = [v - b for v, b in zip(values, bal_padded_hi)]
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=[m / 12 for m in months], y=values,
-            name="Property Value", line=dict(width=2.5, color=COLORS["accent"]),
-        ))
-        fig.add_trace(go.Scatter(
-            x=[m / 12 for m in months], y=bal_padded,
-            name="Loan Balance", line=dict(width=1.5, dash="dash", color=COLORS["red"]),
-        ))
-        fig.add_trace(go.Scatter(
-            x=[m / 12 for m in months], y=total_equity,
-            name="Total Equity",
-            line=dict(width=0, color=COLORS["green"]),
-            fill="tozeroy",
-            fillcolor="rgba(74,222,128,0.12)",
-        ))
-        fig.update_layout(xaxis_title="Years")
-        st.plotly_chart(styled_chart(fig, 400), use_container_width=True)
+        if stochastic:
+            fig = stochastic_figure(
+                price, loan_amount, rate_lo, loan_term, appreciation_rate, appreciation_vol, projection_years,
+                arm_fixed_years, rate_vol,
+            )
+        else:
+            fig = projection_figure(
+                price, loan_amount, rate_lo, loan_term, appreciation_rate, projection_years, structure,
+            )
+        show_chart(fig)
 
         # Milestones
-        yr5_val = values[min(60, len(values) - 1)]
-        yr10_val = values[min(120, len(values) - 1)]
-        yr5_eq_lo = total_equity[min(60, len(total_equity) - 1)]
-        yr5_eq_hi = total_equity_hi[min(60, len(total_equity_hi) - 1)]
-        yr10_eq_lo = total_equity[min(120, len(total_equity) - 1)]
-        yr10_eq_hi = total_equity_hi[min(120, len(total_equity_hi) - 1)]
+        yr5_val = proj.value_5
+        yr10_val = proj.value_10
+        yr5_eq_lo = proj.equity_5_lo
+        yr5_eq_hi = proj.equity_5_hi
+        yr10_eq_lo = proj.equity_10_lo
+        yr10_eq_hi = proj.equity_10_hi
 
         mc1, mc2, mc3, mc4 = st.columns(4)
         mc1.metric("Value @ 5yr", f"${yr5_val:,.0f}", f"{(yr5_val/price - 1)*100:+.1f}%")
@@ -593,116 +845,131 @@ for tab, (name, prop) in zip(tabs, PROPERTIES.items()):
             mc3.metric("Value @ 10yr", f"${yr10_val:,.0f}", f"{(yr10_val/price - 1)*100:+.1f}%")
             mc4.markdown(range_metric("Equity @ 10yr", f"${yr10_eq_hi:,.0f}", f"${yr10_eq_lo:,.0f}"), unsafe_allow_html=True)
 
-        # ---- Amortization ----
-        if show_amort:
-            st.markdown('<div class="section-head">Amortization Breakdown</div>', unsafe_allow_html=True)
-            _, princ_arr, int_arr, _ = amortization_schedule(loan_amount, rate_lo, loan_term)
-            amort_months = list(range(1, min(projection_years * 12, len(princ_arr)) + 1))
-
-            fig2 = go.Figure()
-            fig2.add_trace(go.Bar(
-                x=[m / 12 for m in amort_months],
-                y=[int_arr[m - 1] for m in amort_months],
-                name="Interest", marker_color=COLORS["red"],
-            ))
-            fig2.add_trace(go.Bar(
-                x=[m / 12 for m in amort_months],
-                y=[princ_arr[m - 1] for m in amort_months],
-                name="Principal", marker_color=COLORS["green"],
+        if stochastic:
+            sim = project_stochastic(
+                price, loan_amount, rate_lo, loan_term, appreciation_rate, appreciation_vol, projection_years,
+                arm_fixed_years, rate_vol,
+            )
+            sc1, sc2, sc3, sc4 = st.columns(4)
+            sc1.metric("P(Neg. Equity) @ 5yr", f"{sim.prob_negative_at(5):.1%}")
+            sc2.metric("P(Neg. Equity) @ 10yr", f"{sim.prob_negative_at(10):.1%}")
+            sc3.metric(f"Equity P10 @ {projection_years}yr", f"${sim.equity_bands[0, projection_years]:,.0f}")
+            sc4.metric(f"Equity P90 @ {projection_years}yr", f"${sim.equity_bands[2, projection_years]:,.0f}")
+
+        # ---- Rent vs. buy ----
+        if show_rent_buy:
+            st.markdown('<div class="section-head">Rent vs. Buy</div>', unsafe_allow_html=True)
+            break_even = rent_buy.break_even_years[prop_idx]
+            upfront = rent_buy.upfront_cost[prop_idx]
+            rb1, rb2, rb3, rb4 = st.columns(4)
+            rb1.metric("Upfront Cash", f"${upfront:,.0f}", f"${upfront - down_payment:,.0f} closing", delta_color="off")
+            rb2.metric("Break-even", f"> {projection_years} yrs" if np.isnan(break_even) else f"{break_even:.1f} yrs")
+            advantage = rent_buy.advantage[prop_idx, -1]
+            rb3.metric(f"Buy − Rent @ {projection_years}yr", f"{'-' if advantage < 0 else ''}${abs(advantage):,.0f}")
+            abated = costs[name].abatement_months / 12
+            rb4.metric("Tax Abatement Left", f"{abated:g} yrs" if abated else "None")
+            show_chart(rent_vs_buy_figure(
+                rent_buy.owner_net_worth[prop_idx], rent_buy.renter_net_worth[prop_idx], break_even,
             ))
-            fig2.update_layout(barmode="stack", xaxis_title="Years", yaxis_title="$/month")
-            st.plotly_chart(styled_chart(fig2, 320), use_container_width=True)
-
-        # ---- Price history ----
-        st.markdown('<div class="section-head">Listing Price History</div>', unsafe_allow_html=True)
-        hist = prop["price_history"]
-        hist_df = pd.DataFrame(hist, columns=["Date", "Price"])
-        fig3 = go.Figure(go.Scatter(
-            x=hist_df["Date"], y=hist_df["Price"],
-            mode="lines+markers",
-            line=dict(width=2, color=COLORS["accent"]),
-            marker=dict(size=7, color=COLORS["accent"]),
-        ))
-        st.plotly_chart(styled_chart(fig3, 260), use_container_width=True)
+
+        # ---- Sensitivity ----
+        if show_sensitivity:
+            st.markdown('<div class="section-head">Sensitivity</div>', unsafe_allow_html=True)
+            hm1, hm2 = st.columns(2, gap="large")
+            with hm1:
+                st.caption(f"Total monthly @ {appreciation_rate:.2f}% appreciation")
+                fig_hm = sensitivity_heatmap(
+                    sensitivity.total_monthly[prop_idx, :, :, 0, sens_appr_idx].T,
+                    sensitivity.rates, sensitivity.down_pcts, "Rate (%)", "Down",
+                )
+                show_chart(fig_hm)
+            with hm2:
+                st.caption(f"Equity @ {projection_years}yr, {sensitivity.rates[sens_rate_idx]:.3f}% rate")
+                fig_hm = sensitivity_heatmap(
+                    sensitivity.equity[prop_idx, sens_rate_idx, :, 0, :],
+                    sensitivity.appreciation, sensitivity.down_pcts, "Appreciation (%)", "Down",
+                )
+                show_chart(fig_hm)
+
+        # ---- Amortization & price history ----
+        # Collapsed until opened, and their figures are only built while open
+        if show_amort:
+            amort_section = st.expander("Amortization Breakdown", key=f"amort_{name}", on_change="rerun")
+            if amort_section.open:
+                with amort_section:
+                    fig2 = amortization_figure(loan_amount, rate_lo, loan_term, projection_years, structure)
+                    show_chart(fig2)
+
+        history_section = st.expander("Listing Price History", key=f"history_{name}", on_change="rerun")
+        if history_section.open:
+            with history_section:
+                history = prop["price_history"]
+                fig3 = price_history_figure(tuple(history.months.tolist()), tuple(history.prices.tolist()))
+                show_chart(fig3)
 
 # ---------------------------------------------------------------------------
 # Side-by-side comparison
 # ---------------------------------------------------------------------------
 
 if show_comparison:
-    st.markdown('<div class="section-head" style="margin-top:2rem;">Side-by-Side Comparison</div>', unsafe_allow_html=True)
+    # pandas takes longer to import than everything above, so it loads only here
+    import pandas as pd
 
-    rows = []
-    for name, prop in PROPERTIES.items():
-        price = offer_prices[name]
-        dp = down_pcts[name]
-        down = price * dp / 100
-        loan = price - down
-        mpmt_lo = monthly_mortgage(loan, rate_lo, loan_term)
-        mpmt_hi = monthly_mortgage(loan, rate_hi, loan_term)
-        taxes = prop["taxes_monthly"]
-        hoa = prop["common_charges_monthly"]
-        total_lo = mpmt_lo + taxes + hoa
-        total_hi = mpmt_hi + taxes + hoa
-        val5 = appreciation_series(price, appreciation_rate, 5)[60]
-        val10 = appreciation_series(price, appreciation_rate, 10)[120]
-        bal5_lo = amortization_schedule(loan, rate_lo, loan_term)[0][min(59, loan_term * 12 - 1)]
-        bal5_hi = amortization_schedule(loan, rate_hi, loan_term)[0][min(59, loan_term * 12 - 1)]
-        bal10_lo = amortization_schedule(loan, rate_lo, loan_term)[0][min(119, loan_term * 12 - 1)]
-        bal10_hi = amortization_schedule(loan, rate_hi, loan_term)[0][min(119, loan_term * 12 - 1)]
-
-        rows.append({
-            "Property": prop["address"],
-            "Neighborhood": prop["neighborhood"],
-            "Price": f"${price:,.0f}",
-            "$/SF": f"${price/prop['sqft']:,.0f}",
-            "Down Payment": f"${down:,.0f} ({dp}%)",
-            "Monthly Mortgage": f"${mpmt_lo:,.0f} – ${mpmt_hi:,.0f}",
-            "Taxes/mo": f"${taxes:,}",
-            "HOA/mo": f"${hoa:,}",
-            "Total Monthly": f"${total_lo:,.0f} – ${total_hi:,.0f}",
-            "Total Annual": f"${total_lo*12:,.0f} – ${total_hi*12:,.0f}",
-            "Value @ 5yr": f"${val5:,.0f}",
-            "Equity @ 5yr": f"${val5-bal5_hi:,.0f} – ${val5-bal5_lo:,.0f}",
-            "Value @ 10yr": f"${val10:,.0f}",
-            "Equity @ 10yr": f"${val10-bal10_hi:,.0f} – ${val10-bal10_lo:,.0f}",
-            "Total Paid 5yr": f"${total_lo*60:,.0f} – ${total_hi*60:,.0f}",
-            "Total Paid 10yr": f"${total_lo*120:,.0f} – ${total_hi*120:,.0f}",
-        })
+    st.markdown('<div class="section-head" style="margin-top:2rem;">Side-by-Side Comparison</div>', unsafe_allow_html=True)
 
-    df = pd.DataFrame(rows).set_index("Property").T
-    st.dataframe(df, use_container_width=True, height=620)
+    with profiler.section("comparison table"):
+        scope = st.radio("Compare", ["Shortlist", "All listings"], horizontal=True, key="compare_scope")
+        if scope == "Shortlist":
+            columns = comparison_columns(list(listings.values()), evaluation)
+        else:
+            # Listings off the shortlist are evaluated at list price and the default down payment
+            columns = all_listings_comparison(listings_version, scenario, store)
+        compared_rows = len(columns["Property"])
+
+        rank_col, top_col = st.columns([3, 1])
+        rankable = [name for name in columns if columns[name].dtype.kind == "f"]
+        rank_by = rank_col.selectbox(
+            "Rank by", rankable, index=rankable.index("Total Monthly lo"), key="compare_rank",
+            help="Best first: highest for value and equity, lowest for everything else",
+        )
+        top = top_col.number_input(
+            "Show top", min_value=1, max_value=max(compared_rows, 1), value=min(compared_rows, 25),
+            key=f"compare_top_{scope}",
+        )
+        order = rank(columns, rank_by, top)
+        df = pd.DataFrame({"Rank": np.arange(1, len(order) + 1), **{name: col[order] for name, col in columns.items()}})
+
+        dollars = st.column_config.NumberColumn(format="$%,d")
+        column_config = {name: dollars for name in rankable}
+        column_config["Down %"] = st.column_config.NumberColumn(format="%d%%")
+        column_config[BREAK_EVEN] = st.column_config.NumberColumn(
+            "Rent/Buy Break-even (yrs)", format="%.1f",
+            help=f"Blank when buying doesn't come out ahead within {projection_years} years",
+        )
+        with profiler.section("st.dataframe"):
+            st.dataframe(df, hide_index=True, use_container_width=True, column_config=column_config)
 
     # ---- Overlay charts ----
-    chart_cols = st.columns(2, gap="large")
-
-    with chart_cols[0]:
-        st.markdown('<div class="section-head">Value Appreciation</div>', unsafe_allow_html=True)
-        fig_comp = go.Figure()
-        for i, (name, prop) in enumerate(PROPERTIES.items()):
-            vals = appreciation_series(offer_prices[name], appreciation_rate, projection_years)
-            fig_comp.add_trace(go.Scatter(
-                x=[m / 12 for m in range(len(vals))], y=vals,
-                name=name, line=dict(width=2, color=CHART_COLORS[i]),
-            ))
-        fig_comp.update_layout(xaxis_title="Years")
-        st.plotly_chart(styled_chart(fig_comp, 380), use_container_width=True)
-
-    with chart_cols[1]:
-        st.markdown('<div class="section-head">Total Equity</div>', unsafe_allow_html=True)
-        fig_eq = go.Figure()
-        for i, (name, prop) in enumerate(PROPERTIES.items()):
-            price = offer_prices[name]
-            dp = down_pcts[name]
-            loan = price - price * dp / 100
-            vals = appreciation_series(price, appreciation_rate, projection_years)
-            bals = [loan] + list(amortization_schedule(loan, rate_lo, loan_term)[0][: projection_years * 12])
-            while len(bals) < len(vals):
-                bals.append(0)
-            eq = [v - b for v, b in zip(vals, bals)]
-            fig_eq.add_trace(go.Scatter(
-                x=[m / 12 for m in range(len(eq))], y=eq,
-                name=name, line=dict(width=2, color=CHART_COLORS[i]),
-            ))
-        fig_eq.update_layout(xaxis_title="Years")
-        st.plotly_chart(styled_chart(fig_eq, 380), use_container_width=True)
+    with profiler.section("overlay charts"):
+        # Only the open overlay's figure is built
+        value_tab, equity_tab = st.tabs(
+            ["Value Appreciation", "Total Equity"], key="overlay_tab", on_change="rerun",
+        )
+
+        if value_tab.open:
+            with value_tab:
+                fig_comp = value_overlay_figure(
+                    tuple((name, offer_prices[name]) for name in listings),
+                    appreciation_rate, projection_years,
+                )
+                show_chart(fig_comp)
+
+        if equity_tab.open:
+            with equity_tab:
+                fig_eq = equity_overlay_figure(
+                    tuple((name, offer_prices[name], projections[name].loan_amount) for name in listings),
+                    rate_lo, loan_term, appreciation_rate, projection_years, structure,
+                )
+                show_chart(fig_eq)
+
+show_profile()
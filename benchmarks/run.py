@@ -0,0 +1,312 @@
+"""Headless benchmarks for the financial kernels and full dashboard reruns.
+
+Usage::
+
+    python -m benchmarks.run [--out bench.json] [--compare OLD.json] [--sizes 3,100,1000]
+                             [--only imports|kernels|app] [--quick]
+
+``import housing`` is timed in fresh interpreters and fails if it pulls in a
+UI library. Kernels are timed across loan terms, rates (including 0%) and batch sizes.
+Full reruns go through Streamlit's testing harness with synthetic listing
+sets, so no browser or server is needed. Results are written as JSON keyed by
+group, name and parameters. ``--compare`` prints the ratio against an
+earlier run for every matching entry. The on-disk result cache is turned off,
+so cold timings measure computation rather than file reads.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from housing import amortization_schedule, appreciation_series, loan_balance_path, monthly_mortgage, scenario_grid
+from housing.cache import clear_caches
+from housing.config import ROOT
+from housing.costs import CarryingCosts
+from housing.montecarlo import project_stochastic
+from housing.projection import project_property
+from housing.results import RESULTS
+
+TERMS = (15, 30)
+RATES = (0.0, 6.5)
+BATCH_SIZES = (1, 100, 10_000)
+LISTING_SIZES = (3, 100, 1000)
+# The computation core must import without any of these
+UI_MODULES = ("streamlit", "plotly", "pandas", "PIL")
+
+
+def measure(func, repeat: int = 5, min_time: float = 0.1) -> dict:
+    """Per-call seconds, looping ``func`` until one timing takes ``min_time``."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return {"number": number, "best_s": min(times), "median_s": statistics.median(times)}
+
+
+# ---------------------------------------------------------------------------
+# Imports
+# ---------------------------------------------------------------------------
+
+_IMPORT_PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import housing
+elapsed = time.perf_counter() - start
+print(elapsed, *[m for m in {UI_MODULES!r} if m in sys.modules])
+"""
+
+
+def run_imports(repeat: int) -> list[dict]:
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _IMPORT_PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+        elapsed, *ui = out.stdout.split()
+        if ui:
+            raise RuntimeError(f"import housing pulled in {', '.join(ui)}")
+        times.append(float(elapsed))
+    result = {"group": "import", "name": "housing", "params": {},
+              "number": repeat, "best_s": min(times), "median_s": statistics.median(times)}
+    _report(result)
+    return [result]
+
+
+# ---------------------------------------------------------------------------
+# Kernels
+# ---------------------------------------------------------------------------
+
+
+def kernel_cases():
+    """Yield ``(name, params, func)`` for every kernel configuration."""
+    rng = np.random.default_rng(0)
+    for batch in BATCH_SIZES:
+        principal = rng.uniform(4e5, 2e6, batch) if batch > 1 else 1e6
+        for term in TERMS:
+            for rate in RATES:
+                params = {"batch": batch, "term": term, "rate": rate}
+                yield "monthly_mortgage", params, lambda p=principal, r=rate, t=term: monthly_mortgage(p, r, t)
+                yield "amortization_schedule", params, lambda p=principal, r=rate, t=term: amortization_schedule(p, r, t)
+                yield "loan_balance_path", params, lambda p=principal, r=rate, t=term: loan_balance_path(p, r, t, 360)
+        for years in (10, 30):
+            params = {"batch": batch, "years": years, "rate": 3.0}
+            yield "appreciation_series", params, lambda p=principal, y=years: appreciation_series(p, 3.0, y)
+
+    for listings in (3, 30):
+        prices = rng.uniform(5e5, 2e6, listings)
+        carrying = rng.uniform(1000, 4000, listings)
+        rates = np.arange(3.0, 10.001, 0.125)
+        downs = np.arange(0, 101, 5)
+        offers = np.arange(85, 106, 5)
+        appreciation = np.arange(-2.0, 6.01, 0.5)
+        params = {"listings": listings, "scenarios": listings * rates.size * downs.size * offers.size * appreciation.size}
+        yield ("scenario_grid", params,
+               lambda p=prices, c=carrying: scenario_grid(p, c, rates, downs, offers, appreciation, 30, 10))
+
+    # Memoized entry points, timed cold: every call starts from empty caches
+    for years in (10, 30):
+        params = {"years": years, "cold": True}
+        yield ("project_property", params,
+               lambda y=years: (clear_caches(), project_property(1.2e6, 20, CarryingCosts(900, 1500), 5.5, 6.0, 30, 3.0, y)))
+        for arm in (None, 7):
+            params = {"years": years, "arm_fixed_years": arm, "cold": True}
+            yield ("project_stochastic", params,
+                   lambda y=years, a=arm: (clear_caches(), project_stochastic(9.6e5, 1.2e6, 5.5, 30, 3.0, 8.0, y, a)))
+
+
+def run_kernels(repeat: int, min_time: float) -> list[dict]:
+    results = []
+    for name, params, func in kernel_cases():
+        result = {"group": "kernel", "name": name, "params": params, **measure(func, repeat, min_time)}
+        _report(result)
+        results.append(result)
+    clear_caches()
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Full reruns
+# ---------------------------------------------------------------------------
+
+
+def synthetic_records(n: int, seed: int = 0) -> list[dict]:
+    """``n`` listings varied from the bundled ones, with unique names and addresses."""
+    templates = json.loads((ROOT / "data" / "listings.json").read_text())
+    rng = np.random.default_rng(seed)
+    neighborhoods = sorted({rec["neighborhood"] for rec in templates}) + ["Park Slope", "Fort Greene", "Bed-Stuy"]
+    records = []
+    for i in range(n):
+        rec = dict(templates[i % len(templates)])
+        street = rec["address"].split(",")[0]
+        unit = f"{i // len(templates) + 1}{'ABCD'[i % 4]}"
+        rec["name"] = f"{street} {unit}"
+        rec["address"] = f"{street}, Unit {unit}"
+        rec["neighborhood"] = neighborhoods[rng.integers(len(neighborhoods))]
+        rec["price"] = int(round(rng.uniform(6e5, 2.5e6), -3))
+        rec["sqft"] = int(rng.integers(550, 2200))
+        rec["taxes_monthly"] = int(rng.integers(100, 2500))
+        rec["common_charges_monthly"] = int(rng.integers(400, 3000))
+        records.append(rec)
+    return records
+
+
+def _rerun_cases(names: list[str]):
+    """Yield ``(name, setup)``; ``setup`` adjusts the AppTest before a timed run."""
+
+    def set_widget(kind, label, value):
+        def setup(at):
+            next(w for w in getattr(at, kind) if w.label == label).set_value(value)
+        return setup
+
+    yield "unchanged", lambda at: None
+    yield "horizon_10", set_widget("slider", "Projection Horizon (years)", 10)
+    yield "horizon_30", set_widget("slider", "Projection Horizon (years)", 30)
+    yield "comparison_off", set_widget("toggle", "Side-by-Side Comparison", False)
+    yield "comparison_on", set_widget("toggle", "Side-by-Side Comparison", True)
+
+    def full_shortlist(at):
+        at.session_state["shortlist"] = names[:8]
+    yield "shortlist_8", full_shortlist
+
+
+def run_app(sizes: list[int], repeat: int) -> list[dict]:
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            records = synthetic_records(size)
+            path = Path(tmp) / f"listings-{size}.json"
+            path.write_text(json.dumps(records))
+            os.environ["HOUSE_HUNT_LISTINGS"] = str(path)
+
+            clear_caches()
+            at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=600)
+            start = time.perf_counter()
+            at.run()
+            cold = time.perf_counter() - start
+            _check(at)
+            result = {"group": "app", "name": "cold", "params": {"listings": size},
+                      "number": 1, "best_s": cold, "median_s": cold}
+            _report(result)
+            results.append(result)
+
+            for name, setup in _rerun_cases([rec["name"] for rec in records]):
+                setup(at)
+                times = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    at.run()
+                    times.append(time.perf_counter() - start)
+                _check(at)
+                result = {"group": "app", "name": name, "params": {"listings": size},
+                          "number": repeat, "best_s": min(times), "median_s": statistics.median(times)}
+                _report(result)
+                results.append(result)
+    return results
+
+
+def _check(at) -> None:
+    if at.exception:
+        raise RuntimeError(f"app raised: {at.exception[0].value}")
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+
+def _key(result: dict) -> str:
+    return f"{result['group']}/{result['name']} {json.dumps(result['params'], sort_keys=True)}"
+
+
+def _report(result: dict) -> None:
+    print(f"{_key(result):<78} {result['median_s'] * 1e3:>10.3f} ms", flush=True)
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata() -> dict:
+    import pandas
+    import plotly
+    import streamlit
+
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": {
+            "numpy": np.__version__,
+            "pandas": pandas.__version__,
+            "plotly": plotly.__version__,
+            "streamlit": streamlit.__version__,
+        },
+    }
+
+
+def compare(results: list[dict], baseline_path: Path) -> None:
+    baseline = {_key(r): r for r in json.loads(baseline_path.read_text())["results"]}
+    print(f"\nRatio to {baseline_path} (median; >1 is slower):")
+    for result in results:
+        old = baseline.get(_key(result))
+        if old is not None and old["median_s"] > 0:
+            print(f"{_key(result):<78} {result['median_s'] / old['median_s']:>10.2f}x")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", type=Path, default=Path("bench.json"))
+    parser.add_argument("--compare", type=Path, default=None, help="earlier results file to compare against")
+    parser.add_argument("--sizes", default=",".join(map(str, LISTING_SIZES)), help="synthetic listing counts")
+    parser.add_argument("--only", choices=("imports", "kernels", "app"), default=None)
+    parser.add_argument("--quick", action="store_true", help="fewer, shorter repeats")
+    args = parser.parse_args(argv)
+
+    out = args.out.resolve()
+    os.chdir(ROOT)
+    RESULTS.max_bytes = 0
+    repeat, min_time = (3, 0.02) if args.quick else (5, 0.1)
+    results = []
+    if args.only in (None, "imports"):
+        results += run_imports(repeat)
+    if args.only in (None, "kernels"):
+        results += run_kernels(repeat, min_time)
+    if args.only in (None, "app"):
+        results += run_app([int(size) for size in args.sizes.split(",")], repeat)
+
+    out.write_text(json.dumps({"meta": metadata(), "results": results}, indent=1) + "\n")
+    print(f"\nWrote {len(results)} results to {out}")
+    if args.compare is not None:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""Computation core for the House Hunt dashboard.
+
+Nothing here imports Streamlit, Plotly or pandas; ``housing.charts`` is the
+only module that needs Plotly and is imported on its own.
+"""
+
+from housing.affordability import Affordability, affordability
+from housing.amortization import (
+    Schedule,
+    amortization_schedule,
+    appreciation_series,
+    loan_balance_path,
+    monthly_mortgage,
+)
+from housing.costs import CarryingCosts, carrying_schedule, listing_costs
+from housing.evaluation import Evaluation, Scenario, evaluate
+from housing.listings import Listing, ListingStore, PriceHistory, open_store
+from housing.loans import LoanPath, LoanStructure, RateSegment, loan_path
+from housing.montecarlo import StochasticProjection, project_stochastic
+from housing.rentbuy import RentBuyAssumptions, RentVsBuy, rent_vs_buy
+from housing.saved import ScenarioStore
+from housing.scenarios import ScenarioGrid, scenario_grid
+
+__all__ = [
+    "Affordability",
+    "CarryingCosts",
+    "Evaluation",
+    "Listing",
+    "ListingStore",
+    "LoanPath",
+    "LoanStructure",
+    "PriceHistory",
+    "RateSegment",
+    "RentBuyAssumptions",
+    "RentVsBuy",
+    "Scenario",
+    "ScenarioGrid",
+    "ScenarioStore",
+    "Schedule",
+    "StochasticProjection",
+    "affordability",
+    "amortization_schedule",
+    "appreciation_series",
+    "carrying_schedule",
+    "evaluate",
+    "listing_costs",
+    "loan_balance_path",
+    "loan_path",
+    "monthly_mortgage",
+    "open_store",
+    "project_stochastic",
+    "rent_vs_buy",
+    "scenario_grid",
+]
@@ -0,0 +1,70 @@
+"""Inverse affordability: what fits a monthly budget and a cash limit.
+
+The annuity payment is linear in the loan amount, so the largest loan a
+budget supports is closed-form, ``(budget - carrying) / payment_per_dollar``,
+and no root-finding is needed. Results have axes ``(listing, rate)``.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from housing.amortization import FloatArray, _monthly_rate, _payment
+
+
+@dataclass(frozen=True)
+class Affordability:
+    rates: FloatArray
+    max_loan: FloatArray
+    max_price: FloatArray
+    min_down: FloatArray
+    min_down_pct: FloatArray
+
+    @property
+    def fits(self) -> NDArray[np.bool_]:
+        """Whether the listing price itself is within budget."""
+        return ~np.isnan(self.min_down)
+
+
+def affordability(
+    prices: ArrayLike,
+    carrying_costs: ArrayLike,
+    budget: float,
+    rates: ArrayLike,
+    years: int,
+    cash: float,
+    min_down_pcts: ArrayLike | None = None,
+) -> Affordability:
+    """Max offer price and min down payment for every listing and rate.
+
+    ``budget`` caps the all-in monthly cost (mortgage plus ``carrying_costs``)
+    and ``cash`` caps the down payment. ``max_price`` puts all of ``cash``
+    down, unless a listing's minimum down percentage limits the price to
+    ``cash / min_down``. ``min_down`` is the smallest down payment at
+    ``prices`` that meets the budget and the minimum down percentage. It is
+    NaN where that needs more than ``cash``. Every result is NaN where
+    carrying costs alone exceed the budget.
+    """
+    price = np.asarray(prices, dtype=np.float64)[:, None]
+    carrying = np.asarray(carrying_costs, dtype=np.float64)[:, None]
+    rates = np.asarray(rates, dtype=np.float64)
+    min_down_frac = np.zeros_like(price) if min_down_pcts is None else np.asarray(min_down_pcts, dtype=np.float64)[:, None] / 100
+
+    per_dollar = _payment(np.float64(1), _monthly_rate(rates), years * 12)[None, :]
+    headroom = budget - carrying
+    max_loan = np.where(headroom >= 0, headroom / per_dollar, np.nan)
+
+    with np.errstate(divide="ignore"):
+        cash_cap = np.where(min_down_frac > 0, cash / min_down_frac, np.inf)
+    max_price = np.minimum(cash + max_loan, cash_cap)
+
+    min_down = np.maximum(price - max_loan, price * min_down_frac).clip(min=0)
+    min_down = np.where(min_down <= cash, min_down, np.nan)
+    return Affordability(
+        rates=rates,
+        max_loan=max_loan,
+        max_price=max_price,
+        min_down=min_down,
+        min_down_pct=min_down / price * 100,
+    )
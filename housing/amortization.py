@@ -0,0 +1,85 @@
+"""Closed-form mortgage and appreciation kernels.
+
+Every function accepts scalars or arrays for the dollar and rate arguments and
+broadcasts them against each other, so a whole batch of principals or rates is
+evaluated in one call. Month-indexed results carry a trailing month axis.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+FloatArray = NDArray[np.float64]
+
+
+class Schedule(NamedTuple):
+    balances: FloatArray
+    principal: FloatArray
+    interest: FloatArray
+    equity: FloatArray
+
+
+def _monthly_rate(annual_rate_pct: ArrayLike) -> FloatArray:
+    return np.asarray(annual_rate_pct, dtype=np.float64) / 100 / 12
+
+
+def _balance_factor(r: FloatArray, n: int, months: NDArray) -> FloatArray:
+    """Remaining balance per $1 borrowed after each of ``months`` payments.
+
+    ``r`` must already carry a trailing axis of length one so it broadcasts
+    against ``months``.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_growth = np.log1p(r)
+        total = np.expm1(n * log_growth)
+        factor = (total - np.expm1(months * log_growth)) / total
+    return np.where(r == 0, 1 - months / n, factor)
+
+
+def _payment(principal: FloatArray, r: FloatArray, n: int) -> FloatArray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (1 + r) ** n
+        return np.where(r == 0, principal / n, principal * r * growth / (growth - 1))
+
+
+def monthly_mortgage(principal: ArrayLike, annual_rate_pct: ArrayLike, years: int):
+    principal = np.asarray(principal, dtype=np.float64)
+    return _payment(principal, _monthly_rate(annual_rate_pct), years * 12)[()]
+
+
+def amortization_schedule(principal: ArrayLike, annual_rate_pct: ArrayLike, years: int) -> Schedule:
+    """Month-by-month schedule for a fixed-rate, fully amortizing loan.
+
+    Entry ``k`` of each array describes the state after payment ``k + 1``.
+    """
+    principal = np.asarray(principal, dtype=np.float64)[..., None]
+    r = _monthly_rate(annual_rate_pct)[..., None]
+    n = years * 12
+    months = np.arange(n + 1)
+    payment = _payment(principal, r, n)
+
+    balance = principal * _balance_factor(r, n, months)
+    interest = balance[..., :-1] * r
+    balances = np.maximum(balance[..., 1:], 0)
+    return Schedule(
+        balances=balances,
+        principal=payment - interest,
+        interest=interest,
+        equity=principal - balances,
+    )
+
+
+def loan_balance_path(principal: ArrayLike, annual_rate_pct: ArrayLike, years: int, horizon_months: int) -> FloatArray:
+    """Outstanding balance at months ``0..horizon_months``, zero once paid off."""
+    principal = np.asarray(principal, dtype=np.float64)[..., None]
+    r = _monthly_rate(annual_rate_pct)[..., None]
+    n = years * 12
+    months = np.minimum(np.arange(horizon_months + 1), n)
+    return np.maximum(principal * _balance_factor(r, n, months), 0)
+
+
+def appreciation_series(price: ArrayLike, annual_pct: ArrayLike, years: int) -> FloatArray:
+    price = np.asarray(price, dtype=np.float64)[..., None]
+    monthly_r = (1 + np.asarray(annual_pct, dtype=np.float64)[..., None] / 100) ** (1 / 12) - 1
+    return price * (1 + monthly_r) ** np.arange(years * 12 + 1)
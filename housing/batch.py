@@ -0,0 +1,300 @@
+"""Evaluate a listings file headlessly and write the comparison table.
+
+Usage::
+
+    python -m housing.batch LISTINGS OUT [--scenario NAME] [--rate-lo 5.425] [--rate-hi 5.8]
+                            [--term 30] [--appreciation 3.0] [--horizon 30] [--down PCT]
+                            [--offer-pct 100] [--rent-yield PCT] [--arm YEARS] [--arm-reset PTS]
+                            [--interest-only YEARS] [--extra-principal DOLLARS]
+                            [--lump-sum DOLLARS] [--lump-sum-year N] [--recast]
+                            [--workers N] [--chunk 256]
+
+``LISTINGS`` is a ``.json`` list of records, a ``.jsonl`` file with one
+record per line, or a ``.npz`` store snapshot. ``OUT`` is a ``.csv``,
+``.parquet``, ``.json`` or ``.jsonl`` file, or ``-`` for CSV on stdout. Each
+output row is one listing's row of the dashboard's side-by-side comparison,
+as unformatted numbers; a missing break-even (buying never wins within the
+horizon) is empty, or null in JSON. Parameters default to the dashboard's
+and can be taken from a saved scenario, with flags taking precedence. Any
+loan structure flag replaces the saved scenario's whole loan structure.
+
+Listings are evaluated in chunks across a process pool. Only a few chunks are
+in flight at a time, and rows are written in input order as each chunk
+completes. A ``.json`` or ``.npz`` input is loaded into a listing store that
+the workers share in memory (see ``housing.parallel``), so a chunk is sent as
+a row range rather than pickled records. ``.jsonl`` input is read lazily and
+sent chunk by chunk instead, so memory stays flat however long the feed is.
+
+The on-disk result cache is off unless ``--result-cache`` is given, since a
+nightly feed rarely repeats its inputs.
+"""
+
+import argparse
+import csv
+import dataclasses
+import importlib.util
+import itertools
+import json
+import math
+import os
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from housing import results
+from housing.evaluation import Scenario, evaluate
+from housing.listings import Listing, ListingStore
+from housing.loans import LoanStructure
+from housing.parallel import evaluate_shards
+from housing.report import comparison_columns
+from housing.saved import ScenarioStore
+
+FORMATS = ("csv", "parquet", "json", "jsonl")
+DEFAULT_CHUNK = 256
+
+Columns = dict[str, np.ndarray]
+
+
+def _evaluate_chunk(records: list[Listing], scenario: Scenario, result_cache: bool) -> Columns:
+    with results.RESULTS.disabled(not result_cache):
+        return comparison_columns(records, evaluate(records, scenario))
+
+
+def read_records(path: Path) -> Iterator[Listing]:
+    """Listing records from ``path``; ``.jsonl`` is read one line at a time."""
+    if path.suffix == ".jsonl":
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif path.suffix == ".npz":
+        store = ListingStore.load(path)
+        for i in range(len(store)):
+            yield store.record(i)
+    else:
+        yield from json.loads(path.read_text())
+
+
+def _chunks(records: Iterable[Listing], size: int) -> Iterator[list[Listing]]:
+    iterator = iter(records)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def evaluate_stream(records: Iterable[Listing], scenario: Scenario, pool: Executor | None = None,
+                    chunk_size: int = DEFAULT_CHUNK, window: int = 8,
+                    result_cache: bool = False) -> Iterator[Columns]:
+    """Yield comparison columns chunk by chunk, in input order.
+
+    With a ``pool``, at most ``window`` chunks are submitted ahead of the one
+    being yielded. Without one, chunks are evaluated in this process.
+    """
+    chunks = _chunks(records, chunk_size)
+    if pool is None:
+        for chunk in chunks:
+            yield _evaluate_chunk(chunk, scenario, result_cache)
+        return
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.submit(_evaluate_chunk, chunk, scenario, result_cache))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+
+def _rows(columns: Columns) -> list[tuple]:
+    """Plain Python rows, with NaN as None."""
+    values = [
+        [None if math.isnan(value) else value for value in column.tolist()] if column.dtype.kind == "f" else column.tolist()
+        for column in columns.values()
+    ]
+    return list(zip(*values))
+
+
+class _CsvWriter:
+    def __init__(self, f):
+        self.writer = csv.writer(f)
+        self.header = False
+
+    def write(self, columns: Columns) -> None:
+        if not self.header:
+            self.writer.writerow(columns)
+            self.header = True
+        self.writer.writerows(_rows(columns))
+
+    def close(self) -> None:
+        pass
+
+
+class _JsonLinesWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, columns: Columns) -> None:
+        self.f.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in _rows(columns))
+
+    def close(self) -> None:
+        pass
+
+
+class _JsonArrayWriter:
+    """A JSON list written incrementally: ``[`` first, ``]`` on close."""
+
+    def __init__(self, f):
+        self.f = f
+        self.separator = "[\n"
+
+    def write(self, columns: Columns) -> None:
+        for row in _rows(columns):
+            self.f.write(self.separator + json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+            self.separator = ",\n"
+
+    def close(self) -> None:
+        self.f.write("[]\n" if self.separator == "[\n" else "\n]\n")
+
+
+class _ParquetWriter:
+    """One row group per chunk; needs ``pyarrow``."""
+
+    def __init__(self, path: Path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa, self.pq = pa, pq
+        self.path = path
+        self.writer = None
+
+    def write(self, columns: Columns) -> None:
+        table = self.pa.Table.from_pydict(columns)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+def output_format(out: str, fmt: str | None) -> str:
+    if fmt is not None:
+        return fmt
+    if out == "-":
+        return "csv"
+    suffix = Path(out).suffix.lstrip(".").lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"cannot tell the format of {out!r}; pass --format")
+    return suffix
+
+
+def write_rows(chunks: Iterable[Columns], out: str, fmt: str) -> int:
+    """Write every chunk to ``out`` as it arrives; return the row count."""
+    count = 0
+    f = sys.stdout if out == "-" else None
+    try:
+        if fmt == "parquet":
+            writer = _ParquetWriter(Path(out))
+        else:
+            if f is None:
+                f = open(out, "w", newline="" if fmt == "csv" else None, encoding="utf-8")
+            writer = {"csv": _CsvWriter, "json": _JsonArrayWriter, "jsonl": _JsonLinesWriter}[fmt](f)
+        for columns in chunks:
+            writer.write(columns)
+            count += len(columns["Property"])
+        writer.close()
+    finally:
+        if f is not None and f is not sys.stdout:
+            f.close()
+    return count
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m housing.batch", description=__doc__.split("\n\n")[0])
+    parser.add_argument("listings", type=Path)
+    parser.add_argument("out", help="output file, or - for CSV on stdout")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="default: from the output suffix")
+    parser.add_argument("--scenario", default=None, help="start from this saved scenario's parameters")
+    parser.add_argument("--rate-lo", type=float)
+    parser.add_argument("--rate-hi", type=float)
+    parser.add_argument("--term", type=int, dest="loan_term")
+    parser.add_argument("--appreciation", type=float, dest="appreciation_rate")
+    parser.add_argument("--horizon", type=int, dest="projection_years")
+    parser.add_argument("--tax-growth", type=float)
+    parser.add_argument("--charge-growth", type=float)
+    parser.add_argument("--full-tax-rate", type=float)
+    parser.add_argument("--down", type=int, dest="down_pct", help="down payment %% for every listing")
+    parser.add_argument("--offer-pct", type=float, help="offer as %% of list price")
+    parser.add_argument("--rent-yield", type=float, help="comparable rent, %% of price a year; adds the break-even")
+    parser.add_argument("--arm", type=int, dest="arm_fixed_years", help="adjustable rate, fixed for this many years")
+    parser.add_argument("--arm-reset", type=float, dest="arm_reset_pct", help="points added to the rate after the reset")
+    parser.add_argument("--interest-only", type=int, dest="interest_only_years", help="years of interest-only payments")
+    parser.add_argument("--extra-principal", type=float, dest="extra_monthly", help="extra principal every month")
+    parser.add_argument("--lump-sum", type=float, help="one-off principal payment")
+    parser.add_argument("--lump-sum-year", type=int, help="year the lump sum is paid at the end of (default: 1)")
+    parser.add_argument("--recast", action="store_true", default=None, help="re-amortize the payment after the lump sum")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count; 1 runs serially)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="listings per task")
+    parser.add_argument("--result-cache", action="store_true", help="read and write the on-disk result cache")
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = output_format(args.out, args.format)
+    except ValueError as e:
+        parser.error(str(e))
+    if fmt == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        parser.error("writing Parquet needs pyarrow (pip install pyarrow)")
+
+    scenario = Scenario()
+    if args.scenario is not None:
+        saved = ScenarioStore().load(args.scenario)
+        if saved is None:
+            parser.error(f"no saved scenario named {args.scenario!r}")
+        scenario = Scenario.from_saved(saved)
+    overrides = {
+        f.name: getattr(args, f.name)
+        for f in dataclasses.fields(Scenario)
+        if getattr(args, f.name, None) is not None
+    }
+    loan_options = {
+        name: getattr(args, name)
+        for name in ("arm_fixed_years", "arm_reset_pct", "interest_only_years", "extra_monthly",
+                     "lump_sum", "lump_sum_year", "recast")
+        if getattr(args, name) is not None
+    }
+    if loan_options:
+        overrides["structure"] = LoanStructure.from_options(**loan_options)
+    scenario = dataclasses.replace(scenario, **overrides)
+
+    workers = args.workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if args.listings.suffix == ".jsonl":
+            chunks = evaluate_stream(
+                read_records(args.listings), scenario, pool, args.chunk, 2 * workers, args.result_cache,
+            )
+        else:
+            store = ListingStore.load(args.listings)
+            chunks = (
+                columns
+                for _, columns in evaluate_shards(store, [scenario], pool, args.chunk, 2 * workers, args.result_cache)
+            )
+        count = write_rows(chunks, args.out, fmt)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if args.out != "-":
+        print(f"Wrote {count} listing(s) to {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+"""Bounded memoization for the financial kernels.
+
+Cached results are shared between callers, so any arrays they contain are
+made read-only before being stored. Every memoized kernel keeps its entries
+in one process-wide ``MemoryCache``, so they are reused across Streamlit
+reruns and sessions. Each kernel is capped at ``maxsize`` entries and
+together they stay under one memory budget (``HOUSE_HUNT_MEMORY_CACHE_MB``),
+evicting the least recently used entry of any kernel first. The lock is
+held only to look up and store entries, never while computing, so sessions
+never wait on each other's misses. Kernels memoized with ``persist`` also go
+through the on-disk result cache, so their results outlive the process.
+
+Fixed-rate loans on the dashboard's rate grid skip memoization altogether:
+their balances and payments are scaled from ``housing.tables``, and the
+profiler sees those lookups as ``table_*`` kernels that never miss.
+"""
+
+import dataclasses
+import functools
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+from housing import profiling, results, tables
+from housing.amortization import (
+    FloatArray,
+    Schedule,
+    _monthly_rate,
+    amortization_schedule,
+    appreciation_series,
+    loan_balance_path,
+    monthly_mortgage,
+)
+from housing.loans import LoanStructure, loan_path
+
+MAX_BYTES = int(float(os.environ.get("HOUSE_HUNT_MEMORY_CACHE_MB", 512)) * (1 << 20))
+
+_REGISTRY = {}
+# Attribute types ``sizeof`` follows on objects that are not containers
+_CONTAINERS = (dict, list, tuple, np.ndarray)
+
+
+def _freeze(value):
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    elif dataclasses.is_dataclass(value):
+        for field in dataclasses.fields(value):
+            _freeze(getattr(value, field.name))
+    return value
+
+
+def sizeof(value, _seen: set | None = None) -> int:
+    """Approximate bytes held by ``value``.
+
+    Arrays count their buffers, containers and dataclasses their contents.
+    Other objects, such as Plotly figures, count the containers and arrays
+    in their attributes but not further objects they refer to.
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        # A view of another array holds its base's whole buffer; count that once
+        base = value
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        if base is value:
+            return value.nbytes
+        return sizeof(base, seen)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        items = [item for pair in value.items() for item in pair]
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        items = [getattr(value, field.name) for field in dataclasses.fields(value)]
+    elif _seen is None:
+        items = [item for item in getattr(value, "__dict__", {}).values() if isinstance(item, _CONTAINERS)]
+    else:
+        return size
+    return size + sum(sizeof(item, seen) for item in items)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    bytes: int
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires", "used")
+
+    def __init__(self, value, size: int, expires: float | None, used: int):
+        self.value, self.size, self.expires = value, size, expires
+        # Position in the global recency order; smaller was used longer ago
+        self.used = used
+
+
+_MISSING = object()
+# Separates positional from keyword arguments in keys
+_KWARGS = object()
+
+
+class MemoryTable:
+    """One kernel's entries, in least to most recently used order."""
+
+    def __init__(self, cache: "MemoryCache", maxsize: int, ttl: float | None):
+        self.cache, self.maxsize, self.ttl = cache, maxsize, ttl
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = self.misses = self.bytes = 0
+
+    def get(self, key):
+        """The value under ``key``, or ``_MISSING`` if absent or expired."""
+        with self.cache.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires is not None and entry.expires < time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            self.hits += 1
+            self.cache.clock += 1
+            entry.used = self.cache.clock
+            self.entries.move_to_end(key)
+            return entry.value
+
+    def put(self, key, value) -> None:
+        size = sizeof(value)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        cache = self.cache
+        with cache.lock:
+            if key in self.entries:
+                self._drop(key)
+            if size > cache.max_bytes or self.maxsize <= 0:
+                return
+            cache.clock += 1
+            self.entries[key] = _Entry(value, size, expires, cache.clock)
+            self.bytes += size
+            cache.bytes += size
+            while len(self.entries) > self.maxsize:
+                self._drop(next(iter(self.entries)))
+            cache.trim()
+
+    def _drop(self, key) -> None:
+        entry = self.entries.pop(key)
+        self.bytes -= entry.size
+        self.cache.bytes -= entry.size
+
+    def clear(self) -> None:
+        with self.cache.lock:
+            self.entries.clear()
+            self.cache.bytes -= self.bytes
+            self.hits = self.misses = self.bytes = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries), self.bytes)
+
+
+class MemoryCache:
+    """Thread-safe LRU tables with their own entry caps and TTLs under one byte budget."""
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        # Held only while entries are looked up, stored or dropped
+        self.lock = threading.Lock()
+        self.tables: dict[str, MemoryTable] = {}
+        self.clock = 0
+        self.bytes = 0
+
+    def table(self, name: str, maxsize: int, ttl: float | None = None) -> MemoryTable:
+        with self.lock:
+            table = self.tables[name] = MemoryTable(self, maxsize, ttl)
+        return table
+
+    def trim(self) -> None:
+        """Drop least recently used entries of any table until within budget; call with the lock held."""
+        while self.bytes > self.max_bytes:
+            # Each table is in recency order, so the oldest entry overall heads one of them
+            table = min(
+                (table for table in self.tables.values() if table.entries),
+                key=lambda table: next(iter(table.entries.values())).used,
+            )
+            table._drop(next(iter(table.entries)))
+
+    def clear(self) -> None:
+        for table in list(self.tables.values()):
+            table.clear()
+
+
+MEMORY = MemoryCache()
+
+
+def memoize(maxsize: int = 256, persist: bool = False, version: int = 1, ttl: float | None = None):
+    """Cache a kernel called with hashable scalar arguments in ``MEMORY``.
+
+    Keyword arguments are part of the key as given, so call sites should pass
+    each argument the same way to share entries. Entries older than ``ttl``
+    seconds are recomputed. With ``persist``, misses are looked up in
+    ``results.RESULTS`` before computing. The kernel must then be annotated
+    to return a dataclass of floats and arrays, and ``version`` must be
+    bumped whenever its results change for the same arguments.
+    """
+
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        result_type = func.__annotations__.get("return")
+        table = MEMORY.table(name, maxsize, ttl)
+
+        def compute(*args, **kwargs):
+            if not (persist and results.RESULTS.enabled):
+                return func(*args, **kwargs)
+            key = results.result_key(name, version, args, kwargs)
+            value = results.RESULTS.get(key, result_type)
+            if value is None:
+                value = func(*args, **kwargs)
+                results.RESULTS.put(key, value)
+            return value
+
+        def cached(*args, **kwargs):
+            # Returns (value, missed). The lock is released while computing, so
+            # a miss never holds up other sessions.
+            key = (*args, _KWARGS, *kwargs.items()) if kwargs else args
+            value = table.get(key)
+            if value is not _MISSING:
+                return value, False
+            value = _freeze(compute(*args, **kwargs))
+            table.put(key, value)
+            return value, True
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = profiling.current()
+            if profiler is None:
+                return cached(*args, **kwargs)[0]
+            return profiler.kernel(func.__name__, cached, args, kwargs)
+
+        wrapper.cache_info = table.info
+        wrapper.cache_clear = table.clear
+        _REGISTRY[func.__name__] = wrapper
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> dict:
+    return {name: wrapper.cache_info() for name, wrapper in _REGISTRY.items()}
+
+
+def clear_caches() -> None:
+    MEMORY.clear()
+
+
+_schedule = memoize(maxsize=512)(amortization_schedule)
+_balance_path = memoize(maxsize=512)(loan_balance_path)
+cached_appreciation = memoize(maxsize=256)(appreciation_series)
+cached_loan_path = memoize(maxsize=512)(loan_path)
+
+
+def table_kernel(name: str):
+    """Report calls of a lookup in ``housing.tables`` to the profiler as kernel ``name``.
+
+    Lookups are never misses, so the profile shows them next to the
+    memoized kernels they stand in for.
+    """
+
+    def decorator(func):
+        def hit(*args):
+            return func(*args), False
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            profiler = profiling.current()
+            if profiler is None:
+                return func(*args)
+            return profiler.kernel(name, hit, args, {})
+
+        return wrapper
+
+    return decorator
+
+
+@table_kernel("table_payment")
+def _table_payment(principal: float, factor: float) -> float:
+    return principal * factor
+
+
+@table_kernel("table_balance_path")
+def _table_balance_path(principal: float, curve: FloatArray) -> FloatArray:
+    return principal * curve
+
+
+@table_kernel("table_schedule")
+def _table_schedule(principal: float, rate: float, factor: float, curve: FloatArray) -> Schedule:
+    balance = principal * curve
+    interest = balance[:-1] * _monthly_rate(rate)
+    return Schedule(
+        balances=balance[1:],
+        principal=principal * factor - interest,
+        interest=interest,
+        equity=principal - balance[1:],
+    )
+
+
+def cached_payment(principal: float, rate: float, loan_term: int) -> float:
+    factor = tables.payment_factor(rate, loan_term)
+    if factor is None:
+        return monthly_mortgage(principal, rate, loan_term)
+    return _table_payment(principal, factor)
+
+
+def cached_balance_path(principal: float, rate: float, loan_term: int, horizon_months: int) -> FloatArray:
+    """Balance at months ``0..horizon_months`` of a fixed-rate loan, zero once paid off."""
+    curve = tables.balance_curve(rate, loan_term, horizon_months)
+    if curve is None:
+        return _balance_path(principal, rate, loan_term, horizon_months)
+    return _table_balance_path(principal, curve)
+
+
+def cached_schedule(principal: float, rate: float, loan_term: int) -> Schedule:
+    """``amortization_schedule`` for one loan."""
+    factor = tables.payment_factor(rate, loan_term)
+    if factor is None:
+        return _schedule(principal, rate, loan_term)
+    return _table_schedule(principal, rate, factor, tables.balance_curve(rate, loan_term, loan_term * 12))
+
+
+def cached_balances(principal: float, rate: float, loan_term: int, horizon_months: int,
+                    structure: LoanStructure | None = None) -> FloatArray:
+    """Balance at months ``0..horizon_months`` of a fixed-rate loan, or of ``structure``."""
+    if structure is None:
+        return cached_balance_path(principal, rate, loan_term, horizon_months)
+    return cached_loan_path(principal, rate, loan_term, horizon_months, structure).balances
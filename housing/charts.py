@@ -0,0 +1,268 @@
+"""Plotly figure builders for the dashboard.
+
+Each builder is memoized on exactly the inputs it plots, so a rerun only
+rebuilds the figures whose inputs changed. Cached figures are shared and must
+not be mutated by callers.
+
+Traces are given NumPy arrays so Plotly sends them as typed (base64) arrays
+rather than JSON number lists. Evenly spaced series use ``x0``/``dx`` instead
+of an x array, and long series are thinned to a point budget.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+from housing.cache import cached_appreciation, cached_balances, cached_loan_path, cached_schedule, memoize
+from housing.loans import LoanStructure
+from housing.montecarlo import project_stochastic
+
+# ---------------------------------------------------------------------------
+# Color palette & chart theme
+# ---------------------------------------------------------------------------
+
+COLORS = {
+    "bg": "#0e1117",
+    "card": "#1a1d23",
+    "card_border": "#2a2d35",
+    "accent": "#c9a962",
+    "accent_dim": "#a08839",
+    "text": "#e8e6e1",
+    "text_muted": "#8a8780",
+    "green": "#4ade80",
+    "red": "#f87171",
+    "blue": "#60a5fa",
+    "purple": "#a78bfa",
+    "orange": "#fb923c",
+    "chart_bg": "rgba(0,0,0,0)",
+    "grid": "#1f2229",
+}
+
+CHART_COLORS = [COLORS["accent"], COLORS["blue"], COLORS["purple"]]
+
+PLOTLY_LAYOUT = dict(
+    template="plotly_dark",
+    paper_bgcolor=COLORS["chart_bg"],
+    plot_bgcolor=COLORS["chart_bg"],
+    font=dict(family="Inter, system-ui, sans-serif", color=COLORS["text_muted"], size=12),
+    xaxis=dict(gridcolor=COLORS["grid"], zerolinecolor=COLORS["grid"]),
+    yaxis=dict(gridcolor=COLORS["grid"], zerolinecolor=COLORS["grid"], tickformat="$,.0f"),
+    legend=dict(orientation="h", y=1.08, font=dict(size=11)),
+    margin=dict(l=0, r=0, t=30, b=0),
+)
+
+
+def styled_chart(fig, height=420):
+    fig.update_layout(**PLOTLY_LAYOUT, height=height)
+    return fig
+
+
+def series_color(i: int) -> str:
+    return CHART_COLORS[i % len(CHART_COLORS)]
+
+
+# ---------------------------------------------------------------------------
+# Payload budgets
+# ---------------------------------------------------------------------------
+
+# Points per overlay chart, shared across its traces
+OVERLAY_POINT_BUDGET = 1200
+# Longer horizons show yearly rather than monthly amortization bars
+MONTHLY_BARS_MAX_YEARS = 10
+
+
+def monthly_stride(months: int, budget: int) -> int:
+    """Smallest stride that keeps a monthly series within ``budget`` points.
+
+    Strides divide 12, so a series over whole years always keeps its final
+    month. A year is the coarsest stride, whatever the budget.
+    """
+    for stride in (1, 2, 3, 4, 6):
+        if months // stride + 1 <= budget:
+            return stride
+    return 12
+
+
+# ---------------------------------------------------------------------------
+# Per-property figures
+# ---------------------------------------------------------------------------
+
+
+@memoize(maxsize=256)
+def projection_figure(price: float, loan_amount: float, rate: float, loan_term: int,
+                      appreciation_rate: float, projection_years: int, structure: LoanStructure | None = None):
+    horizon = projection_years * 12
+    values = cached_appreciation(price, appreciation_rate, projection_years)
+    balances = cached_balances(loan_amount, rate, loan_term, horizon, structure)
+    months = dict(x0=0, dx=1 / 12)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        **months, y=values,
+        name="Property Value", line=dict(width=2.5, color=COLORS["accent"]),
+    ))
+    fig.add_trace(go.Scatter(
+        **months, y=balances,
+        name="Loan Balance", line=dict(width=1.5, dash="dash", color=COLORS["red"]),
+    ))
+    fig.add_trace(go.Scatter(
+        **months, y=values - balances,
+        name="Total Equity",
+        line=dict(width=0, color=COLORS["green"]),
+        fill="tozeroy",
+        fillcolor="rgba(74,222,128,0.12)",
+    ))
+    fig.update_layout(xaxis_title="Years")
+    return styled_chart(fig, 400)
+
+
+def _band(fig, lower, upper, color: str, fillcolor: str, name: str):
+    fig.add_trace(go.Scatter(
+        y=upper, line=dict(width=0, color=color), hoverinfo="skip", showlegend=False,
+    ))
+    fig.add_trace(go.Scatter(
+        y=lower, name=name, line=dict(width=0, color=color),
+        fill="tonexty", fillcolor=fillcolor,
+    ))
+
+
+@memoize(maxsize=256)
+def stochastic_figure(price: float, loan_amount: float, rate: float, loan_term: int,
+                      appreciation_rate: float, volatility: float, projection_years: int,
+                      arm_fixed_years: int | None, rate_volatility: float):
+    proj = project_stochastic(
+        price, loan_amount, rate, loan_term, appreciation_rate, volatility, projection_years,
+        arm_fixed_years, rate_volatility,
+    )
+    span = slice(0, projection_years + 1)
+    (value_p10, value_p50, value_p90), (equity_p10, equity_p50, equity_p90) = proj.value_bands, proj.equity_bands
+
+    fig = go.Figure()
+    _band(fig, value_p10[span], value_p90[span],
+          COLORS["accent"], "rgba(201,169,98,0.12)", "Value P10–P90")
+    fig.add_trace(go.Scatter(
+        y=value_p50[span],
+        name="Value P50", line=dict(width=2.5, color=COLORS["accent"]),
+    ))
+    _band(fig, equity_p10[span], equity_p90[span],
+          COLORS["green"], "rgba(74,222,128,0.12)", "Equity P10–P90")
+    fig.add_trace(go.Scatter(
+        y=equity_p50[span],
+        name="Equity P50", line=dict(width=2, color=COLORS["green"]),
+    ))
+    fig.update_layout(xaxis_title="Years")
+    return styled_chart(fig, 400)
+
+
+@memoize(maxsize=256)
+def amortization_figure(loan_amount: float, rate: float, loan_term: int, projection_years: int,
+                        structure: LoanStructure | None = None):
+    """Monthly principal and interest; long horizons show each year's monthly average.
+
+    Principal includes any extra payments under ``structure``.
+    """
+    if structure is None:
+        _, princ_arr, int_arr, _ = cached_schedule(loan_amount, rate, loan_term)
+    else:
+        _, int_arr, princ_arr = cached_loan_path(loan_amount, rate, loan_term, loan_term * 12, structure)
+    amort_len = min(projection_years * 12, len(princ_arr))
+    interest, principal = int_arr[:amort_len], princ_arr[:amort_len]
+    if projection_years > MONTHLY_BARS_MAX_YEARS:
+        interest = interest.reshape(-1, 12).mean(axis=1)
+        principal = principal.reshape(-1, 12).mean(axis=1)
+        bars = dict(x0=0.5, dx=1)
+    else:
+        bars = dict(x0=1 / 12, dx=1 / 12)
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        **bars,
+        y=interest,
+        name="Interest", marker_color=COLORS["red"],
+    ))
+    fig.add_trace(go.Bar(
+        **bars,
+        y=principal,
+        name="Principal", marker_color=COLORS["green"],
+    ))
+    fig.update_layout(barmode="stack", xaxis_title="Years", yaxis_title="$/month")
+    return styled_chart(fig, 320)
+
+
+@memoize(maxsize=256)
+def price_history_figure(months: tuple, prices: tuple):
+    """``months`` are months since January 1970, as in ``ListingStore.history_months``."""
+    fig = go.Figure(go.Scatter(
+        x=np.array(months, dtype="datetime64[M]"), y=np.array(prices),
+        mode="lines+markers",
+        line=dict(width=2, color=COLORS["accent"]),
+        marker=dict(size=7, color=COLORS["accent"]),
+    ))
+    return styled_chart(fig, 260)
+
+
+def rent_vs_buy_figure(owner, renter, break_even_years: float):
+    """Net worth from buying vs. renting and investing, over months ``0..H``."""
+    months = dict(x0=0, dx=1 / 12)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        **months, y=owner,
+        name="Buy (net of selling costs)", line=dict(width=2.5, color=COLORS["accent"]),
+    ))
+    fig.add_trace(go.Scatter(
+        **months, y=renter,
+        name="Rent & invest", line=dict(width=2, color=COLORS["blue"]),
+    ))
+    if not np.isnan(break_even_years):
+        fig.add_vline(x=break_even_years, line=dict(width=1, dash="dot", color=COLORS["text_muted"]))
+    fig.update_layout(xaxis_title="Years")
+    return styled_chart(fig, 340)
+
+
+def sensitivity_heatmap(z, x, y, x_title: str, y_title: str, height=320):
+    fig = go.Figure(go.Heatmap(
+        z=z, x=x, y=y,
+        colorscale=[[0, COLORS["card"]], [1, COLORS["accent"]]],
+        colorbar=dict(tickformat="$,.0f", thickness=10),
+        hovertemplate=f"{x_title}: %{{x}}<br>{y_title}: %{{y}}%<br>%{{z:$,.0f}}<extra></extra>",
+    ))
+    fig.update_layout(xaxis_title=x_title, yaxis_title=y_title)
+    styled_chart(fig, height)
+    fig.update_yaxes(tickformat="d", ticksuffix="%")
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Comparison overlays
+# ---------------------------------------------------------------------------
+
+
+@memoize(maxsize=64)
+def value_overlay_figure(offers: tuple, appreciation_rate: float, projection_years: int):
+    """``offers`` holds one ``(name, price)`` pair per property."""
+    stride = monthly_stride(projection_years * 12, OVERLAY_POINT_BUDGET // max(len(offers), 1))
+    fig = go.Figure()
+    for i, (name, price) in enumerate(offers):
+        vals = cached_appreciation(price, appreciation_rate, projection_years)
+        fig.add_trace(go.Scatter(
+            x0=0, dx=stride / 12, y=vals[::stride],
+            name=name, line=dict(width=2, color=series_color(i)),
+        ))
+    fig.update_layout(xaxis_title="Years")
+    return styled_chart(fig, 380)
+
+
+@memoize(maxsize=64)
+def equity_overlay_figure(loans: tuple, rate: float, loan_term: int,
+                          appreciation_rate: float, projection_years: int, structure: LoanStructure | None = None):
+    """``loans`` holds one ``(name, price, loan_amount)`` triple per property."""
+    stride = monthly_stride(projection_years * 12, OVERLAY_POINT_BUDGET // max(len(loans), 1))
+    fig = go.Figure()
+    for i, (name, price, loan) in enumerate(loans):
+        vals = cached_appreciation(price, appreciation_rate, projection_years)
+        eq = vals - cached_balances(loan, rate, loan_term, projection_years * 12, structure)
+        fig.add_trace(go.Scatter(
+            x0=0, dx=stride / 12, y=eq[::stride],
+            name=name, line=dict(width=2, color=series_color(i)),
+        ))
+    fig.update_layout(xaxis_title="Years")
+    return styled_chart(fig, 380)
@@ -0,0 +1,14 @@
+"""Filesystem locations shared across the package."""
+
+import os
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(os.environ.get("HOUSE_HUNT_CACHE_DIR", ROOT / ".cache"))
+# Named scenarios are user data, not cache, so they live outside CACHE_DIR
+SCENARIOS_PATH = Path(os.environ.get("HOUSE_HUNT_SCENARIOS", ROOT / "data" / "scenarios.sqlite3"))
+# Listing feed for price refreshes: a base URL or a directory; unset disables them
+FEED = os.environ.get("HOUSE_HUNT_FEED")
+FEED_INTERVAL = float(os.environ.get("HOUSE_HUNT_FEED_INTERVAL", 300))
+# Processes evaluating listings in parallel; 1 evaluates in the calling process
+WORKERS = int(os.environ.get("HOUSE_HUNT_WORKERS", os.cpu_count() or 1))
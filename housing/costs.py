@@ -0,0 +1,118 @@
+"""Monthly carrying-cost schedules: taxes, common charges and assessments.
+
+Schedules cover months ``1..months`` on a trailing axis, aligned with the
+payment months of an amortization schedule, so totals over any period are a
+cumulative sum rather than a constant times a month count. Taxes and common
+charges step up once a year by their escalation rates. Listings broadcast
+along the leading axes.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from housing.amortization import FloatArray
+from housing.listings import Listing
+
+_ABATEMENT_YEARS = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)\b", re.I)
+_ABATEMENT_UNTIL = re.compile(r"\b(?:through|thru|until|expires?(?:\s+in)?|ends?(?:\s+in)?)\s+(\d{4})\b", re.I)
+
+
+def abatement_years(note: str | None, today: date | None = None) -> float:
+    """Years of tax abatement left according to a listing note, 0 if none is stated.
+
+    Understands "7+ years remaining" and "through 2031" phrasings.
+    """
+    if not note or "abate" not in note.lower():
+        return 0.0
+    if match := _ABATEMENT_YEARS.search(note):
+        return float(match.group(1))
+    if match := _ABATEMENT_UNTIL.search(note):
+        return float(max(int(match.group(1)) - (today or date.today()).year, 0))
+    return 0.0
+
+
+def _escalation(growth_pct: ArrayLike, month: np.ndarray) -> FloatArray:
+    """Annual step-up factor for each month; the first 12 months are 1."""
+    return (1 + np.asarray(growth_pct, dtype=np.float64)[..., None] / 100) ** ((month - 1) // 12)
+
+
+def carrying_schedule(
+    taxes: ArrayLike,
+    common_charges: ArrayLike,
+    months: int,
+    abatement_months: ArrayLike = 0,
+    full_taxes: ArrayLike | None = None,
+    tax_growth_pct: ArrayLike = 0.0,
+    charge_growth_pct: ArrayLike = 0.0,
+    assessment: ArrayLike = 0.0,
+    assessment_months: ArrayLike = 0,
+) -> FloatArray:
+    """Taxes plus common charges plus assessments for each month.
+
+    ``taxes`` is the current (possibly abated) monthly tax. From month
+    ``abatement_months + 1`` onward it is replaced by ``full_taxes``, in
+    today's dollars. Both escalate by ``tax_growth_pct`` a year. An
+    ``assessment`` is charged for the first ``assessment_months`` months.
+    """
+    month = np.arange(1, months + 1)
+    taxes = np.asarray(taxes, dtype=np.float64)[..., None]
+    if full_taxes is not None:
+        abated = month <= np.asarray(abatement_months, dtype=np.float64)[..., None]
+        taxes = np.where(abated, taxes, np.asarray(full_taxes, dtype=np.float64)[..., None])
+    charges = np.asarray(common_charges, dtype=np.float64)[..., None] * _escalation(charge_growth_pct, month)
+    assessed = month <= np.asarray(assessment_months, dtype=np.float64)[..., None]
+    total = (
+        taxes * _escalation(tax_growth_pct, month)
+        + charges
+        + np.where(assessed, np.asarray(assessment, dtype=np.float64)[..., None], 0)
+    )
+    return np.broadcast_to(total, total.shape[:-1] + (months,))
+
+
+@dataclass(frozen=True)
+class CarryingCosts:
+    """One listing's carrying-cost inputs; hashable, so memoized kernels can key on it."""
+
+    taxes: float
+    common_charges: float
+    abatement_months: int = 0
+    full_taxes: float | None = None
+    tax_growth_pct: float = 0.0
+    charge_growth_pct: float = 0.0
+    assessment: float = 0.0
+    assessment_months: int = 0
+
+    def schedule(self, months: int) -> FloatArray:
+        return carrying_schedule(
+            self.taxes, self.common_charges, months,
+            abatement_months=self.abatement_months,
+            full_taxes=self.full_taxes,
+            tax_growth_pct=self.tax_growth_pct,
+            charge_growth_pct=self.charge_growth_pct,
+            assessment=self.assessment,
+            assessment_months=self.assessment_months,
+        )
+
+
+def listing_costs(record: Listing, full_tax_rate_pct: float, tax_growth_pct: float = 0.0,
+                  charge_growth_pct: float = 0.0) -> CarryingCosts:
+    """Carrying costs for a listing record.
+
+    When ``tax_abatement_note`` states an abatement, taxes step up to
+    ``full_tax_rate_pct`` of the list price a year once it ends.
+    """
+    years = abatement_years(record.get("tax_abatement_note"))
+    return CarryingCosts(
+        taxes=record["taxes_monthly"],
+        common_charges=record["common_charges_monthly"],
+        abatement_months=round(years * 12),
+        full_taxes=record["price"] * full_tax_rate_pct / 100 / 12 if years else None,
+        tax_growth_pct=tax_growth_pct,
+        charge_growth_pct=charge_growth_pct,
+        assessment=record.get("assessment_monthly", 0),
+        assessment_months=record.get("assessment_months", 0),
+    )
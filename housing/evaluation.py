@@ -0,0 +1,123 @@
+"""Evaluate a scenario over a set of listings.
+
+A ``Scenario`` holds every input the dashboard's sidebar sets. ``evaluate``
+turns it into carrying costs and projections per listing, plus one
+vectorized rent-vs-buy comparison when a comparable rent is given. The
+dashboard, the batch CLI and worker processes all go through here, so they
+agree on defaults and on how per-listing overrides apply.
+"""
+
+from dataclasses import dataclass, field
+
+from housing.costs import CarryingCosts, listing_costs
+from housing.listings import Listing
+from housing.loans import LoanStructure
+from housing.projection import PropertyProjection, project_property
+from housing.rentbuy import RentBuyAssumptions, RentVsBuy, rent_vs_buy
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Scenario inputs; the defaults match the dashboard's."""
+
+    rate_lo: float = 5.425
+    rate_hi: float = 5.8
+    loan_term: int = 30
+    appreciation_rate: float = 3.0
+    projection_years: int = 30
+    tax_growth: float = 2.0
+    charge_growth: float = 3.0
+    full_tax_rate: float = 1.35
+    # ARM, interest-only and extra-principal terms; None is a plain fixed-rate loan
+    structure: LoanStructure | None = None
+    # Down payment for every listing; None uses max(20%, the listing's minimum)
+    down_pct: int | None = None
+    # Offer as a percentage of list price
+    offer_pct: float = 100.0
+    # Comparable rent as % of list price a year; None skips rent vs. buy
+    rent_yield: float | None = None
+    rent_assumptions: RentBuyAssumptions = RentBuyAssumptions()
+    # Per-listing overrides by name
+    offer_prices: dict = field(default_factory=dict)
+    down_pcts: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_saved(cls, params: dict) -> "Scenario":
+        """A scenario from the widget values saved by the dashboard."""
+        fields = {}
+        if "rate_range" in params:
+            fields["rate_lo"], fields["rate_hi"] = params["rate_range"]
+        for key, name in (("loan_term", "loan_term"), ("appreciation", "appreciation_rate"),
+                          ("horizon", "projection_years"), ("tax_growth", "tax_growth"),
+                          ("charge_growth", "charge_growth"), ("full_tax_rate", "full_tax_rate")):
+            if key in params:
+                fields[name] = params[key]
+        structure = LoanStructure.from_options(**{
+            name: params[key]
+            for key, name in (("loan_arm", "arm_fixed_years"), ("arm_reset", "arm_reset_pct"),
+                              ("interest_only", "interest_only_years"), ("extra_principal", "extra_monthly"),
+                              ("lump_sum", "lump_sum"), ("lump_sum_year", "lump_sum_year"), ("recast", "recast"))
+            if key in params
+        })
+        assumptions = {
+            name: params[key]
+            for key, name in (("rent_growth", "rent_growth_pct"), ("investment_return", "investment_return_pct"),
+                              ("closing_costs", "closing_cost_pct"), ("selling_costs", "selling_cost_pct"))
+            if key in params
+        }
+        return cls(
+            **fields,
+            structure=structure,
+            rent_yield=params.get("rent_yield"),
+            rent_assumptions=RentBuyAssumptions(**assumptions),
+            offer_prices={key[len("price_"):]: value for key, value in params.items() if key.startswith("price_")},
+            down_pcts={key[len("down_"):]: value for key, value in params.items() if key.startswith("down_")},
+        )
+
+    def offer_price(self, prop: Listing) -> float:
+        return self.offer_prices.get(prop["name"], round(prop["price"] * self.offer_pct / 100))
+
+    def down_payment_pct(self, prop: Listing) -> int:
+        default = self.down_pct if self.down_pct is not None else max(prop["min_down_pct"], 20)
+        return self.down_pcts.get(prop["name"], default)
+
+
+@dataclass(frozen=True, eq=False)
+class Evaluation:
+    """Per-listing results, in the order the listings were given."""
+
+    offer_prices: list[float]
+    down_pcts: list[int]
+    costs: list[CarryingCosts]
+    projections: list[PropertyProjection]
+    # Axis 0 is the listing; None unless the scenario has a rent yield
+    rent_buy: RentVsBuy | None
+
+
+def evaluate(records: list[Listing], scenario: Scenario) -> Evaluation:
+    offers = [scenario.offer_price(prop) for prop in records]
+    downs = [scenario.down_payment_pct(prop) for prop in records]
+    costs = [
+        listing_costs(prop, scenario.full_tax_rate, scenario.tax_growth, scenario.charge_growth)
+        for prop in records
+    ]
+    # Memoized per listing, so a change to one listing's inputs recomputes only that one
+    projections = [
+        project_property(
+            offer, down, cost, scenario.rate_lo, scenario.rate_hi, scenario.loan_term,
+            scenario.appreciation_rate, scenario.projection_years, scenario.structure,
+        )
+        for offer, down, cost in zip(offers, downs, costs)
+    ]
+    rent_buy = None
+    if scenario.rent_yield is not None and records:
+        # One vectorized evaluation covers every listing
+        rent_buy = rent_vs_buy(
+            offers, downs, scenario.rate_lo, scenario.loan_term, scenario.appreciation_rate,
+            scenario.projection_years,
+            [proj.carrying for proj in projections],
+            rents=[prop["price"] * scenario.rent_yield / 100 / 12 for prop in records],
+            assumptions=scenario.rent_assumptions,
+            structure=scenario.structure,
+        )
+    return Evaluation(offers, downs, costs, projections, rent_buy)
@@ -0,0 +1,363 @@
+"""Refresh asking prices from a listing feed.
+
+Usage::
+
+    python -m housing.feed refresh [--listings data/listings.json] [--feed URL_OR_DIR] [--concurrency 32]
+    python -m housing.feed serve DIR [--port 8765]
+
+A feed publishes one snapshot per listing, ``{"price": 1325000, "as_of":
+"2026-09"}``, at ``{feed}/{name}.json``. The feed is an ``http://`` or
+``https://`` base URL, or a local directory of such files; ``serve`` puts a
+directory on HTTP as a stand-in. A missing snapshot (404, or no file) leaves
+the listing alone. A feed URL may not carry a query string or fragment, and
+redirects are not followed: a 3xx response counts as a failed fetch, like
+any other status but 200 and 404.
+
+Snapshots are fetched with asyncio by a fixed number of workers, each
+keeping one connection open for all of its requests, so thousands of
+listings refresh in a few seconds without opening thousands of sockets. The
+prices are diffed against each listing's latest history entry and only
+changes are appended. The result is written atomically as a ``.npz`` next to
+the result cache, one per listings file path, and ``latest_path`` points
+readers at it, so the dashboard only ever loads a finished file and never
+waits on the network. Editing the listings file itself (for instance with
+``housing.ingest``) makes it newer than the snapshot. The next refresh then
+starts from the edited file and carries over the price history the feed had
+appended to the snapshot, so neither the edit nor the feed's history is
+lost.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import ssl
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+from numpy.typing import NDArray
+
+from housing.config import CACHE_DIR, FEED, FEED_INTERVAL
+from housing.listings import ListingStore
+
+FEED_DIR = CACHE_DIR / "feed"
+DEFAULT_CONCURRENCY = 32
+DEFAULT_TIMEOUT = 10.0
+
+
+class FeedError(Exception):
+    pass
+
+
+class Snapshots(NamedTuple):
+    """Per listing, in the order requested. Months are since January 1970."""
+
+    months: NDArray[np.int32]
+    prices: NDArray[np.int64]
+    found: NDArray[np.bool_]
+    # Errors and timeouts; neither found nor missing
+    failed: NDArray[np.bool_]
+
+
+def _parse_snapshot(body: bytes) -> tuple[int, int]:
+    """(month, price) from a snapshot's JSON."""
+    snapshot = json.loads(body)
+    year, month = snapshot["as_of"].split("-")[:2]
+    return (int(year) - 1970) * 12 + int(month) - 1, int(snapshot["price"])
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+
+class _HttpConnection:
+    """One keep-alive HTTP/1.1 connection, reopened when the server drops it."""
+
+    def __init__(self, host: str, port: int, tls: ssl.SSLContext | None):
+        self.host, self.port, self.tls = host, port, tls
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def get(self, path: str) -> tuple[int, bytes]:
+        """Status and body of ``GET path``.
+
+        A request on a reused connection is retried once on a fresh one,
+        since the server may have closed it while idle.
+        """
+        for attempt in range(2):
+            reused = self.writer is not None
+            if not reused:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.tls)
+            try:
+                self.writer.write(
+                    f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\nAccept: application/json\r\n\r\n".encode()
+                )
+                return await self._response()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if not reused or attempt:
+                    raise
+        raise AssertionError("unreachable")
+
+    async def _response(self) -> tuple[int, bytes]:
+        status_line = await self.reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await self.reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        if headers.get("transfer-encoding") == "chunked":
+            parts = []
+            while size := int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16):
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            while await self.reader.readuntil(b"\r\n") != b"\r\n":
+                pass
+            body = b"".join(parts)
+        elif "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self.reader.read()
+            headers["connection"] = "close"
+        if headers.get("connection") == "close":
+            await self.close()
+        return status, body
+
+
+async def _fetch_http(base: str, names: list[str], concurrency: int, timeout: float, snapshots: Snapshots) -> None:
+    url = urlsplit(base)
+    if url.query or url.fragment:
+        raise FeedError(f"feed URL {base!r} has a query string or fragment; snapshots are fetched from "
+                        "{feed}/{name}.json")
+    tls = ssl.create_default_context() if url.scheme == "https" else None
+    port = url.port or (443 if tls else 80)
+    prefix = url.path.rstrip("/")
+    queue = iter(range(len(names)))
+
+    async def worker() -> None:
+        conn = _HttpConnection(url.hostname, port, tls)
+        try:
+            # Workers share one iterator, so each listing is fetched exactly once
+            for i in queue:
+                try:
+                    status, body = await asyncio.wait_for(conn.get(f"{prefix}/{quote(names[i])}.json"), timeout)
+                    if status == 404:
+                        continue
+                    if status != 200:
+                        raise FeedError(f"HTTP {status}")
+                    snapshots.months[i], snapshots.prices[i] = _parse_snapshot(body)
+                    snapshots.found[i] = True
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, FeedError,
+                        ValueError, KeyError, TypeError):
+                    # The connection may be mid-response, so never reuse it
+                    await conn.close()
+                    snapshots.failed[i] = True
+        finally:
+            await conn.close()
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(names)))))
+
+
+async def _fetch_directory(root: Path, names: list[str], concurrency: int, snapshots: Snapshots) -> None:
+    queue = iter(range(len(names)))
+
+    async def worker() -> None:
+        for i in queue:
+            try:
+                body = await asyncio.to_thread((root / f"{names[i]}.json").read_bytes)
+                snapshots.months[i], snapshots.prices[i] = _parse_snapshot(body)
+                snapshots.found[i] = True
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, KeyError, TypeError):
+                snapshots.failed[i] = True
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(names)))))
+
+
+async def fetch_snapshots(names: list[str], feed: str, concurrency: int = DEFAULT_CONCURRENCY,
+                          timeout: float = DEFAULT_TIMEOUT) -> Snapshots:
+    """Each listing's snapshot from ``feed``, at most ``concurrency`` in flight."""
+    n = len(names)
+    snapshots = Snapshots(np.zeros(n, np.int32), np.zeros(n, np.int64), np.zeros(n, bool), np.zeros(n, bool))
+    if feed.startswith(("http://", "https://")):
+        await _fetch_http(feed, names, concurrency, timeout, snapshots)
+    else:
+        await _fetch_directory(Path(feed), names, concurrency, snapshots)
+    return snapshots
+
+
+# ---------------------------------------------------------------------------
+# Refresh
+# ---------------------------------------------------------------------------
+
+
+def snapshot_path(listings: str | Path) -> Path:
+    """Where refreshes of ``listings`` are written, keyed on its resolved path."""
+    listings = Path(listings)
+    # Listings files with the same name in different directories get their own snapshots
+    digest = hashlib.sha256(str(listings.resolve()).encode()).hexdigest()[:12]
+    return FEED_DIR / f"{listings.stem}-{digest}.npz"
+
+
+def load_latest(listings: str | Path) -> tuple[ListingStore, bool]:
+    """The newest state of ``listings``, and whether it differs from the snapshot on disk.
+
+    If the file has been edited since the last refresh, the snapshot's
+    later price history is merged into it.
+    """
+    path = latest_path(listings)
+    store = ListingStore.load(path)
+    snapshot = snapshot_path(listings)
+    if path == snapshot or not snapshot.exists():
+        return store, False
+    return store.merge_history(ListingStore.load(snapshot)), True
+
+
+def latest_path(listings: str | Path) -> Path:
+    """The refreshed snapshot of ``listings`` if it is newer than the file, else the file."""
+    listings = Path(listings)
+    snapshot = snapshot_path(listings)
+    try:
+        if snapshot.stat().st_mtime_ns >= listings.stat().st_mtime_ns:
+            return snapshot
+    except FileNotFoundError:
+        pass
+    return listings
+
+
+@dataclass(frozen=True)
+class RefreshReport:
+    listings: int
+    fetched: int
+    changed: int
+    missing: int
+    failed: int
+    seconds: float
+    finished_at: float
+
+
+def refresh(listings: str | Path, feed: str, concurrency: int = DEFAULT_CONCURRENCY,
+            timeout: float = DEFAULT_TIMEOUT) -> RefreshReport:
+    """Fetch every listing's snapshot and append the price changes."""
+    start = time.perf_counter()
+    store, merged = load_latest(listings)
+    snapshots = asyncio.run(fetch_snapshots(store["name"].tolist(), feed, concurrency, timeout))
+    updated, changed = store.apply_prices(snapshots.months, snapshots.prices, snapshots.found)
+    if changed.any() or merged:
+        path = snapshot_path(listings)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        updated.save(path)
+    fetched = int(snapshots.found.sum())
+    failed = int(snapshots.failed.sum())
+    return RefreshReport(
+        listings=len(store), fetched=fetched, changed=int(changed.sum()),
+        missing=len(store) - fetched - failed, failed=failed,
+        seconds=time.perf_counter() - start, finished_at=time.time(),
+    )
+
+
+class BackgroundRefresh(threading.Thread):
+    """Refresh every ``interval`` seconds on a daemon thread until stopped."""
+
+    def __init__(self, listings: str | Path, feed: str, interval: float = FEED_INTERVAL,
+                 concurrency: int = DEFAULT_CONCURRENCY):
+        super().__init__(name="listing-feed", daemon=True)
+        self.listings, self.feed = Path(listings), feed
+        self.interval, self.concurrency = interval, concurrency
+        self.last: RefreshReport | None = None
+        self.error: str | None = None
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while True:
+            try:
+                self.last = refresh(self.listings, self.feed, self.concurrency)
+                self.error = None
+            except Exception as e:  # noqa: BLE001 - keep refreshing after a bad feed or file
+                self.error = f"{type(e).__name__}: {e}"
+            if self._stop_event.wait(self.interval):
+                return
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    # Content-Length is always sent, so connections can be kept alive
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, each
+    # response on a kept-alive connection waits for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(root: Path, port: int) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", port), partial(_QuietHandler, directory=str(root)))
+    print(f"Serving {root} at http://127.0.0.1:{server.server_address[1]}/", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m housing.feed", description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    refresh_parser = commands.add_parser("refresh", help="fetch snapshots and append price changes")
+    refresh_parser.add_argument("--listings", type=Path, default=Path("data/listings.json"))
+    refresh_parser.add_argument("--feed", default=FEED, help="base URL or directory (default: $HOUSE_HUNT_FEED)")
+    refresh_parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="requests in flight")
+    refresh_parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per request")
+    serve_parser = commands.add_parser("serve", help="serve a directory of snapshots over HTTP")
+    serve_parser.add_argument("root", type=Path)
+    serve_parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.root, args.port)
+        return 0
+    if not args.feed:
+        parser.error("no feed given; pass --feed or set HOUSE_HUNT_FEED")
+    try:
+        report = refresh(args.listings, args.feed, args.concurrency, args.timeout)
+    except FeedError as e:
+        parser.error(str(e))
+    print(
+        f"Refreshed {report.fetched} of {report.listings} listing(s) in {report.seconds:.2f}s: "
+        f"{report.changed} changed, {report.missing} missing, {report.failed} failed"
+    )
+    if report.changed:
+        print(f"Wrote {snapshot_path(args.listings)}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Extract listing fields from listing sheets and offering-plan PDFs.
+
+Usage::
+
+    python -m housing.ingest PDF_DIR [--listings data/listings.json] [--workers N] [--dry-run]
+
+A PDF belongs to the listing whose ``name`` matches its file stem; anything
+after a ``--`` in the stem is ignored, so ``906 Bergen St 1A--offering-plan.pdf``
+updates "906 Bergen St 1A". Pages are streamed one at a time and scanning
+stops as soon as every field has been found. Results are cached per file
+content hash, so unchanged PDFs are never re-parsed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from housing.config import CACHE_DIR
+from housing.listings import write_records
+
+# Bump when the extraction rules change so stale cache entries are ignored
+EXTRACTOR_VERSION = 2
+
+FIELDS = ("sqft", "taxes_monthly", "common_charges_monthly", "tax_abatement_note", "price_history")
+
+_AMOUNT = r"\$\s*([\d,]+(?:\.\d{1,2})?)"
+_PERIOD = r"\s*(/\s*(?:mo|month|yr|year)\b|per\s+(?:month|year|annum)|monthly|annual(?:ly)?)?"
+_PATTERNS = {
+    "sqft": re.compile(r"([\d,]{3,7})\s*(?:sq\.?\s*ft\.?|ft²|square\s+feet|SF)\b", re.I),
+    "taxes_monthly": re.compile(r"\b(?:real\s+estate\s+|property\s+)?taxes\b[^$\n]{0,40}" + _AMOUNT + _PERIOD, re.I),
+    "common_charges_monthly": re.compile(r"\bcommon\s+charges?\b[^$\n]{0,40}" + _AMOUNT + _PERIOD, re.I),
+    "tax_abatement_note": re.compile(r"([^\n.;]*\babatement\b[^\n.;]*)", re.I),
+}
+_HISTORY_ROW = re.compile(r"\b(\d{1,2})/(?:\d{1,2}/)?(\d{4})\b[^$\n]{0,60}" + _AMOUNT)
+
+
+def _amount(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def _monthly(match: re.Match) -> int:
+    value = _amount(match.group(1))
+    if re.search(r"yr|year|annu", match.group(2) or "", re.I):
+        value /= 12
+    return round(value)
+
+
+def extract_fields(pages: Iterable[str]) -> dict:
+    """Scan page texts in order and return whichever fields were found."""
+    found = {}
+    history = []
+    for text in pages:
+        for field, pattern in _PATTERNS.items():
+            if field in found:
+                continue
+            match = pattern.search(text)
+            if match is None:
+                continue
+            if field == "sqft":
+                found[field] = int(match.group(1).replace(",", ""))
+            elif field == "tax_abatement_note":
+                found[field] = " ".join(match.group(1).split())
+            else:
+                found[field] = _monthly(match)
+        if "price_history" not in found:
+            rows = [(f"{int(m):02d}/{y}", round(_amount(p))) for m, y, p in _HISTORY_ROW.findall(text)]
+            if rows:
+                history.extend(rows)
+            elif history:
+                # The history table has ended; dated amounts on later pages are something else
+                found["price_history"] = history
+        if len(found) == len(FIELDS):
+            break
+    if history and "price_history" not in found:
+        found["price_history"] = history
+    return found
+
+
+def _iter_page_text(path: Path) -> Iterable[str]:
+    import pymupdf
+
+    with pymupdf.open(path) as doc:
+        for page in doc:
+            yield page.get_text("text")
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_path(digest: str) -> Path:
+    return CACHE_DIR / "ingest" / f"{digest}-v{EXTRACTOR_VERSION}.json"
+
+
+def extract_pdf(path: Path) -> dict:
+    """Extract fields from one PDF, reading and writing the per-hash cache."""
+    cache = _cache_path(file_digest(path))
+    if cache.exists():
+        return json.loads(cache.read_text())
+    fields = extract_fields(_iter_page_text(path))
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(fields))
+    os.replace(tmp, cache)
+    return fields
+
+
+def listing_name(path: Path) -> str:
+    return path.stem.split("--", 1)[0].strip()
+
+
+def ingest_directory(pdf_dir: Path, workers: int | None = None) -> dict[str, dict]:
+    """Extract every PDF under ``pdf_dir``, merged per listing name.
+
+    Files are merged in sorted path order, so earlier files win for scalar
+    fields and price histories are combined.
+    """
+    paths = sorted(pdf_dir.rglob("*.pdf"))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(extract_pdf, paths, chunksize=1)
+        merged = {}
+        for path, fields in zip(paths, results):
+            target = merged.setdefault(listing_name(path), {})
+            for field, value in fields.items():
+                if field == "price_history":
+                    target[field] = _merge_history(target.get(field, ()), value)
+                else:
+                    target.setdefault(field, value)
+    return merged
+
+
+def _merge_history(*histories) -> list[tuple[str, int]]:
+    """Union of price histories in chronological order, first-seen order within a month."""
+    unique = dict.fromkeys(tuple(entry) for history in histories for entry in history)
+    return sorted(unique, key=lambda entry: (entry[0][3:], entry[0][:2]))
+
+
+def merge_into_listings(records: list[dict], extracted: dict[str, dict]) -> tuple[list[dict], list[str]]:
+    """Apply extracted fields to matching records; return the unmatched names.
+
+    Scalar fields are overwritten, while price history entries are added to
+    the record's existing history.
+    """
+    by_name = {rec["name"]: rec for rec in records}
+    unmatched = []
+    for name, fields in extracted.items():
+        rec = by_name.get(name)
+        if rec is None:
+            unmatched.append(name)
+            continue
+        for field, value in fields.items():
+            if field == "price_history":
+                value = [list(entry) for entry in _merge_history(rec.get(field, ()), value)]
+            rec[field] = value
+    return records, unmatched
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m housing.ingest", description=__doc__.split("\n\n")[0])
+    parser.add_argument("pdf_dir", type=Path)
+    parser.add_argument("--listings", type=Path, default=Path("data/listings.json"))
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="print extracted fields without writing")
+    args = parser.parse_args(argv)
+
+    extracted = ingest_directory(args.pdf_dir, args.workers)
+    if args.dry_run:
+        json.dump(extracted, sys.stdout, indent=2)
+        print()
+        return 0
+
+    records, unmatched = merge_into_listings(json.loads(args.listings.read_text()), extracted)
+    write_records(records, args.listings)
+    print(f"Updated {len(extracted) - len(unmatched)} listing(s) in {args.listings}")
+    for name in unmatched:
+        print(f"warning: no listing named {name!r}; skipped", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""Columnar listing store with secondary indexes.
+
+Listings are held as one NumPy array per field rather than one dict per
+listing. Price history is variable-length, so it is stored as flat arrays
+plus an offsets array (row ``i`` owns ``offsets[i]:offsets[i + 1]``). Months
+are int32 counts since January 1970, the values of ``datetime64[M]``, and
+prices are int64; the listings file's "MM/YYYY" strings are converted on load.
+Indexes on neighborhood, price and $/SF are built lazily on first use, so
+filters and top-N queries never scan every record.
+"""
+
+import json
+import os
+import re
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import NamedTuple, NotRequired, TypedDict
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+STRING_FIELDS = (
+    "name", "address", "neighborhood", "type", "condition", "amenities",
+    "tax_abatement_note", "image", "streeteasy",
+)
+# Dollar amounts are whole dollars, as quoted on listing sheets
+INT_FIELDS = (
+    "price", "beds", "baths", "sqft", "year_built",
+    "taxes_monthly", "common_charges_monthly", "min_down_pct",
+)
+# May be absent from a record, in which case they are 0
+OPTIONAL_INT_FIELDS = ("assessment_monthly", "assessment_months")
+FIELDS = STRING_FIELDS + INT_FIELDS + OPTIONAL_INT_FIELDS
+
+IndexArray = NDArray[np.intp]
+
+
+class PriceHistory(NamedTuple):
+    # Months since January 1970; ``months.astype("datetime64[M]")`` gives dates
+    months: NDArray[np.int32]
+    prices: NDArray[np.int64]
+
+
+def epoch_months(dates: list[str]) -> NDArray[np.int32]:
+    """"MM/YYYY" strings as months since January 1970."""
+    return np.array([int(date[3:]) * 12 + int(date[:2]) - 1 - 1970 * 12 for date in dates], dtype=np.int32)
+
+
+class Listing(TypedDict):
+    """One listing, as returned by ``ListingStore.record``.
+
+    In the listings file, ``price_history`` is a list of ["MM/YYYY", price] pairs.
+    """
+
+    name: str
+    address: str
+    neighborhood: str
+    type: str
+    condition: str
+    amenities: str
+    tax_abatement_note: str | None
+    image: str
+    streeteasy: str
+    price: int
+    beds: int
+    baths: int
+    sqft: int
+    year_built: int
+    taxes_monthly: int
+    common_charges_monthly: int
+    min_down_pct: int
+    assessment_monthly: NotRequired[int]
+    assessment_months: NotRequired[int]
+    price_history: PriceHistory
+
+
+def write_records(records: list[Listing], path: str | Path) -> None:
+    """Atomically write listing records as JSON, one history entry per line."""
+    path = Path(path)
+    text = json.dumps(records, indent=2)
+    text = re.sub(r'\[\s+("[^"]*"),\s+(-?\d+)\s+\]', r"[\1, \2]", text)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(text + "\n")
+    os.replace(tmp, path)
+
+
+def _check_names(names: np.ndarray) -> None:
+    """Listings are looked up and shown by name, so names must be unique."""
+    unique, counts = np.unique(names, return_counts=True)
+    if (counts > 1).any():
+        duplicates = ", ".join(map(repr, unique[counts > 1].tolist()[:5]))
+        raise ValueError(f"duplicate listing names: {duplicates}")
+
+
+class ListingStore:
+    def __init__(self, columns: dict[str, np.ndarray], history_offsets: np.ndarray,
+                 history_months: np.ndarray, history_prices: np.ndarray):
+        self.columns = columns
+        self.history_offsets = history_offsets
+        self.history_months = history_months
+        self.history_prices = history_prices
+
+    def __len__(self) -> int:
+        return len(self.columns["name"])
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    # -----------------------------------------------------------------------
+    # Construction & persistence
+    # -----------------------------------------------------------------------
+
+    @classmethod
+    def from_records(cls, records: list[Listing]) -> "ListingStore":
+        columns = {}
+        for field in STRING_FIELDS:
+            columns[field] = np.array([rec.get(field) or "" for rec in records], dtype=str)
+        for field in INT_FIELDS:
+            columns[field] = np.array([rec[field] for rec in records], dtype=np.int64)
+        for field in OPTIONAL_INT_FIELDS:
+            columns[field] = np.array([rec.get(field) or 0 for rec in records], dtype=np.int64)
+
+        lengths = [len(rec.get("price_history", ())) for rec in records]
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        history = [entry for rec in records for entry in rec.get("price_history", ())]
+        months = epoch_months([date for date, _ in history])
+        prices = np.array([price for _, price in history], dtype=np.int64)
+        _check_names(columns["name"])
+        return cls(columns, offsets, months, prices)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ListingStore":
+        """Load a ``.json`` list of listing records or a ``.npz`` snapshot.
+
+        Raises ValueError if two listings share a name.
+        """
+        path = Path(path)
+        if path.suffix == ".npz":
+            with np.load(path) as data:
+                rows = len(data["history_offsets"]) - 1
+                columns = {
+                    field: data[field] if field in data.files else np.zeros(rows, dtype=np.int64)
+                    for field in FIELDS
+                }
+                if "history_months" in data.files:
+                    months = data["history_months"]
+                else:
+                    # Snapshots from before typed history kept "MM/YYYY" strings
+                    months = epoch_months(data["history_dates"].tolist())
+                _check_names(columns["name"])
+                return cls(columns, data["history_offsets"], months, data["history_prices"])
+        with open(path) as f:
+            return cls.from_records(json.load(f))
+
+    def save(self, path: str | Path) -> None:
+        """Atomically write a ``.npz`` snapshot."""
+        path = Path(path)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                history_offsets=self.history_offsets,
+                history_months=self.history_months,
+                history_prices=self.history_prices,
+                **self.columns,
+            )
+        os.replace(tmp, path)
+
+    # -----------------------------------------------------------------------
+    # Row access
+    # -----------------------------------------------------------------------
+
+    def price_history(self, i: int) -> PriceHistory:
+        lo, hi = self.history_offsets[i], self.history_offsets[i + 1]
+        return PriceHistory(self.history_months[lo:hi], self.history_prices[lo:hi])
+
+    def record(self, i: int) -> Listing:
+        rec = {field: self.columns[field][i].item() for field in FIELDS}
+        rec["tax_abatement_note"] = rec["tax_abatement_note"] or None
+        rec["price_history"] = self.price_history(i)
+        return rec
+
+    def records(self, indices: ArrayLike) -> dict[str, Listing]:
+        """Materialize the given rows as ``{name: record}`` for display."""
+        return {rec["name"]: rec for rec in map(self.record, np.asarray(indices).tolist())}
+
+    # -----------------------------------------------------------------------
+    # Updates
+    # -----------------------------------------------------------------------
+
+    def apply_prices(self, months: ArrayLike, prices: ArrayLike,
+                     found: ArrayLike) -> tuple["ListingStore", NDArray[np.bool_]]:
+        """A copy with each row's asking price as of ``months[i]`` applied.
+
+        Rows where ``found`` is False are left alone. A history entry is
+        appended only where the price differs from the row's latest entry (or
+        the row has none) and the month is not older than it. Returns the new
+        store and which rows changed; this store is never modified.
+        """
+        months = np.asarray(months, dtype=np.int32)
+        prices = np.asarray(prices, dtype=np.int64)
+        offsets = self.history_offsets
+        ends = offsets[1:]
+        has_history = ends > offsets[:-1]
+        # Rows without history read entry 0 (or a padding 0) and are masked out
+        last = np.maximum(ends - 1, 0)
+        history_prices = np.append(self.history_prices, 0)
+        history_months = np.append(self.history_months, 0)
+        last_price = np.where(has_history, history_prices[last], -1)
+        last_month = np.where(has_history, history_months[last], np.iinfo(np.int32).min)
+        changed = np.asarray(found, dtype=bool) & (prices != last_price) & (months >= last_month)
+
+        # Each changed row gains one entry at its end, shifting later rows along
+        new_offsets = offsets + np.concatenate(([0], np.cumsum(changed)))
+        columns = dict(self.columns)
+        columns["price"] = np.where(changed, prices, self.columns["price"])
+        store = ListingStore(
+            columns,
+            new_offsets,
+            np.insert(self.history_months, ends[changed], months[changed]),
+            np.insert(self.history_prices, ends[changed], prices[changed]),
+        )
+        return store, changed
+
+    def merge_history(self, other: "ListingStore") -> "ListingStore":
+        """A copy with ``other``'s later price history appended, matching rows by name.
+
+        For each row, entries of ``other``'s same-named row dated after the
+        row's latest entry are appended in order, and the asking price
+        follows the last of them. Rows ``other`` lacks, and rows of
+        ``other`` this store lacks, are left out of the merge.
+        """
+        names = other.columns["name"].tolist()
+        target = np.array([self._row_by_name.get(name, -1) for name in names], dtype=np.int64)
+        entry_row = np.repeat(target, np.diff(other.history_offsets))
+
+        offsets = self.history_offsets
+        ends = offsets[1:]
+        has_history = ends > offsets[:-1]
+        last_month = np.where(has_history, np.append(self.history_months, 0)[np.maximum(ends - 1, 0)],
+                              np.iinfo(np.int32).min)
+        keep = entry_row >= 0
+        keep[keep] = other.history_months[keep] > last_month[entry_row[keep]]
+        added_rows = entry_row[keep]
+
+        # A stable sort by row puts each row's own entries before the appended ones
+        rows = np.concatenate([np.repeat(np.arange(len(self)), np.diff(offsets)), added_rows])
+        order = np.argsort(rows, kind="stable")
+        months = np.concatenate([self.history_months, other.history_months[keep]])[order]
+        prices = np.concatenate([self.history_prices, other.history_prices[keep]])[order]
+        new_offsets = offsets + np.concatenate(([0], np.cumsum(np.bincount(added_rows, minlength=len(self)))))
+
+        columns = dict(self.columns)
+        price = self.columns["price"].copy()
+        # Later assignments win, so each row gets its last appended price
+        price[added_rows] = other.history_prices[keep]
+        columns["price"] = price
+        return ListingStore(columns, new_offsets, months, prices)
+
+    @cached_property
+    def _row_by_name(self) -> dict[str, int]:
+        return {name: i for i, name in enumerate(self.columns["name"].tolist())}
+
+    def index_of(self, name: str) -> int:
+        return self._row_by_name[name]
+
+    def has(self, name: str) -> bool:
+        return name in self._row_by_name
+
+    # -----------------------------------------------------------------------
+    # Indexes & queries
+    # -----------------------------------------------------------------------
+
+    @cached_property
+    def ppsf(self) -> np.ndarray:
+        return self.columns["price"] / self.columns["sqft"]
+
+    @cached_property
+    def _neighborhood_index(self) -> dict[str, IndexArray]:
+        keys, inverse = np.unique(self.columns["neighborhood"], return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+        return {key: order[bounds[k]:bounds[k + 1]] for k, key in enumerate(keys.tolist())}
+
+    @cached_property
+    def _sorted(self) -> dict[str, tuple[IndexArray, np.ndarray, IndexArray]]:
+        """Per indexed field: sort order, sorted values and each row's rank."""
+        result = {}
+        for field, values in (("price", self.columns["price"]), ("ppsf", self.ppsf)):
+            order = np.argsort(values, kind="stable")
+            rank = np.empty(len(order), dtype=np.intp)
+            rank[order] = np.arange(len(order))
+            result[field] = (order, values[order], rank)
+        return result
+
+    @property
+    def neighborhoods(self) -> list[str]:
+        return list(self._neighborhood_index)
+
+    def in_neighborhood(self, neighborhood: str) -> IndexArray:
+        return self._neighborhood_index.get(neighborhood, np.empty(0, dtype=np.intp))
+
+    def in_range(self, field: str, lo: float = -np.inf, hi: float = np.inf) -> IndexArray:
+        """Rows with ``lo <= field <= hi`` for an indexed field ("price" or "ppsf")."""
+        order, values, _ = self._sorted[field]
+        return order[np.searchsorted(values, lo, "left"):np.searchsorted(values, hi, "right")]
+
+    def query(self, neighborhoods: list[str] | None = None,
+              price: tuple[float, float] | None = None,
+              ppsf: tuple[float, float] | None = None) -> IndexArray:
+        """Row indices matching every given filter, in ascending row order."""
+        result = None
+        if neighborhoods:
+            result = np.concatenate([self.in_neighborhood(n) for n in neighborhoods])
+        for field, bounds in (("price", price), ("ppsf", ppsf)):
+            if bounds is not None:
+                rows = self.in_range(field, *bounds)
+                result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+        return np.arange(len(self)) if result is None else np.sort(result)
+
+    def top_n(self, field: str, n: int, ascending: bool = True, among: ArrayLike | None = None) -> IndexArray:
+        """The ``n`` rows with the lowest (or highest) indexed ``field``."""
+        order, _, rank = self._sorted[field]
+        if among is None:
+            return order[:n] if ascending else order[::-1][:n]
+        among = np.asarray(among, dtype=np.intp)
+        keys = rank[among] if ascending else -rank[among]
+        return among[np.argsort(keys, kind="stable")][:n]
+
+
+@lru_cache(maxsize=8)
+def _open_store(path: Path, mtime_ns: int) -> ListingStore:
+    return ListingStore.load(path)
+
+
+def open_store(path: str | Path) -> ListingStore:
+    """Load ``path`` once and reuse it until the file is modified."""
+    path = Path(path).resolve()
+    return _open_store(path, path.stat().st_mtime_ns)
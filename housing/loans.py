@@ -0,0 +1,155 @@
+"""Loan structures: ARMs, interest-only periods, extra principal and recasts.
+
+A ``LoanStructure`` is a list of rate segments plus extra principal
+payments. Rates are offsets from the loan's base rate, so one structure
+serves both ends of the dashboard's rate range. Between two months where the
+payment can change (a new segment, a lump sum, a recast) the rate and
+payment are constant, so the balance follows the annuity closed form and a
+whole stretch of months is evaluated at once. Only those few breakpoints are
+stepped through in order, each carrying its closing balance into the next.
+Like the closed-form kernels, ``loan_path`` broadcasts over principals and
+rates.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from housing.amortization import FloatArray, _monthly_rate, _payment
+
+
+@dataclass(frozen=True)
+class RateSegment:
+    # Length in months; the last segment runs to the end of the term whatever its length
+    months: int
+    # Added to the loan's base rate
+    rate_offset_pct: float = 0.0
+    # Pay only interest; the payment re-amortizes over the remaining term afterwards
+    interest_only: bool = False
+
+
+@dataclass(frozen=True)
+class LoanStructure:
+    """Rate segments in order, plus extra principal on top of the scheduled payment.
+
+    A new segment re-amortizes the balance over the months left in the term.
+    Extra principal shortens the loan but leaves the payment alone unless
+    ``recast`` is set, in which case the payment is re-amortized after each
+    lump sum.
+    """
+
+    segments: tuple[RateSegment, ...] = (RateSegment(0),)
+    extra_monthly: float = 0.0
+    # (month, amount) pairs, paid along with that month's payment
+    lump_sums: tuple[tuple[int, float], ...] = ()
+    recast: bool = False
+
+    @classmethod
+    def from_options(cls, arm_fixed_years: int | None = None, arm_reset_pct: float = 0.0,
+                     interest_only_years: int = 0, extra_monthly: float = 0.0,
+                     lump_sum: float = 0.0, lump_sum_year: int = 1,
+                     recast: bool = False) -> "LoanStructure | None":
+        """The structure the dashboard's loan options describe, or None for a plain fixed-rate loan.
+
+        An ARM pays the base rate for ``arm_fixed_years`` and the base rate
+        plus ``arm_reset_pct`` after. A lump sum is paid at the end of
+        ``lump_sum_year``.
+        """
+        reset = arm_fixed_years * 12 if arm_fixed_years else None
+        interest_only = interest_only_years * 12
+        if reset is None and not interest_only and not extra_monthly and not lump_sum:
+            return None
+        starts = sorted({0, interest_only, reset or 0})
+        segments = tuple(
+            RateSegment(
+                months=(stop - start) if stop is not None else 0,
+                rate_offset_pct=arm_reset_pct if reset is not None and start >= reset else 0.0,
+                interest_only=start < interest_only,
+            )
+            for start, stop in zip(starts, [*starts[1:], None])
+        )
+        return cls(
+            segments=segments,
+            extra_monthly=float(extra_monthly),
+            lump_sums=((lump_sum_year * 12, float(lump_sum)),) if lump_sum else (),
+            recast=recast and bool(lump_sum),
+        )
+
+    def stretches(self, n: int) -> Iterator[tuple[int, int, RateSegment, bool, float]]:
+        """``(start, stop, segment, new_payment, lump_sum)`` for each stretch of an ``n``-month term.
+
+        A stretch covers payments ``start + 1..stop``. ``new_payment`` says
+        whether the payment is recomputed at its start, and ``lump_sum`` is
+        paid with payment ``stop``.
+        """
+        segment_starts = {}
+        start = 0
+        for segment in self.segments:
+            if start < n:
+                segment_starts[start] = segment
+            start += segment.months
+        lumps = {}
+        for month, amount in self.lump_sums:
+            if 0 < month <= n:
+                lumps[month] = lumps.get(month, 0.0) + amount
+        cuts = sorted({0, n, *segment_starts, *(month for month in lumps if month < n)})
+        segment = segment_starts[0]
+        for start, stop in zip(cuts, cuts[1:]):
+            new_segment = start in segment_starts
+            segment = segment_starts.get(start, segment)
+            yield start, stop, segment, new_segment or (self.recast and start in lumps), lumps.get(stop, 0.0)
+
+
+class LoanPath(NamedTuple):
+    # Outstanding at months 0..horizon
+    balances: FloatArray
+    # Paid in months 1..horizon; principal includes extra payments
+    interest: FloatArray
+    principal: FloatArray
+
+    @property
+    def payments(self) -> FloatArray:
+        return self.interest + self.principal
+
+
+def loan_path(principal: ArrayLike, annual_rate_pct: ArrayLike, years: int, horizon_months: int,
+              structure: LoanStructure) -> LoanPath:
+    """Month-by-month balance and payments of a structured loan, zero once paid off."""
+    principal = np.asarray(principal, dtype=np.float64)
+    base_rate = np.asarray(annual_rate_pct, dtype=np.float64)
+    shape = np.broadcast_shapes(principal.shape, base_rate.shape)
+    n = years * 12
+    end = min(n, horizon_months)
+    balances = np.zeros(shape + (horizon_months + 1,))
+    interest = np.zeros(shape + (horizon_months,))
+    balances[..., 0] = principal
+
+    balance = np.broadcast_to(principal, shape)
+    payment = np.zeros(shape)
+    for start, stop, segment, new_payment, lump_sum in structure.stretches(n):
+        if start >= end:
+            break
+        r = np.broadcast_to(_monthly_rate(base_rate + segment.rate_offset_pct), shape)
+        if new_payment:
+            payment = balance * r if segment.interest_only else _payment(balance, r, n - start)
+        months = np.arange(1, min(stop, end) - start + 1)
+        q = (payment + structure.extra_monthly)[..., None]
+        b0, rc = balance[..., None], r[..., None]
+        if rc.all():
+            # Constant rate and outflow q: B_j = B_0 + (B_0 r - q) ((1 + r)^j - 1) / r
+            path = b0 + (b0 * rc - q) / rc * np.expm1(months * np.log1p(rc))
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                path = np.where(rc == 0, b0 - q * months, b0 + (b0 * rc - q) / rc * np.expm1(months * np.log1p(rc)))
+        # The balance only falls, so clipping at zero stops it at payoff
+        np.maximum(path, 0, out=path)
+        interest[..., start] = balance * r
+        interest[..., start + 1:start + len(months)] = path[..., :-1] * rc
+        if stop <= end and lump_sum:
+            path[..., -1] = np.maximum(path[..., -1] - lump_sum, 0)
+        balances[..., start + 1:start + len(months) + 1] = path
+        balance = path[..., -1]
+    return LoanPath(balances, interest, balances[..., :-1] - balances[..., 1:])
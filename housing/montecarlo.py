@@ -0,0 +1,144 @@
+"""Stochastic appreciation and ARM rate projections.
+
+Paths are simulated at annual resolution as arrays of shape
+``(n_paths, years + 1)``. Compounding twelve lognormal monthly steps gives a
+lognormal annual step, so the yearly checkpoints have the same distribution
+as a monthly simulation at a twelfth of the cost. Balances are normalized
+per $1 borrowed, so a single simulation serves every listing.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from housing.amortization import FloatArray, _balance_factor, _monthly_rate
+from housing.cache import cached_balance_path, memoize
+
+DEFAULT_PATHS = 20_000
+DEFAULT_SEED = 2026
+PERCENTILES = (10, 50, 90)
+
+
+@dataclass(frozen=True, eq=False)
+class StochasticProjection:
+    years: FloatArray
+    value_bands: FloatArray
+    equity_bands: FloatArray
+    prob_negative_equity: FloatArray
+
+    def prob_negative_at(self, year: int) -> float:
+        return float(self.prob_negative_equity[min(year, len(self.years) - 1)])
+
+
+@memoize(maxsize=32)
+def simulate_growth(appreciation_pct: float, volatility_pct: float, years: int,
+                    n_paths: int = DEFAULT_PATHS, seed: int = DEFAULT_SEED) -> FloatArray:
+    """Cumulative value multipliers per path; ``[:, 0]`` is 1.
+
+    Log returns are drawn so that the mean multiplier matches the
+    deterministic ``appreciation_pct`` projection.
+    """
+    rng = np.random.default_rng([seed, 0])
+    sigma = volatility_pct / 100
+    mu = np.log1p(appreciation_pct / 100) - sigma ** 2 / 2
+    log_returns = rng.normal(mu, sigma, size=(n_paths, years))
+    growth = np.ones((n_paths, years + 1))
+    np.exp(np.cumsum(log_returns, axis=1), out=growth[:, 1:])
+    return growth
+
+
+@memoize(maxsize=32)
+def simulate_arm_balance(initial_rate_pct: float, loan_term: int, fixed_years: int,
+                         rate_volatility_pct: float, years: int,
+                         periodic_cap_pct: float = 2.0, lifetime_cap_pct: float = 5.0,
+                         n_paths: int = DEFAULT_PATHS, seed: int = DEFAULT_SEED) -> FloatArray:
+    """Remaining balance per $1 borrowed for an ARM with annual resets.
+
+    The index follows a random walk with ``rate_volatility_pct`` annual
+    standard deviation from origination. After ``fixed_years``, the rate
+    resets each year to the initial rate plus the index move, bounded by the
+    periodic and lifetime caps. The loan re-amortizes over the remaining term.
+    """
+    rng = np.random.default_rng([seed, 1])
+    index_walk = np.cumsum(rng.normal(0, rate_volatility_pct, size=(n_paths, years)), axis=1)
+
+    n = loan_term * 12
+    lo, hi = max(initial_rate_pct - lifetime_cap_pct, 0), initial_rate_pct + lifetime_cap_pct
+    rate = np.full(n_paths, float(initial_rate_pct))
+    balance = np.zeros((n_paths, years + 1))
+    balance[:, 0] = 1
+    for year in range(min(years, loan_term)):
+        if year >= fixed_years:
+            target = np.clip(initial_rate_pct + index_walk[:, year - 1], lo, hi)
+            rate = np.clip(target, rate - periodic_cap_pct, rate + periodic_cap_pct)
+        remaining = n - year * 12
+        r = _monthly_rate(rate)[:, None]
+        step = _balance_factor(r, remaining, np.array([min(12, remaining)]))[:, 0]
+        balance[:, year + 1] = np.maximum(balance[:, year] * step, 0)
+    return balance
+
+
+@memoize(maxsize=32)
+def sorted_growth(appreciation_pct: float, volatility_pct: float, years: int,
+                  n_paths: int = DEFAULT_PATHS, seed: int = DEFAULT_SEED) -> FloatArray:
+    """``simulate_growth`` transposed to ``(years + 1, n_paths)`` and sorted per year."""
+    growth = simulate_growth(appreciation_pct, volatility_pct, years, n_paths, seed)
+    return np.sort(growth.T, axis=1)
+
+
+def _sorted_percentiles(rows: FloatArray, percentiles=PERCENTILES) -> FloatArray:
+    """Linear-interpolated percentiles of already-sorted rows, as ``np.percentile``."""
+    pos = np.asarray(percentiles, dtype=np.float64) / 100 * (rows.shape[1] - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, rows.shape[1] - 1)
+    frac = pos - lo
+    return (rows[:, lo] * (1 - frac) + rows[:, hi] * frac).T
+
+
+def stochastic_projection(price: float, loan_amount: float, growth_sorted: FloatArray,
+                          balance: FloatArray, growth: FloatArray | None = None) -> StochasticProjection:
+    """Percentile bands and negative-equity odds for one listing.
+
+    ``balance`` is per $1 borrowed. With a fixed rate it is a single row
+    shared by every path, and equity is monotone in growth, so its
+    percentiles and negative-equity odds come straight from the sorted growth
+    paths. An ARM balance has one row per path, and the unsorted ``growth``
+    paths are then required to pair each balance with its own growth path.
+    """
+    growth_bands = _sorted_percentiles(growth_sorted)
+    if balance.shape[0] == 1:
+        equity_bands = price * growth_bands - loan_amount * balance
+        threshold = loan_amount * balance[0] / price
+        prob_negative = (growth_sorted < threshold[:, None]).mean(axis=1)
+    else:
+        equity = price * growth.T - loan_amount * balance.T
+        prob_negative = (equity < 0).mean(axis=1)
+        equity_bands = _sorted_percentiles(np.sort(equity, axis=1))
+    return StochasticProjection(
+        years=np.arange(growth_sorted.shape[0], dtype=np.float64),
+        value_bands=price * growth_bands,
+        equity_bands=equity_bands,
+        prob_negative_equity=prob_negative,
+    )
+
+
+@memoize(maxsize=256, persist=True)
+def project_stochastic(price: float, loan_amount: float, rate_pct: float, loan_term: int,
+                       appreciation_pct: float, volatility_pct: float, projection_years: int,
+                       arm_fixed_years: int | None = None, rate_volatility_pct: float = 1.0,
+                       n_paths: int = DEFAULT_PATHS, seed: int = DEFAULT_SEED) -> StochasticProjection:
+    """Monte Carlo projection for one listing, fixed-rate or ARM.
+
+    The horizon is at least 10 years so the 5- and 10-year odds are always
+    available.
+    """
+    years = max(projection_years, 10)
+    growth_sorted = sorted_growth(appreciation_pct, volatility_pct, years, n_paths, seed)
+    if arm_fixed_years is None:
+        balance = cached_balance_path(1.0, rate_pct, loan_term, years * 12)[None, ::12]
+        return stochastic_projection(price, loan_amount, growth_sorted, balance)
+    growth = simulate_growth(appreciation_pct, volatility_pct, years, n_paths, seed)
+    balance = simulate_arm_balance(
+        rate_pct, loan_term, arm_fixed_years, rate_volatility_pct, years, n_paths=n_paths, seed=seed,
+    )
+    return stochastic_projection(price, loan_amount, growth_sorted, balance, growth)
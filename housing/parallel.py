@@ -0,0 +1,188 @@
+"""Evaluate a listing store under many scenarios across a process pool.
+
+The store's columns and price history are copied once into a single shared
+memory block, and workers map it rather than receiving pickled records:
+a task is just a scenario and a range of rows. Each worker keeps the
+blocks it has mapped, so a long-lived pool serves any number of stores.
+Shards are submitted a few at a time and their comparison columns are
+merged back in row order, scenario by scenario, so the output is the same
+whatever the pool size or shard size, and the same as evaluating serially.
+Every listing is evaluated independently, which is what makes that hold.
+"""
+
+import math
+from collections import OrderedDict, deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from housing import results
+from housing.evaluation import Scenario, evaluate
+from housing.listings import ListingStore
+from housing.report import comparison_columns
+
+DEFAULT_SHARD = 256
+# Blocks a worker keeps mapped; a store is only in use for one evaluation at a time
+_ATTACHED_MAX = 4
+
+Columns = dict[str, np.ndarray]
+# Block name and (array, dtype, shape, offset) per array
+StoreSpec = tuple[str, tuple[tuple[str, str, tuple[int, ...], int], ...]]
+
+_HISTORY = ("history_offsets", "history_months", "history_prices")
+
+
+class SharedStore:
+    """A ``ListingStore`` copied into shared memory until closed.
+
+    Use as a context manager; the block is unlinked on exit.
+    """
+
+    def __init__(self, store: ListingStore):
+        arrays = {**store.columns, **{name: getattr(store, name) for name in _HISTORY}}
+        layout = []
+        offset = 0
+        for name, array in arrays.items():
+            layout.append((name, array.dtype.str, array.shape, offset))
+            # Keep every array 8-byte aligned
+            offset += array.nbytes + -array.nbytes % 8
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (name, dtype, shape, start), array in zip(layout, arrays.values()):
+            np.ndarray(shape, dtype, self.shm.buf, start)[...] = array
+        self.spec: StoreSpec = (self.shm.name, tuple(layout))
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_attached: OrderedDict[str, tuple[shared_memory.SharedMemory, ListingStore]] = OrderedDict()
+
+
+def attach(spec: StoreSpec) -> ListingStore:
+    """A read-only ``ListingStore`` over the block ``spec`` describes, mapped once per process."""
+    name, layout = spec
+    if name in _attached:
+        _attached.move_to_end(name)
+        return _attached[name][1]
+    shm = shared_memory.SharedMemory(name=name)
+    arrays = {}
+    for field, dtype, shape, offset in layout:
+        array = np.ndarray(shape, dtype, shm.buf, offset)
+        array.setflags(write=False)
+        arrays[field] = array
+    history = [arrays.pop(field) for field in _HISTORY]
+    store = ListingStore(arrays, *history)
+    _attached[name] = (shm, store)
+    while len(_attached) > _ATTACHED_MAX:
+        old = _attached.popitem(last=False)[1][0]
+        # Arrays over the old block may still be referenced; it is unmapped once they are gone
+        try:
+            old.close()
+        except BufferError:
+            pass
+    return store
+
+
+def _evaluate_rows(store: ListingStore, scenario: Scenario, start: int, stop: int) -> Columns:
+    records = [store.record(i) for i in range(start, stop)]
+    return comparison_columns(records, evaluate(records, scenario))
+
+
+def _evaluate_shard(spec: StoreSpec, scenario: Scenario, start: int, stop: int, result_cache: bool) -> Columns:
+    with results.RESULTS.disabled(not result_cache):
+        return _evaluate_rows(attach(spec), scenario, start, stop)
+
+
+def _merge(parts: list[Columns]) -> Columns:
+    if len(parts) == 1:
+        return parts[0]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def shard_bounds(rows: int, shard_size: int) -> list[tuple[int, int]]:
+    return [(start, min(start + shard_size, rows)) for start in range(0, rows, shard_size)]
+
+
+def _evaluate_serial(store: ListingStore, scenarios: Sequence[Scenario], tasks: list[tuple[int, int, int]],
+                     result_cache: bool) -> Iterator[tuple[int, Columns]]:
+    for k, start, stop in tasks:
+        # Scoped per shard, since the caller runs between yields
+        with results.RESULTS.disabled(not result_cache):
+            columns = _evaluate_rows(store, scenarios[k], start, stop)
+        yield k, columns
+
+
+def evaluate_shards(store: ListingStore, scenarios: Sequence[Scenario], pool: Executor | None = None,
+                    shard_size: int = DEFAULT_SHARD, window: int = 8,
+                    result_cache: bool = True) -> Iterator[tuple[int, Columns]]:
+    """Yield ``(scenario index, columns)`` shard by shard, in scenario then row order.
+
+    With a ``pool``, at most ``window`` shards are in flight ahead of the one
+    being yielded. Without one, for a store that fits in one shard, or where
+    shared memory is unavailable, shards are evaluated in this process.
+    Without ``result_cache``, the on-disk result cache is bypassed while
+    each shard is evaluated.
+    """
+    bounds = shard_bounds(len(store), shard_size)
+    tasks = [(k, start, stop) for k in range(len(scenarios)) for start, stop in bounds]
+    if pool is None or len(bounds) <= 1:
+        yield from _evaluate_serial(store, scenarios, tasks, result_cache)
+        return
+    try:
+        shared = SharedStore(store)
+    except OSError:
+        yield from _evaluate_serial(store, scenarios, tasks, result_cache)
+        return
+    with shared:
+        pending = deque()
+        try:
+            for k, start, stop in tasks:
+                pending.append((k, pool.submit(_evaluate_shard, shared.spec, scenarios[k], start, stop, result_cache)))
+                if len(pending) >= window:
+                    k, future = pending.popleft()
+                    yield k, future.result()
+            while pending:
+                k, future = pending.popleft()
+                yield k, future.result()
+        finally:
+            # Nothing may still be reading the block when it is unlinked
+            for _, future in pending:
+                future.cancel()
+            for _, future in pending:
+                if not future.cancelled():
+                    future.exception()
+
+
+def evaluate_store(store: ListingStore, scenarios: Sequence[Scenario], pool: Executor | None = None,
+                   workers: int = 1, shard_size: int | None = None,
+                   result_cache: bool = True) -> list[Columns]:
+    """Comparison columns of every listing in ``store`` under each scenario, in order.
+
+    ``workers`` is the size of ``pool``. ``shard_size`` defaults to a few
+    shards per worker, so one slow shard does not hold up the rest. If a
+    worker dies, everything is evaluated again in this process.
+    """
+    if shard_size is None:
+        shard_size = max(math.ceil(len(store) / (4 * workers)), 32)
+    parts: list[list[Columns]] = [[] for _ in scenarios]
+    try:
+        for k, columns in evaluate_shards(store, scenarios, pool, shard_size, 2 * workers, result_cache):
+            parts[k].append(columns)
+    except BrokenProcessPool:
+        parts = [[] for _ in scenarios]
+        for k, columns in evaluate_shards(store, scenarios, None, shard_size, result_cache=result_cache):
+            parts[k].append(columns)
+    return [
+        _merge(part) if part else _evaluate_rows(store, scenario, 0, 0)
+        for part, scenario in zip(parts, scenarios)
+    ]
@@ -0,0 +1,129 @@
+"""Opt-in per-rerun timers and call counters.
+
+The dashboard starts a profiler at the top of each rerun. Blocks of the
+script are timed with ``section``, and every memoized kernel reports its
+calls, cache misses and time to the profiler active on the current thread.
+When profiling is off, ``section`` returns one shared no-op context manager
+and kernels skip all bookkeeping.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from housing.config import CACHE_DIR
+
+LOG_PATH = Path(os.environ.get("HOUSE_HUNT_PROFILE_LOG", CACHE_DIR / "profile.jsonl"))
+
+_TRUTHY = {"1", "true", "yes", "on"}
+_local = threading.local()
+
+
+def requested(flag: str | None = None) -> bool:
+    """Whether ``flag`` (e.g. a query param) or ``HOUSE_HUNT_PROFILE`` turns profiling on."""
+    return any(
+        (value or "").strip().lower() in _TRUTHY
+        for value in (flag, os.environ.get("HOUSE_HUNT_PROFILE"))
+    )
+
+
+class Profiler:
+    enabled = True
+
+    def __init__(self):
+        # Section path -> [calls, seconds]; nested sections are joined with "/"
+        self.sections: dict[str, list] = {}
+        # Kernel name -> [calls, cache misses, seconds]
+        self.kernels: dict[str, list] = {}
+        self.total_s: float | None = None
+        self._stack: list[str] = []
+        self._start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def section(self, name: str):
+        self._stack.append(name)
+        entry = self.sections.setdefault("/".join(self._stack), [0, 0.0])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def kernel(self, name: str, cached, args: tuple, kwargs: dict):
+        """Call ``cached`` and record the call against ``name``.
+
+        ``cached`` returns ``(value, missed)``. Misses are taken from that
+        flag rather than the cache's counters, which other sessions share.
+        """
+        missed = True
+        start = time.perf_counter()
+        try:
+            value, missed = cached(*args, **kwargs)
+            return value
+        finally:
+            elapsed = time.perf_counter() - start
+            entry = self.kernels.setdefault(name, [0, 0, 0.0])
+            entry[0] += 1
+            entry[1] += missed
+            entry[2] += elapsed
+
+    def finish(self) -> dict:
+        """Stop the rerun clock, detach from the thread and return the report."""
+        self.total_s = time.perf_counter() - self._start
+        if current() is self:
+            _local.profiler = None
+        return self.report()
+
+    def report(self) -> dict:
+        """Sections in first-entered order and kernels by total time.
+
+        Kernel times are inclusive, so a kernel that calls other memoized
+        kernels also counts their time.
+        """
+        return {
+            "total_s": self.total_s,
+            "sections": [
+                {"section": path, "calls": calls, "seconds": seconds}
+                for path, (calls, seconds) in self.sections.items()
+            ],
+            "kernels": [
+                {"kernel": name, "calls": calls, "misses": misses, "seconds": seconds}
+                for name, (calls, misses, seconds) in sorted(self.kernels.items(), key=lambda kv: -kv[1][2])
+            ],
+        }
+
+    def write(self, path: Path = LOG_PATH) -> None:
+        """Append the report to ``path`` as one JSON line."""
+        entry = {"timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"), **self.report()}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+class _DisabledProfiler:
+    enabled = False
+    _null = contextlib.nullcontext()
+
+    def section(self, name: str):
+        return self._null
+
+
+DISABLED = _DisabledProfiler()
+
+
+def start(enabled: bool) -> Profiler | _DisabledProfiler:
+    """Begin a rerun on this thread, replacing any profiler left by the last one."""
+    profiler = Profiler() if enabled else DISABLED
+    _local.profiler = profiler if enabled else None
+    return profiler
+
+
+def current() -> Profiler | None:
+    return getattr(_local, "profiler", None)
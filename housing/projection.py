@@ -0,0 +1,126 @@
+"""Per-property projections keyed on exactly the inputs they depend on.
+
+``project_property`` is memoized on its scalar arguments and the listing's
+``CarryingCosts``. A sidebar change to one property's offer price or down
+payment therefore invalidates only that property's entry, and every other
+property is served from cache. Results are also written to the on-disk
+result cache, so a reopened or shared scenario is not recomputed. With a
+``LoanStructure``, payments and balances come from ``housing.loans`` instead
+of the fixed-rate closed forms.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from housing.amortization import FloatArray
+from housing.cache import cached_appreciation, cached_balance_path, cached_loan_path, cached_payment, memoize
+from housing.costs import CarryingCosts
+from housing.loans import LoanStructure
+
+
+@dataclass(frozen=True, eq=False)
+class PropertyProjection:
+    down_payment: float
+    loan_amount: float
+    # The first month's loan payment, including any extra principal
+    payment_lo: float
+    payment_hi: float
+    total_monthly_lo: float
+    total_monthly_hi: float
+    # Monthly taxes, charges and assessments for months 1..horizon
+    carrying: FloatArray
+    # Mortgage plus carrying costs paid by the end of months 0..horizon
+    paid_lo: FloatArray
+    paid_hi: FloatArray
+    paid_5_lo: float
+    paid_5_hi: float
+    paid_10_lo: float
+    paid_10_hi: float
+    values: FloatArray
+    balances_lo: FloatArray
+    balances_hi: FloatArray
+    equity_lo: FloatArray
+    equity_hi: FloatArray
+    value_5: float
+    value_10: float
+    equity_5_lo: float
+    equity_5_hi: float
+    equity_10_lo: float
+    equity_10_hi: float
+
+
+@memoize(maxsize=1024, persist=True)
+def project_property(
+    price: float,
+    down_pct: float,
+    costs: CarryingCosts,
+    rate_lo: float,
+    rate_hi: float,
+    loan_term: int,
+    appreciation_rate: float,
+    projection_years: int,
+    structure: LoanStructure | None = None,
+) -> PropertyProjection:
+    down_payment = price * down_pct / 100
+    loan_amount = price - down_payment
+
+    # Milestones always cover 10 years, even when the chart horizon is shorter;
+    # the series is shared with the charts whenever the horizon reaches 10.
+    horizon = projection_years * 12
+    milestone_years = max(projection_years, 10)
+    milestone_months = milestone_years * 12
+    if structure is None:
+        payment_lo = cached_payment(loan_amount, rate_lo, loan_term)
+        payment_hi = cached_payment(loan_amount, rate_hi, loan_term)
+        on_loan = np.arange(1, milestone_months + 1) <= loan_term * 12
+        payments_lo = np.where(on_loan, payment_lo, 0)
+        payments_hi = np.where(on_loan, payment_hi, 0)
+        milestone_balances_lo = cached_balance_path(loan_amount, rate_lo, loan_term, milestone_months)
+        milestone_balances_hi = cached_balance_path(loan_amount, rate_hi, loan_term, milestone_months)
+    else:
+        # Both ends of the rate range in one call
+        path = cached_loan_path(loan_amount, (rate_lo, rate_hi), loan_term, milestone_months, structure)
+        payments_lo, payments_hi = path.payments
+        payment_lo, payment_hi = payments_lo[0], payments_hi[0]
+        milestone_balances_lo, milestone_balances_hi = path.balances
+
+    values = cached_appreciation(price, appreciation_rate, projection_years)
+    balances_lo = milestone_balances_lo[:horizon + 1]
+    balances_hi = milestone_balances_hi[:horizon + 1]
+    equity_lo = values - balances_lo
+    equity_hi = values - balances_hi
+
+    carrying = costs.schedule(milestone_months)
+    paid_lo = np.concatenate([[0], np.cumsum(payments_lo + carrying)])
+    paid_hi = np.concatenate([[0], np.cumsum(payments_hi + carrying)])
+    value_5, value_10 = cached_appreciation(price, appreciation_rate, milestone_years)[[60, 120]]
+    bal_5_lo, bal_10_lo = milestone_balances_lo[[60, 120]]
+    bal_5_hi, bal_10_hi = milestone_balances_hi[[60, 120]]
+
+    return PropertyProjection(
+        down_payment=down_payment,
+        loan_amount=loan_amount,
+        payment_lo=payment_lo,
+        payment_hi=payment_hi,
+        total_monthly_lo=payment_lo + carrying[0],
+        total_monthly_hi=payment_hi + carrying[0],
+        carrying=carrying[:horizon],
+        paid_lo=paid_lo[:horizon + 1],
+        paid_hi=paid_hi[:horizon + 1],
+        paid_5_lo=paid_lo[60],
+        paid_5_hi=paid_hi[60],
+        paid_10_lo=paid_lo[120],
+        paid_10_hi=paid_hi[120],
+        values=values,
+        balances_lo=balances_lo,
+        balances_hi=balances_hi,
+        equity_lo=equity_lo,
+        equity_hi=equity_hi,
+        value_5=value_5,
+        value_10=value_10,
+        equity_5_lo=value_5 - bal_5_lo,
+        equity_5_hi=value_5 - bal_5_hi,
+        equity_10_lo=value_10 - bal_10_lo,
+        equity_10_hi=value_10 - bal_10_hi,
+    )
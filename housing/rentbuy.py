@@ -0,0 +1,144 @@
+"""Rent-vs-buy net worth, including NYC transaction costs.
+
+Both households start with the same cash. The buyer spends the down payment
+and closing costs. The renter invests that money instead, and each month
+whichever household pays less invests the difference at the same return.
+The buyer's net worth is what a sale would leave after selling costs,
+plus any invested savings. Every series carries a trailing month axis
+(months ``0..horizon``), and listings or scenarios broadcast along the
+leading axes.
+
+Tax rates are the NYC and NYS residential schedules for condos (co-ops pay
+no mortgage recording tax). Mortgage-interest and property-tax deductions
+are not modeled.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from housing.amortization import FloatArray, _monthly_rate, _payment, appreciation_series, loan_balance_path
+from housing.loans import LoanStructure, loan_path
+
+# NYS "mansion tax", paid by the buyer on the whole price once it reaches each threshold
+MANSION_TAX_THRESHOLDS = (1e6, 2e6, 3e6, 5e6, 10e6, 15e6, 20e6, 25e6)
+MANSION_TAX_RATES = (0.0, 0.01, 0.0125, 0.015, 0.0225, 0.0325, 0.035, 0.0375, 0.039)
+
+
+@dataclass(frozen=True)
+class RentBuyAssumptions:
+    rent_growth_pct: float = 3.0
+    investment_return_pct: float = 6.0
+    # Buyer's closing costs other than mansion and mortgage recording tax
+    closing_cost_pct: float = 1.5
+    # Broker commission and seller's legal fees, before transfer taxes
+    selling_cost_pct: float = 5.0
+
+
+@dataclass(frozen=True, eq=False)
+class RentVsBuy:
+    owner_net_worth: FloatArray
+    renter_net_worth: FloatArray
+    upfront_cost: FloatArray
+    break_even_years: FloatArray
+
+    @property
+    def advantage(self) -> FloatArray:
+        """Buying minus renting, per month."""
+        return self.owner_net_worth - self.renter_net_worth
+
+
+def mansion_tax(price: ArrayLike) -> FloatArray:
+    price = np.asarray(price, dtype=np.float64)
+    bracket = np.searchsorted(MANSION_TAX_THRESHOLDS, price, side="right")
+    return np.take(MANSION_TAX_RATES, bracket) * price
+
+
+def mortgage_recording_tax(loan: ArrayLike) -> FloatArray:
+    loan = np.asarray(loan, dtype=np.float64)
+    return np.where(loan >= 500_000, 0.01925, 0.018) * loan
+
+
+def transfer_taxes(sale_price: ArrayLike) -> FloatArray:
+    """NYC real property transfer tax plus NYS transfer tax, paid by the seller."""
+    sale_price = np.asarray(sale_price, dtype=np.float64)
+    nyc = np.where(sale_price > 500_000, 0.01425, 0.01)
+    nys = np.where(sale_price >= 3e6, 0.0065, 0.004)
+    return (nyc + nys) * sale_price
+
+
+def buyer_closing_costs(price: ArrayLike, loan: ArrayLike, closing_cost_pct: float) -> FloatArray:
+    price = np.asarray(price, dtype=np.float64)
+    return mansion_tax(price) + mortgage_recording_tax(loan) + price * closing_cost_pct / 100
+
+
+def _invest(initial: FloatArray, contributions: FloatArray, monthly_return: float) -> FloatArray:
+    """Portfolio value at months ``0..H`` from month-end ``contributions`` for months ``1..H``.
+
+    Uses P_m = (1+g)^m * (P_0 + sum_{k<=m} c_k (1+g)^-k), so the whole path is
+    one cumulative sum instead of a month-by-month loop.
+    """
+    growth = (1 + monthly_return) ** np.arange(contributions.shape[-1] + 1)
+    discounted = np.cumsum(contributions / growth[1:], axis=-1)
+    head = np.broadcast_to(initial[..., None], discounted.shape[:-1] + (1,))
+    return growth * np.concatenate([head, head + discounted], axis=-1)
+
+
+def rent_vs_buy(
+    prices: ArrayLike,
+    down_pcts: ArrayLike,
+    rate_pct: ArrayLike,
+    years: int,
+    appreciation_pct: ArrayLike,
+    horizon_years: int,
+    carrying: ArrayLike,
+    rents: ArrayLike,
+    assumptions: RentBuyAssumptions = RentBuyAssumptions(),
+    structure: LoanStructure | None = None,
+) -> RentVsBuy:
+    """Monthly net worth of buying at ``prices`` versus renting at ``rents``.
+
+    ``carrying`` is the owner's taxes plus common charges for months
+    ``1..horizon``, as built by ``housing.costs.carrying_schedule``; a
+    trailing axis of length one holds them constant. ``rents`` is the first year's
+    monthly rent, which steps up by ``rent_growth_pct`` every 12 months.
+    ``break_even_years`` is the first month, in years, at which buying comes
+    out ahead, or NaN if it never does within the horizon. With a
+    ``structure``, the loan follows it rather than amortizing at a fixed rate.
+    """
+    price = np.asarray(prices, dtype=np.float64)
+    down = price * np.asarray(down_pcts, dtype=np.float64) / 100
+    loan = price - down
+    horizon = horizon_years * 12
+    month = np.arange(1, horizon + 1)
+
+    if structure is None:
+        n = years * 12
+        payment = _payment(loan[..., None], _monthly_rate(rate_pct)[..., None], n)
+        payments = np.where(month <= n, payment, 0)
+        balances = loan_balance_path(loan, rate_pct, years, horizon)
+    else:
+        path = loan_path(loan, rate_pct, years, horizon, structure)
+        payments, balances = path.payments, path.balances
+    owner_cost = payments + np.asarray(carrying, dtype=np.float64)
+    rent = np.asarray(rents, dtype=np.float64)[..., None] * (1 + assumptions.rent_growth_pct / 100) ** ((month - 1) // 12)
+    gap = owner_cost - rent
+
+    values = appreciation_series(price, appreciation_pct, horizon_years)
+    sale_proceeds = values * (1 - assumptions.selling_cost_pct / 100) - transfer_taxes(values) - balances
+
+    monthly_return = (1 + assumptions.investment_return_pct / 100) ** (1 / 12) - 1
+    upfront = down + buyer_closing_costs(price, loan, assumptions.closing_cost_pct)
+    owner = sale_proceeds + _invest(np.zeros_like(upfront), np.maximum(-gap, 0), monthly_return)
+    renter = _invest(upfront, np.maximum(gap, 0), monthly_return)
+
+    ahead = owner >= renter
+    first = ahead.argmax(axis=-1)
+    break_even = np.where(ahead.any(axis=-1), first / 12, np.nan)
+    return RentVsBuy(
+        owner_net_worth=owner,
+        renter_net_worth=renter,
+        upfront_cost=upfront,
+        break_even_years=break_even,
+    )
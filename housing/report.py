@@ -0,0 +1,71 @@
+"""The side-by-side comparison as numeric columns, shared by the dashboard and the batch CLI.
+
+Every entry is a number, so the table can be sorted, ranked and written out
+as data. Formatting is left to whoever displays it. Ranges are split into
+``lo`` and ``hi`` columns, meaning at the low and high ends of the rate range.
+"""
+
+import numpy as np
+
+from housing.evaluation import Evaluation
+from housing.listings import IndexArray, Listing
+
+# Ranking puts the largest first for these and the smallest first for the rest
+HIGHER_IS_BETTER = frozenset({
+    "Value @ 5yr", "Equity @ 5yr lo", "Equity @ 5yr hi",
+    "Value @ 10yr", "Equity @ 10yr lo", "Equity @ 10yr hi",
+})
+# Years until buying beats renting; NaN if it never does within the horizon
+BREAK_EVEN = "Rent/Buy Break-even"
+
+
+def comparison_columns(records: list[Listing], evaluation: Evaluation) -> dict[str, np.ndarray]:
+    """One row per listing, in order. Text columns come first."""
+    projections = evaluation.projections
+
+    def field(name: str) -> np.ndarray:
+        return np.array([getattr(proj, name) for proj in projections], dtype=np.float64)
+
+    def paid_by(month: int, side: str) -> np.ndarray:
+        return np.array([getattr(proj, f"paid_{side}")[month] for proj in projections], dtype=np.float64)
+
+    price = np.array(evaluation.offer_prices, dtype=np.float64)
+    columns = {
+        "Property": np.array([prop["address"] for prop in records], dtype=str),
+        "Neighborhood": np.array([prop["neighborhood"] for prop in records], dtype=str),
+        "Price": price,
+        "$/SF": price / np.array([prop["sqft"] for prop in records], dtype=np.float64),
+        "Down Payment": field("down_payment"),
+        "Down %": np.array(evaluation.down_pcts, dtype=np.float64),
+        "Monthly Mortgage lo": field("payment_lo"),
+        "Monthly Mortgage hi": field("payment_hi"),
+        "Taxes/mo": np.array([prop["taxes_monthly"] for prop in records], dtype=np.float64),
+        "HOA/mo": np.array([prop["common_charges_monthly"] for prop in records], dtype=np.float64),
+        "Total Monthly lo": field("total_monthly_lo"),
+        "Total Monthly hi": field("total_monthly_hi"),
+        "Total Annual lo": paid_by(12, "lo"),
+        "Total Annual hi": paid_by(12, "hi"),
+        "Value @ 5yr": field("value_5"),
+        "Equity @ 5yr lo": field("equity_5_lo"),
+        "Equity @ 5yr hi": field("equity_5_hi"),
+        "Value @ 10yr": field("value_10"),
+        "Equity @ 10yr lo": field("equity_10_lo"),
+        "Equity @ 10yr hi": field("equity_10_hi"),
+        "Total Paid 5yr lo": field("paid_5_lo"),
+        "Total Paid 5yr hi": field("paid_5_hi"),
+        "Total Paid 10yr lo": field("paid_10_lo"),
+        "Total Paid 10yr hi": field("paid_10_hi"),
+    }
+    if evaluation.rent_buy is not None:
+        columns[BREAK_EVEN] = np.asarray(evaluation.rent_buy.break_even_years, dtype=np.float64)
+    return columns
+
+
+def rank(columns: dict[str, np.ndarray], by: str, n: int | None = None) -> IndexArray:
+    """Row indices best first by column ``by``, NaN last, ties in input order.
+
+    Only the first ``n`` are returned when given.
+    """
+    keys = columns[by] if by not in HIGHER_IS_BETTER else -columns[by]
+    order = np.argsort(np.where(np.isnan(keys), np.inf, keys), kind="stable")
+    return order if n is None else order[:n]
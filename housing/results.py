@@ -0,0 +1,225 @@
+"""Content-addressed cache of computed results on disk.
+
+A result is stored under the SHA-256 of the kernel's name, a version number
+and its arguments, so the same inputs map to the same file no matter who
+computed them. Pointing ``HOUSE_HUNT_CACHE_DIR`` at a shared directory lets
+several people reuse each other's projections. Results are dataclasses of
+floats and arrays. Each is written as one JSON header line, naming every
+field's dtype and shape, followed by the raw array bytes, so a load is a
+single read plus ``np.frombuffer`` views and never unpickles anything
+someone else wrote. (An ``.npz`` takes longer to open than most projections
+take to compute.) Once the files outgrow the size limit, the least recently
+used are evicted.
+
+Several processes (batch workers, server processes, other people on a shared
+directory) may write at once. Each counts the directory afresh after writing
+a small share of the limit itself, and eviction recounts and trims under a
+lock file, so the directory overshoots the limit by at most that share per
+writing process between counts.
+"""
+
+import contextlib
+import dataclasses
+import hashlib
+import json
+import math
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from housing.config import CACHE_DIR
+
+RESULT_DIR = CACHE_DIR / "results"
+# 0 turns the cache off
+MAX_BYTES = int(float(os.environ.get("HOUSE_HUNT_RESULT_CACHE_MB", 256)) * (1 << 20))
+# Eviction stops once the cache is back under this share of the limit
+_EVICT_TO = 0.8
+# A process recounts the directory after writing this share of the limit, to see other processes' writes
+_RECOUNT_EVERY = 0.05
+
+try:
+    import fcntl
+except ImportError:  # Windows: evictions by different processes may overlap, which only over-trims
+    fcntl = None
+
+
+def _canonical(value):
+    """A JSON-serializable form of ``value`` that equal arguments share."""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float, np.number)):
+        # 30 and 30.0 are the same argument to every kernel
+        return float(value)
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return {"dtype": str(value.dtype), "shape": list(value.shape), "sha256": digest}
+    if isinstance(value, (tuple, list)):
+        return [_canonical(item) for item in value]
+    if dataclasses.is_dataclass(value):
+        return {
+            "type": type(value).__qualname__,
+            **{field.name: _canonical(getattr(value, field.name)) for field in dataclasses.fields(value)},
+        }
+    raise TypeError(f"cannot hash argument of type {type(value).__name__}")
+
+
+def result_key(name: str, version: int, args: tuple, kwargs: dict) -> str:
+    payload = [name, version, _canonical(args), {k: _canonical(v) for k, v in sorted(kwargs.items())}]
+    return hashlib.sha256(json.dumps(payload, separators=(",", ":")).encode()).hexdigest()
+
+
+def _encode(value) -> bytes:
+    arrays = [(field.name, np.asarray(getattr(value, field.name))) for field in dataclasses.fields(value)]
+    header = json.dumps([[name, array.dtype.str, list(array.shape)] for name, array in arrays]).encode()
+    # Pad so every array starts 8-byte aligned
+    header += b" " * (-(len(header) + 1) % 8) + b"\n"
+    return header + b"".join(np.ascontiguousarray(array).tobytes() + b"\0" * (-array.nbytes % 8) for _, array in arrays)
+
+
+def _decode(data: bytes) -> dict:
+    """Fields from ``_encode``; scalars come back as Python numbers, arrays as read-only views."""
+    offset = data.index(b"\n") + 1
+    values = {}
+    for name, dtype, shape in json.loads(data[:offset]):
+        dtype = np.dtype(dtype)
+        if dtype.hasobject:
+            raise ValueError(f"object dtype for {name}")
+        count = math.prod(shape)
+        array = np.frombuffer(data, dtype, count, offset).reshape(shape)
+        values[name] = array.item() if array.ndim == 0 else array
+        offset += array.nbytes + -array.nbytes % 8
+    return values
+
+
+class ResultCache:
+    def __init__(self, root: Path = RESULT_DIR, max_bytes: int = MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        # Bytes on disk when last counted, plus what this process has written since
+        self._size: int | None = None
+        self._unseen = 0
+        self._lock = threading.Lock()
+        # Per thread, so one caller turning the cache off leaves other sessions alone
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and not getattr(self._local, "disabled", False)
+
+    @contextlib.contextmanager
+    def disabled(self, disable: bool = True):
+        """Bypass the cache on this thread for the duration of the block, if ``disable``."""
+        previous = getattr(self._local, "disabled", False)
+        self._local.disabled = previous or disable
+        try:
+            yield
+        finally:
+            self._local.disabled = previous
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.res"
+
+    def get(self, key: str, cls: type):
+        """The ``cls`` instance stored under ``key``, or None."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            # The modification time doubles as the last-used time for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        try:
+            values = _decode(data)
+        except (ValueError, TypeError, KeyError):
+            # Truncated or foreign file; recompute and overwrite it
+            path.unlink(missing_ok=True)
+            return None
+        if values.keys() != {field.name for field in dataclasses.fields(cls)}:
+            return None
+        return cls(**values)
+
+    def put(self, key: str, value) -> None:
+        """Store the dataclass ``value`` under ``key``, evicting if over the limit."""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        # Sessions share the process, so the thread is part of the name too
+        tmp = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(_encode(value))
+            os.replace(tmp, path)
+        except OSError:
+            # A read-only or full shared directory only costs the reuse
+            tmp.unlink(missing_ok=True)
+            return
+        try:
+            written = path.stat().st_size
+        except FileNotFoundError:
+            # Already evicted by another process
+            written = 0
+        with self._lock:
+            if self._size is None or self._unseen + written >= self.max_bytes * _RECOUNT_EVERY:
+                self._size, self._unseen = self.size(), 0
+            else:
+                self._size += written
+                self._unseen += written
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    @contextlib.contextmanager
+    def _exclusive(self):
+        """Hold the directory's lock file, so only one process evicts at a time."""
+        try:
+            f = open(self.root / ".lock", "a")
+        except OSError:
+            # Missing or read-only directory; there is nothing this process could evict anyway
+            yield
+            return
+        with f:
+            # Closing the file releases the lock
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _files(self) -> list[tuple[float, int, Path]]:
+        files = []
+        for path in self.root.glob("*/*.res"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._files())
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Delete least recently used files until under ``max_bytes``; return how many."""
+        target = self.max_bytes * _EVICT_TO if max_bytes is None else max_bytes
+        removed = 0
+        with self._exclusive():
+            # Counted under the lock, so a concurrent eviction's deletions are seen
+            files = sorted(self._files(), key=lambda entry: entry[0])
+            size = sum(size for _, size, _ in files)
+            for _, file_size, path in files:
+                if size <= target:
+                    break
+                path.unlink(missing_ok=True)
+                size -= file_size
+                removed += 1
+        with self._lock:
+            self._size, self._unseen = size, 0
+        return removed
+
+    def clear(self) -> int:
+        return self.evict(max_bytes=0)
+
+
+RESULTS = ResultCache()
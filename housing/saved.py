@@ -0,0 +1,68 @@
+"""Named scenarios saved to a local SQLite database.
+
+A scenario is the dashboard's inputs (shortlist, loan and market
+assumptions, offer prices and down payments) as a JSON object, stored under a
+name. Each call opens its own connection, because Streamlit runs sessions on
+separate threads. The database can sit on a shared drive
+(``HOUSE_HUNT_SCENARIOS``) so a team works from the same scenarios.
+"""
+
+import contextlib
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+from housing.config import SCENARIOS_PATH
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    name TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+
+class ScenarioStore:
+    def __init__(self, path: str | Path = SCENARIOS_PATH):
+        self.path = Path(path)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """A connection that commits on success and is always closed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                conn.execute(_SCHEMA)
+                yield conn
+        finally:
+            conn.close()
+
+    def names(self) -> list[str]:
+        """Saved scenario names, most recently saved first."""
+        if not self.path.exists():
+            return []
+        with self._connect() as conn:
+            return [name for name, in conn.execute("SELECT name FROM scenarios ORDER BY updated_at DESC")]
+
+    def load(self, name: str) -> dict | None:
+        if not self.path.exists():
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT params FROM scenarios WHERE name = ?", (name,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def save(self, name: str, params: dict) -> None:
+        """Save ``params`` under ``name``, replacing any scenario of that name."""
+        updated = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO scenarios (name, params, updated_at) VALUES (?, ?, ?)",
+                (name, json.dumps(params, sort_keys=True), updated),
+            )
+
+    def delete(self, name: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM scenarios WHERE name = ?", (name,))
@@ -0,0 +1,88 @@
+"""Broadcasted evaluation of scenario grids across many listings.
+
+Axes of every result cube, in order: listing, interest rate, down payment %,
+offer price (as % of the listing price), annual appreciation %.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from housing.amortization import FloatArray, _balance_factor, _monthly_rate, _payment
+
+AXES = ("listing", "rate", "down_pct", "offer_pct", "appreciation")
+
+
+@dataclass(frozen=True)
+class ScenarioGrid:
+    rates: FloatArray
+    down_pcts: FloatArray
+    offer_pcts: FloatArray
+    appreciation: FloatArray
+    horizon_years: int
+    payment: FloatArray
+    total_monthly: FloatArray
+    equity: FloatArray
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self.equity.shape
+
+
+def _axis(values: ArrayLike, position: int) -> FloatArray:
+    shape = [1] * len(AXES)
+    shape[position] = -1
+    return np.asarray(values, dtype=np.float64).reshape(shape)
+
+
+def scenario_grid(
+    prices: ArrayLike,
+    carrying_costs: ArrayLike,
+    rates: ArrayLike,
+    down_pcts: ArrayLike,
+    offer_pcts: ArrayLike,
+    appreciation: ArrayLike,
+    years: int,
+    horizon_years: int,
+    min_down_pcts: ArrayLike | None = None,
+) -> ScenarioGrid:
+    """Evaluate the Cartesian product of the given axes for every listing.
+
+    ``prices`` and ``carrying_costs`` (monthly taxes plus common charges) hold
+    one entry per listing. Scenarios whose down payment falls below a listing's
+    ``min_down_pcts`` are NaN. ``payment`` and ``total_monthly`` do not depend
+    on appreciation and are returned as read-only broadcast views, so only
+    ``equity`` occupies memory for the full cube.
+    """
+    price = _axis(prices, 0)
+    carrying = _axis(carrying_costs, 0)
+    r = _monthly_rate(np.asarray(rates, dtype=np.float64))
+    down = _axis(down_pcts, 2)
+    offer = _axis(offer_pcts, 3)
+    growth = (1 + _axis(appreciation, 4) / 100) ** horizon_years
+
+    n = years * 12
+    horizon = min(horizon_years * 12, n)
+    pay_factor = _axis(_payment(np.float64(1), r, n), 1)
+    bal_factor = _axis(_balance_factor(r[:, None], n, np.array([horizon]))[:, 0], 1)
+
+    offer_price = price * offer / 100
+    loan = offer_price * (1 - down / 100)
+    if min_down_pcts is not None:
+        loan = np.where(down < _axis(min_down_pcts, 0), np.nan, loan)
+    payment = loan * pay_factor
+    total_monthly = payment + carrying
+    equity = offer_price * growth - loan * bal_factor
+
+    shape = equity.shape
+    return ScenarioGrid(
+        rates=np.asarray(rates, dtype=np.float64),
+        down_pcts=np.asarray(down_pcts, dtype=np.float64),
+        offer_pcts=np.asarray(offer_pcts, dtype=np.float64),
+        appreciation=np.asarray(appreciation, dtype=np.float64),
+        horizon_years=horizon_years,
+        payment=np.broadcast_to(payment, shape),
+        total_monthly=np.broadcast_to(total_monthly, shape),
+        equity=equity,
+    )
@@ -0,0 +1,123 @@
+"""Precomputed payment factors and balance curves for the dashboard's rate grid.
+
+The rate slider moves in 0.125-point steps from 3% to 10% and the loan term
+is one of four lengths, so every fixed-rate loan the dashboard can describe
+is one of 57 × 4 curves of balance per $1 borrowed over months 0..360. They
+are computed once with the closed-form kernels, written to ``CACHE_DIR`` and
+memory-mapped on first use, so every process and session shares the same
+pages, and a listing's balance path is the curve scaled by its principal.
+Rates off the grid (typed into the batch CLI, say) and longer horizons are
+not in the table; the lookups return None for them and callers fall back
+to the kernels.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from housing.amortization import FloatArray, _balance_factor, _monthly_rate, _payment
+from housing.config import CACHE_DIR
+
+RATE_MIN, RATE_STEP, RATE_COUNT = 3.0, 0.125, 57
+RATES = RATE_MIN + RATE_STEP * np.arange(RATE_COUNT)
+TERMS = (15, 20, 25, 30)
+MONTHS = 30 * 12 + 1
+# Bump whenever the tables' contents or layout change
+VERSION = 1
+TABLE_DIR = CACHE_DIR / "tables"
+
+_TERM_INDEX = {years: i for i, years in enumerate(TERMS)}
+# Grid rates are exact in binary, so slider values match them exactly
+_RATE_INDEX = {rate: k for k, rate in enumerate(RATES.tolist())}
+
+
+class RateTables(NamedTuple):
+    # Monthly payment per $1 borrowed, by term and rate
+    payment: NDArray[np.float64]
+    # Balance per $1 borrowed at months 0..360, by term and rate; zero once paid off
+    balance: NDArray[np.float64]
+
+
+def build_tables() -> RateTables:
+    r = _monthly_rate(RATES)[:, None]
+    payment = np.empty((len(TERMS), RATE_COUNT))
+    balance = np.empty((len(TERMS), RATE_COUNT, MONTHS))
+    for i, years in enumerate(TERMS):
+        n = years * 12
+        payment[i] = _payment(np.float64(1), r[:, 0], n)
+        # The same expression as ``loan_balance_path``, so scaled curves match it exactly
+        balance[i] = np.maximum(_balance_factor(r, n, np.minimum(np.arange(MONTHS), n)), 0)
+    return RateTables(payment, balance)
+
+
+def _write(path: Path, array: np.ndarray) -> None:
+    tmp = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def load_tables(root: Path = TABLE_DIR) -> RateTables:
+    """The tables memory-mapped from ``root``, building and writing them first if needed.
+
+    If ``root`` cannot be written, the freshly built tables are used from memory.
+    """
+    paths = RateTables(root / f"payment-v{VERSION}.npy", root / f"balance-v{VERSION}.npy")
+    expected = RateTables((len(TERMS), RATE_COUNT), (len(TERMS), RATE_COUNT, MONTHS))
+    try:
+        tables = RateTables(*(np.asarray(np.load(path, mmap_mode="r")) for path in paths))
+        if all(table.shape == shape for table, shape in zip(tables, expected)):
+            return tables
+    except (OSError, ValueError):
+        pass
+    tables = build_tables()
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        for path, table in zip(paths, tables):
+            _write(path, table)
+        return RateTables(*(np.asarray(np.load(path, mmap_mode="r")) for path in paths))
+    except OSError:
+        for table in tables:
+            table.setflags(write=False)
+        return tables
+
+
+_tables: RateTables | None = None
+_lock = threading.Lock()
+
+
+def tables() -> RateTables:
+    """The process's tables, loaded on first use."""
+    global _tables
+    if _tables is None:
+        with _lock:
+            if _tables is None:
+                _tables = load_tables()
+    return _tables
+
+
+def grid_index(annual_rate_pct, years: int) -> tuple[int, int] | None:
+    """``(term, rate)`` indexes of a scalar rate and term on the grid, or None."""
+    if not isinstance(annual_rate_pct, (int, float, np.floating)):
+        return None
+    k = _RATE_INDEX.get(annual_rate_pct)
+    term = _TERM_INDEX.get(years)
+    return None if k is None or term is None else (term, k)
+
+
+def payment_factor(annual_rate_pct, years: int) -> float | None:
+    """Monthly payment per $1 borrowed, or None off the grid."""
+    index = grid_index(annual_rate_pct, years)
+    return None if index is None else float(tables().payment[index])
+
+
+def balance_curve(annual_rate_pct, years: int, horizon_months: int) -> FloatArray | None:
+    """Read-only balance per $1 borrowed at months ``0..horizon_months``, or None off the grid."""
+    index = grid_index(annual_rate_pct, years)
+    if index is None or not 0 <= horizon_months < MONTHS:
+        return None
+    return tables().balance[index[0], index[1], :horizon_months + 1]
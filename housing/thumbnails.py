@@ -0,0 +1,53 @@
+"""Resized, compressed image variants cached on disk.
+
+Each source image is hashed once per modification time. Variants are
+written to the cache directory under that hash, so they survive restarts and
+are regenerated only when the source file changes.
+"""
+
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from housing.config import CACHE_DIR
+
+# Bounding boxes are about twice the rendered size, for high-DPI screens
+VARIANTS = {
+    "card": (900, 600),
+    "tab": (900, 900),
+}
+JPEG_QUALITY = 82
+
+
+@lru_cache(maxsize=1024)
+def _source_digest(path: Path, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:20]
+
+
+def _render(source: Path, target: Path, size: tuple[int, int]) -> None:
+    from PIL import Image
+
+    with Image.open(source) as img:
+        img = img.convert("RGB")
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        img.save(tmp, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    os.replace(tmp, target)
+
+
+def thumbnail(source: str | Path, variant: str) -> str:
+    """Path to the ``variant`` rendition of ``source``, generating it if needed."""
+    source = Path(source)
+    digest = _source_digest(source.resolve(), source.stat().st_mtime_ns)
+    width, height = VARIANTS[variant]
+    target = CACHE_DIR / "thumbnails" / f"{digest}-{variant}-{width}x{height}.jpg"
+    if not target.exists():
+        _render(source, target, (width, height))
+    return str(target)
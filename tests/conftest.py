@@ -0,0 +1,8 @@
+"""Point the package's on-disk caches at a scratch directory before it is imported."""
+
+import os
+import tempfile
+
+_SCRATCH = tempfile.mkdtemp(prefix="house-hunt-tests-")
+os.environ.setdefault("HOUSE_HUNT_CACHE_DIR", os.path.join(_SCRATCH, "cache"))
+os.environ.setdefault("HOUSE_HUNT_SCENARIOS", os.path.join(_SCRATCH, "scenarios.sqlite3"))
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from housing.affordability import affordability
+from housing.amortization import monthly_mortgage
+
+
+def test_max_loan_spends_the_budget():
+    fit = affordability([1_000_000, 2_000_000], [1_500, 3_000], 9_000, [5.0, 6.0], 30, 400_000)
+    for i, carrying in enumerate([1_500, 3_000]):
+        for j, rate in enumerate([5.0, 6.0]):
+            assert monthly_mortgage(fit.max_loan[i, j], rate, 30) + carrying == pytest.approx(9_000)
+    np.testing.assert_allclose(fit.max_price, 400_000 + fit.max_loan)
+
+
+def test_min_down_and_limits():
+    fit = affordability([1_000_000], [12_000], 10_000, [5.0], 30, 300_000)
+    assert np.isnan(fit.max_loan).all() and not fit.fits.any()
+    fit = affordability([1_000_000], [0], 20_000, [5.0], 30, 300_000, min_down_pcts=[25])
+    # Affordable on payments, but the minimum down percentage caps the price
+    assert fit.min_down[0, 0] == pytest.approx(250_000)
+    assert fit.max_price[0, 0] == pytest.approx(1_200_000)
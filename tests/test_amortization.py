@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from housing.amortization import amortization_schedule, appreciation_series, loan_balance_path, monthly_mortgage
+
+
+def loop_schedule(principal, annual_rate_pct, years):
+    """The month-by-month loop the closed-form kernels replaced."""
+    r = annual_rate_pct / 100 / 12
+    n = years * 12
+    payment = principal / n if r == 0 else principal * r * (1 + r) ** n / ((1 + r) ** n - 1)
+    balances, principals, interests, equity = [], [], [], []
+    balance = principal
+    for _ in range(n):
+        interest = balance * r
+        princ = payment - interest
+        balance -= princ
+        balances.append(max(balance, 0))
+        principals.append(princ)
+        interests.append(interest)
+        equity.append(principal - max(balance, 0))
+    return balances, principals, interests, equity
+
+
+@pytest.mark.parametrize("rate", [0.0, 3.0, 5.425, 10.0])
+@pytest.mark.parametrize("years", [15, 30])
+def test_schedule_matches_loop(rate, years):
+    schedule = amortization_schedule(1_060_000, rate, years)
+    for closed, looped in zip(schedule, loop_schedule(1_060_000, rate, years)):
+        np.testing.assert_allclose(closed, looped, rtol=0, atol=1e-4)
+
+
+def test_kernels_broadcast():
+    principals = np.array([500_000.0, 1_000_000.0])
+    rates = np.array([[4.0], [6.5]])
+    payments = monthly_mortgage(principals, rates, 30)
+    assert payments.shape == (2, 2)
+    assert payments[1, 0] == pytest.approx(monthly_mortgage(500_000, 6.5, 30))
+    assert amortization_schedule(principals, rates, 30).balances.shape == (2, 2, 360)
+
+
+def test_balance_path_is_zero_after_payoff():
+    path = loan_balance_path(800_000, 5.0, 15, 360)
+    assert path.shape == (361,)
+    assert path[0] == 800_000
+    np.testing.assert_allclose(path[1:181], amortization_schedule(800_000, 5.0, 15).balances, atol=1e-6)
+    assert not path[180:].any()
+
+
+def test_appreciation_compounds_annually():
+    values = appreciation_series(1_000_000, 3.0, 10)
+    assert values[12] == pytest.approx(1_030_000)
+    assert values[120] == pytest.approx(1_000_000 * 1.03 ** 10)
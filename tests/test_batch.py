@@ -0,0 +1,19 @@
+from housing import results
+from housing.batch import evaluate_stream, main, read_records
+from housing.config import ROOT
+from housing.evaluation import Scenario
+
+LISTINGS = ROOT / "data" / "listings.json"
+
+
+def test_serial_run_leaves_the_result_cache_on():
+    chunks = list(evaluate_stream(read_records(LISTINGS), Scenario(), chunk_size=2, result_cache=False))
+    assert [len(columns["Property"]) for columns in chunks] == [2, 1]
+    assert results.RESULTS.enabled
+
+
+def test_cli_writes_every_listing(tmp_path, capsys):
+    out = tmp_path / "out.jsonl"
+    assert main([str(LISTINGS), str(out), "--workers", "1", "--arm", "5", "--rent-yield", "4"]) == 0
+    lines = out.read_text().splitlines()
+    assert len(lines) == 3 and '"Rent/Buy Break-even"' in lines[0]
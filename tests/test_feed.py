@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer
+from urllib.parse import unquote
+
+import pytest
+
+from housing import feed
+from housing.config import ROOT
+from housing.listings import ListingStore, epoch_months
+
+
+@pytest.fixture
+def listings(tmp_path, monkeypatch):
+    monkeypatch.setattr(feed, "FEED_DIR", tmp_path / "snapshots")
+    path = tmp_path / "listings.json"
+    path.write_text((ROOT / "data" / "listings.json").read_text())
+    return path
+
+
+def publish(directory, prices: dict, as_of: str):
+    directory.mkdir(exist_ok=True)
+    for name, price in prices.items():
+        (directory / f"{name}.json").write_text(json.dumps({"price": price, "as_of": as_of}))
+
+
+def test_refresh_appends_changes_once(listings, tmp_path):
+    name = ListingStore.load(listings)["name"][0]
+    publish(tmp_path / "feed", {name: 1_299_000}, "2026-09")
+    report = feed.refresh(listings, str(tmp_path / "feed"))
+    assert (report.fetched, report.changed, report.failed) == (1, 1, 0)
+    assert feed.latest_path(listings) == feed.snapshot_path(listings)
+    assert feed.refresh(listings, str(tmp_path / "feed")).changed == 0
+
+
+def test_editing_the_file_keeps_feed_history(listings, tmp_path):
+    feed_dir = tmp_path / "feed"
+    name = ListingStore.load(listings)["name"][0]
+    publish(feed_dir, {name: 1_299_000}, "2026-09")
+    feed.refresh(listings, str(feed_dir))
+
+    # An ingest-style edit to the listings file, newer than the snapshot
+    records = json.loads(listings.read_text())
+    records[0]["sqft"] = 1_100
+    listings.write_text(json.dumps(records))
+    stat = feed.snapshot_path(listings).stat()
+    os.utime(listings, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert feed.latest_path(listings) == listings
+
+    publish(feed_dir, {name: 1_279_000}, "2026-10")
+    feed.refresh(listings, str(feed_dir))
+    store = ListingStore.load(feed.latest_path(listings))
+    row = store.index_of(name)
+    assert store["sqft"][row] == 1_100
+    assert store["price"][row] == 1_279_000
+    history = store.price_history(row)
+    assert history.prices[-2:].tolist() == [1_299_000, 1_279_000]
+    assert history.months[-2:].tolist() == epoch_months(["09/2026", "10/2026"]).tolist()
+
+
+def test_same_named_files_keep_separate_snapshots(listings, tmp_path):
+    feed_dir = tmp_path / "feed"
+    other = tmp_path / "other" / "listings.json"
+    other.parent.mkdir()
+    other.write_text(listings.read_text())
+    name = ListingStore.load(listings)["name"][0]
+    assert feed.snapshot_path(listings) != feed.snapshot_path(other)
+
+    publish(feed_dir, {name: 1_299_000}, "2026-09")
+    feed.refresh(listings, str(feed_dir))
+    assert feed.latest_path(other) == other
+    publish(feed_dir, {name: 1_279_000}, "2026-10")
+    feed.refresh(other, str(feed_dir))
+    assert ListingStore.load(feed.latest_path(listings))["price"][0] == 1_299_000
+    assert ListingStore.load(feed.latest_path(other))["price"][0] == 1_279_000
+
+
+def test_feed_url_with_query_rejected(listings):
+    with pytest.raises(feed.FeedError, match="query string"):
+        feed.refresh(listings, "http://127.0.0.1:9/snapshots?token=abc")
+
+
+class FeedHandler(feed._QuietHandler):
+    """The ``serve`` handler, recording connections and with a few broken listings."""
+
+    connections: list
+
+    def setup(self):
+        super().setup()
+        self.connections.append(self.client_address)
+
+    def do_GET(self):
+        name = unquote(self.path).removeprefix("/feed/").removesuffix(".json")
+        if name.endswith("error"):
+            self.send_error(500)
+        elif name.endswith("chunked"):
+            body = json.dumps({"price": 1_111_000, "as_of": "2026-09"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for part in (body[:7], body[7:]):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            super().do_GET()
+
+
+@pytest.fixture
+def http_feed(tmp_path):
+    """Serve ``tmp_path / "feed"`` at a ``/feed`` base URL with ``handler``."""
+    servers = []
+
+    def start(handler=FeedHandler):
+        handler = type(handler.__name__, (handler,), {"connections": []})
+        server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=str(tmp_path)))
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/feed", handler.connections
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def write_listings(path, names):
+    base = json.loads((ROOT / "data" / "listings.json").read_text())[0]
+    path.write_text(json.dumps([{**base, "name": name, "price_history": []} for name in names]))
+
+
+def test_http_statuses(listings, tmp_path, http_feed):
+    names = ["12 Main St ok", "12 Main St missing", "12 Main St error", "12 Main St garbled", "12 Main St chunked"]
+    write_listings(listings, names)
+    publish(tmp_path / "feed", {names[0]: 1_299_000}, "2026-09")
+    (tmp_path / "feed" / f"{names[3]}.json").write_text('{"price": 1299000')
+    url, _ = http_feed()
+
+    report = feed.refresh(listings, url, concurrency=2)
+    assert (report.fetched, report.missing, report.failed, report.changed) == (2, 1, 2, 2)
+    store = ListingStore.load(feed.latest_path(listings))
+    assert store["price"][store.index_of(names[0])] == 1_299_000
+    assert store["price"][store.index_of(names[4])] == 1_111_000
+
+
+def test_http_connection_is_kept_alive(listings, tmp_path, http_feed):
+    names = [f"Unit {i}" for i in range(6)]
+    write_listings(listings, names)
+    publish(tmp_path / "feed", {name: 1_000_000 + i for i, name in enumerate(names)}, "2026-09")
+    url, connections = http_feed()
+
+    report = feed.refresh(listings, url, concurrency=2)
+    assert (report.fetched, report.failed) == (6, 0)
+    assert len(connections) == 2
+
+
+class ClosingHandler(FeedHandler):
+    # Closes every connection after one response without saying so
+    protocol_version = "HTTP/1.0"
+
+
+def test_http_retries_a_dropped_connection(listings, tmp_path, http_feed):
+    names = [f"Unit {i}" for i in range(3)]
+    write_listings(listings, names)
+    publish(tmp_path / "feed", {name: 1_000_000 + i for i, name in enumerate(names)}, "2026-09")
+    url, connections = http_feed(ClosingHandler)
+
+    report = feed.refresh(listings, url, concurrency=1)
+    assert (report.fetched, report.failed) == (3, 0)
+    assert len(connections) == 3
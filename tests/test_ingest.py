@@ -0,0 +1,51 @@
+from housing.ingest import extract_fields
+
+PAGES = [
+    "Unit 4C  1,120 sq ft\nReal estate taxes $6,000 per year\nCommon charges $1,050 /mo",
+    "Price history\n01/2025  Listed  $1,295,000\n06/2025  Reduced  $1,249,000",
+    "Offering plan, schedule B",
+    "Closing on 03/2027, the sponsor pays $50,000 into reserve. 421-a abatement expires 2031",
+]
+
+
+def test_fields_from_pages():
+    found = extract_fields(PAGES)
+    assert found["sqft"] == 1120
+    assert found["taxes_monthly"] == 500
+    assert found["common_charges_monthly"] == 1050
+    assert "abatement expires 2031" in found["tax_abatement_note"]
+
+
+def test_dated_amounts_after_the_history_table_are_ignored():
+    assert extract_fields(PAGES)["price_history"] == [("01/2025", 1_295_000), ("06/2025", 1_249_000)]
+
+
+def test_history_table_spanning_pages():
+    pages = ["01/2025 Listed $1,295,000", "06/2025 Reduced $1,249,000", "no table here"]
+    assert extract_fields(pages)["price_history"] == [("01/2025", 1_295_000), ("06/2025", 1_249_000)]
+
+
+def test_reads_every_page_while_a_field_is_missing():
+    read = []
+
+    def pages():
+        for page in PAGES:
+            read.append(page)
+            yield page
+
+    extract_fields(pages())
+    assert read == PAGES
+
+
+def test_stops_reading_once_every_field_is_found():
+    pages = [*PAGES[:2], "421-a abatement expires 2031", "Closing on 03/2027, $50,000 into reserve"]
+    read = []
+
+    def page_iter():
+        for page in pages:
+            read.append(page)
+            yield page
+
+    assert extract_fields(page_iter())["price_history"] == [("01/2025", 1_295_000), ("06/2025", 1_249_000)]
+    # Page 3 ends the history table and supplies the last field
+    assert read == pages[:3]
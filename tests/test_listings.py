@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from housing.listings import ListingStore, epoch_months
+
+
+def record(name, price, history):
+    return {
+        "name": name, "address": f"{name} Address", "neighborhood": "Park Slope", "type": "Condo",
+        "condition": "Good", "amenities": "", "image": "", "streeteasy": "",
+        "price": price, "beds": 2, "baths": 1, "sqft": 1000, "year_built": 1990,
+        "taxes_monthly": 500, "common_charges_monthly": 800, "min_down_pct": 20,
+        "price_history": history,
+    }
+
+
+def make_store():
+    return ListingStore.from_records([
+        record("a", 1_000_000, [["01/2025", 1_050_000], ["06/2025", 1_000_000]]),
+        record("b", 900_000, []),
+        record("c", 800_000, [["03/2026", 800_000]]),
+    ])
+
+
+def test_apply_prices_appends_changes_in_place():
+    store = make_store()
+    months = epoch_months(["09/2026", "09/2026", "09/2026"])
+    updated, changed = store.apply_prices(months, [975_000, 910_000, 800_000], [True, True, True])
+
+    assert changed.tolist() == [True, True, False]
+    assert updated["price"].tolist() == [975_000, 910_000, 800_000]
+    assert updated.history_offsets.tolist() == [0, 3, 4, 5]
+    history = updated.price_history(0)
+    assert history.prices.tolist() == [1_050_000, 1_000_000, 975_000]
+    assert history.months[-1] == months[0]
+    assert updated.price_history(1).prices.tolist() == [910_000]
+    assert updated.price_history(2).prices.tolist() == [800_000]
+    # The original store is untouched
+    assert store.history_offsets.tolist() == [0, 2, 2, 3]
+    assert store["price"].tolist() == [1_000_000, 900_000, 800_000]
+
+
+def test_apply_prices_skips_missing_and_stale():
+    store = make_store()
+    months = epoch_months(["09/2026", "09/2026", "01/2026"])
+    updated, changed = store.apply_prices(months, [975_000, 910_000, 750_000], [False, True, True])
+    # Row a was not found; row c's snapshot is older than its latest entry
+    assert changed.tolist() == [False, True, False]
+    assert updated.history_offsets.tolist() == [0, 2, 3, 4]
+    np.testing.assert_array_equal(updated.price_history(2).prices, store.price_history(2).prices)
+
+
+def test_npz_round_trip(tmp_path):
+    store = make_store()
+    store.save(tmp_path / "store.npz")
+    loaded = ListingStore.load(tmp_path / "store.npz")
+    assert loaded.records([0, 1, 2]).keys() == store.records([0, 1, 2]).keys()
+    np.testing.assert_array_equal(loaded.history_months, store.history_months)
+    assert loaded.query(price=(850_000, 1_000_000)).tolist() == [0, 1]
+
+
+def test_duplicate_names_rejected(tmp_path):
+    records = [record("a", 1_000_000, []), record("b", 900_000, []), record("a", 800_000, [])]
+    with pytest.raises(ValueError, match="'a'"):
+        ListingStore.from_records(records)
+    store = make_store()
+    store.columns["name"] = np.array(["a", "b", "b"])
+    store.save(tmp_path / "store.npz")
+    with pytest.raises(ValueError, match="'b'"):
+        ListingStore.load(tmp_path / "store.npz")
+
+
+def test_merge_history_appends_later_entries():
+    store = make_store()
+    snapshot, _ = store.apply_prices(epoch_months(["09/2026"] * 3), [975_000, 910_000, 780_000], [True] * 3)
+    snapshot, _ = snapshot.apply_prices(epoch_months(["10/2026"] * 3), [950_000, 910_000, 780_000], [True] * 3)
+    edited = ListingStore.from_records([
+        record("c", 800_000, [["03/2026", 800_000]]),
+        record("a", 1_000_000, [["01/2025", 1_050_000], ["06/2025", 1_000_000], ["11/2026", 990_000]]),
+        record("d", 700_000, []),
+    ])
+    merged = edited.merge_history(snapshot)
+
+    assert merged["name"].tolist() == ["c", "a", "d"]
+    assert merged.price_history(0).prices.tolist() == [800_000, 780_000]
+    # Row a's own entry is newer than anything the feed appended
+    assert merged.price_history(1).prices.tolist() == [1_050_000, 1_000_000, 990_000]
+    assert merged.price_history(2).prices.tolist() == []
+    assert merged["price"].tolist() == [780_000, 1_000_000, 700_000]
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from housing.amortization import loan_balance_path
+from housing.loans import LoanStructure, RateSegment, loan_path
+
+
+def brute_force(principal, rate, years, horizon, structure):
+    """Balances and interest of ``structure``, one month at a time."""
+    n = years * 12
+    starts, start = {}, 0
+    for segment in structure.segments:
+        if start < n:
+            starts[start] = segment
+        start += segment.months
+    lumps = {}
+    for month, amount in structure.lump_sums:
+        lumps[month] = lumps.get(month, 0.0) + amount
+    balance, payment, segment = float(principal), 0.0, None
+    balances, interest = [balance], []
+    for m in range(min(n, horizon)):
+        segment = starts.get(m, segment)
+        r = (rate + segment.rate_offset_pct) / 1200
+        if m in starts or (structure.recast and m in lumps):
+            if segment.interest_only:
+                payment = balance * r
+            else:
+                payment = balance * r / (1 - (1 + r) ** -(n - m)) if r else balance / (n - m)
+        interest.append(balance * r)
+        balance = max(balance * (1 + r) - payment - structure.extra_monthly, 0.0)
+        balance = max(balance - lumps.get(m + 1, 0.0), 0.0)
+        balances.append(balance)
+    padding = horizon - len(interest)
+    return np.array(balances + [0.0] * padding), np.array(interest + [0.0] * padding)
+
+
+STRUCTURES = {
+    "plain": LoanStructure(),
+    "5/1 ARM": LoanStructure.from_options(arm_fixed_years=5, arm_reset_pct=1.5),
+    "interest-only": LoanStructure.from_options(interest_only_years=10),
+    "ARM + interest-only": LoanStructure.from_options(arm_fixed_years=7, arm_reset_pct=-0.5, interest_only_years=3),
+    "extra principal": LoanStructure.from_options(extra_monthly=1_500),
+    "lump sum": LoanStructure.from_options(lump_sum=200_000, lump_sum_year=4),
+    "recast": LoanStructure.from_options(lump_sum=200_000, lump_sum_year=4, recast=True),
+    "early payoff": LoanStructure.from_options(extra_monthly=2_000, lump_sum=500_000, lump_sum_year=2),
+    "three segments": LoanStructure((RateSegment(24, 0, True), RateSegment(36, 0.75), RateSegment(0, 2.0))),
+}
+
+
+@pytest.mark.parametrize("name", STRUCTURES)
+@pytest.mark.parametrize("years", [15, 30])
+def test_matches_brute_force(name, years):
+    structure = STRUCTURES[name]
+    path = loan_path(1_000_000, 5.5, years, 360, structure)
+    balances, interest = brute_force(1_000_000, 5.5, years, 360, structure)
+    np.testing.assert_allclose(path.balances, balances, rtol=1e-9, atol=1e-5)
+    np.testing.assert_allclose(path.interest, interest, rtol=1e-9, atol=1e-5)
+    np.testing.assert_allclose(path.principal, balances[:-1] - balances[1:], atol=1e-5)
+
+
+def test_zero_rate_segment():
+    structure = LoanStructure((RateSegment(12, -5.0), RateSegment(0)))
+    path = loan_path(360_000, 5.0, 30, 360, structure)
+    balances, _ = brute_force(360_000, 5.0, 30, 360, structure)
+    np.testing.assert_allclose(path.balances, balances, rtol=1e-9, atol=1e-5)
+
+
+def test_plain_structure_matches_fixed_kernel():
+    path = loan_path(750_000, 6.25, 30, 120, LoanStructure())
+    np.testing.assert_allclose(path.balances, loan_balance_path(750_000, 6.25, 30, 120), rtol=1e-12)
+
+
+def test_broadcasts_over_rates():
+    structure = STRUCTURES["5/1 ARM"]
+    both = loan_path(1_000_000, (5.0, 6.0), 30, 120, structure)
+    assert both.balances.shape == (2, 121)
+    np.testing.assert_allclose(both.balances[1], loan_path(1_000_000, 6.0, 30, 120, structure).balances)
+
+
+def test_from_options_plain_loan_is_none():
+    assert LoanStructure.from_options() is None
+    assert LoanStructure.from_options(arm_reset_pct=2.0) is None
@@ -0,0 +1,73 @@
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from housing import results
+from housing.config import ROOT
+from housing.evaluation import Scenario, evaluate
+from housing.listings import ListingStore
+from housing.loans import LoanStructure
+from housing.parallel import evaluate_store
+from housing.report import comparison_columns
+
+SCENARIOS = [
+    Scenario(),
+    Scenario(rate_lo=6.0, rate_hi=6.5, rent_yield=4.0),
+    Scenario(structure=LoanStructure.from_options(5, 1.0, 0, 300), rent_yield=4.5, offer_pct=95),
+]
+
+
+@pytest.fixture(scope="module")
+def store():
+    base = ListingStore.load(ROOT / "data" / "listings.json")
+    records = []
+    for copy in range(40):
+        for i in range(len(base)):
+            rec = dict(base.record(i))
+            rec["name"] = f"{rec['name']} #{copy}"
+            rec["price"] += 5_000 * copy
+            rec["price_history"] = []
+            records.append(rec)
+    return ListingStore.from_records(records)
+
+
+def assert_same(left, right):
+    assert list(left) == list(right)
+    for key in left:
+        assert left[key].tobytes() == right[key].tobytes(), key
+
+
+def test_serial_matches_evaluate(store):
+    records = [store.record(i) for i in range(len(store))]
+    for scenario, columns in zip(SCENARIOS, evaluate_store(store, SCENARIOS, shard_size=7)):
+        assert_same(columns, comparison_columns(records, evaluate(records, scenario)))
+
+
+def test_pool_matches_serial(store):
+    serial = evaluate_store(store, SCENARIOS)
+    with ProcessPoolExecutor(2) as pool:
+        for shard_size in (None, 13, 1000):
+            pooled = evaluate_store(store, SCENARIOS, pool, workers=2, shard_size=shard_size)
+            for left, right in zip(serial, pooled):
+                assert_same(left, right)
+
+
+def test_empty_store(store):
+    empty = ListingStore({key: values[:0] for key, values in store.columns.items()},
+                         np.zeros(1, np.int64), store.history_months[:0], store.history_prices[:0])
+    columns = evaluate_store(empty, [dataclasses.replace(SCENARIOS[0])])[0]
+    assert len(columns["Property"]) == 0
+
+
+def test_result_cache_opt_out_is_scoped(store):
+    evaluate_store(store, SCENARIOS[:1], shard_size=50, result_cache=False)
+    assert results.RESULTS.enabled
+    with ProcessPoolExecutor(1) as pool:
+        evaluate_store(store, SCENARIOS[:1], pool, shard_size=50, result_cache=False)
+        assert pool.submit(_results_enabled).result()
+
+
+def _results_enabled() -> bool:
+    return results.RESULTS.enabled
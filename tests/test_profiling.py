@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+from housing import cache, profiling
+from housing.cache import memoize
+
+
+@pytest.fixture(autouse=True)
+def private_cache(monkeypatch):
+    """Keep the kernels these tests memoize out of the process-wide cache and stats."""
+    monkeypatch.setattr(cache, "MEMORY", cache.MemoryCache())
+    monkeypatch.setattr(cache, "_REGISTRY", {})
+
+
+def test_misses_are_counted_per_session():
+    @memoize(maxsize=16)
+    def square(x: float) -> float:
+        if x == 1:
+            # Another session misses on the same kernel while this call is computing
+            other = threading.Thread(target=lambda: [square(y) for y in (10, 11, 12)])
+            other.start()
+            other.join()
+        return x * x
+
+    profiler = profiling.start(True)
+    try:
+        assert [square(1), square(1), square(2)] == [1, 1, 4]
+    finally:
+        profiler.finish()
+    (entry,) = [kernel for kernel in profiler.report()["kernels"] if kernel["kernel"] == "square"]
+    assert (entry["calls"], entry["misses"]) == (3, 2)
+    assert square.cache_info().misses == 5
+
+
+def test_disabled_profiler_records_nothing():
+    @memoize(maxsize=16)
+    def double(x: float) -> float:
+        return 2 * x
+
+    profiler = profiling.start(False)
+    assert double(3) == 6 and double(3) == 6
+    assert profiling.current() is None
+    assert not profiler.enabled
+
@@ -0,0 +1,54 @@
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from housing.results import ResultCache, result_key
+
+
+@dataclass(frozen=True)
+class Result:
+    total: float
+    series: np.ndarray
+
+
+def test_round_trip(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=1 << 20)
+    key = result_key("kernel", 1, (1_000_000, 5.5), {})
+    assert cache.get(key, Result) is None
+    cache.put(key, Result(1.5, np.arange(12.0)))
+    loaded = cache.get(key, Result)
+    assert loaded.total == 1.5
+    np.testing.assert_array_equal(loaded.series, np.arange(12.0))
+    assert not loaded.series.flags.writeable
+    assert result_key("kernel", 1, (1_000_000.0, 5.5), {}) == key
+
+
+def test_limit_holds_across_processes(tmp_path):
+    # Two caches over one directory stand in for two processes
+    limit = 400_000
+    writers = [ResultCache(tmp_path, max_bytes=limit) for _ in range(2)]
+    for i in range(400):
+        writers[i % 2].put(result_key("kernel", 1, (i,), {}), Result(float(i), np.zeros(1_000)))
+        # Each process overshoots by at most its unseen share
+        assert writers[0].size() <= limit * 1.1
+    assert writers[0].size() > limit * 0.5
+    # The most recently written results survive eviction
+    assert writers[1].get(result_key("kernel", 1, (399,), {}), Result) is not None
+
+
+def test_disabled_is_scoped_to_the_block_and_thread(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=1 << 20)
+    key = result_key("kernel", 1, (1,), {})
+    seen = []
+    with cache.disabled():
+        cache.put(key, Result(1.0, np.zeros(3)))
+        other = threading.Thread(target=lambda: seen.append(cache.enabled))
+        other.start()
+        other.join()
+        assert not cache.enabled
+    assert seen == [True]
+    assert cache.enabled and cache.get(key, Result) is None
+    with cache.disabled(False):
+        cache.put(key, Result(1.0, np.zeros(3)))
+    assert cache.get(key, Result) is not None
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from housing import profiling, tables
+from housing.amortization import amortization_schedule, loan_balance_path, monthly_mortgage
+from housing.cache import cached_balance_path, cached_payment, cached_schedule
+
+
+@pytest.mark.parametrize("years", tables.TERMS)
+def test_scaled_curves_match_kernels(years):
+    for rate in tables.RATES.tolist():
+        assert tables.grid_index(rate, years) is not None
+        np.testing.assert_array_equal(
+            cached_balance_path(1_234_567.0, rate, years, 360), loan_balance_path(1_234_567.0, rate, years, 360)
+        )
+        assert cached_payment(1_234_567.0, rate, years) == pytest.approx(monthly_mortgage(1_234_567.0, rate, years), rel=1e-13)
+
+
+def test_schedule_matches_kernel():
+    for got, expected in zip(cached_schedule(900_000.0, 6.125, 30), amortization_schedule(900_000.0, 6.125, 30)):
+        np.testing.assert_allclose(got, expected, rtol=1e-12, atol=1e-6)
+
+
+@pytest.mark.parametrize("rate, years", [(5.43, 30), (10.125, 30), (2.875, 15), (5.5, 40), (np.array([5.5]), 30)])
+def test_off_grid_falls_back(rate, years):
+    assert tables.grid_index(rate, years) is None
+    assert tables.payment_factor(rate, years) is None
+
+
+def test_horizon_past_table_falls_back():
+    assert tables.balance_curve(5.5, 30, 361) is None
+    np.testing.assert_array_equal(cached_balance_path(500_000.0, 5.5, 30, 480), loan_balance_path(500_000.0, 5.5, 30, 480))
+
+
+def test_written_once_and_memory_mapped(tmp_path):
+    first = tables.load_tables(tmp_path)
+    written = sorted(path.name for path in tmp_path.iterdir())
+    assert written == [f"balance-v{tables.VERSION}.npy", f"payment-v{tables.VERSION}.npy"]
+    second = tables.load_tables(tmp_path)
+    assert not second.balance.flags.writeable
+    np.testing.assert_array_equal(first.balance, second.balance)
+    np.testing.assert_array_equal(second.payment, tables.build_tables().payment)
+
+
+def test_lookups_reach_the_profiler():
+    profiler = profiling.start(True)
+    try:
+        cached_payment(500_000.0, 5.5, 30)
+        cached_balance_path(500_000.0, 5.5, 30, 120)
+        cached_schedule(500_000.0, 5.5, 30)
+        cached_balance_path(500_000.0, 5.43, 30, 120)
+    finally:
+        profiler.finish()
+    kernels = {entry["kernel"]: (entry["calls"], entry["misses"]) for entry in profiler.report()["kernels"]}
+    assert kernels["table_payment"] == (1, 0)
+    assert kernels["table_balance_path"] == (1, 0)
+    assert kernels["table_schedule"] == (1, 0)
+    # Off the grid, the memoized kernel reports itself
+    assert kernels["loan_balance_path"][0] == 1